@@ -1,20 +1,89 @@
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, request, render_template, jsonify, Response, g
 import numpy as np
-import pandas as pd
 from datetime import datetime
+import logging
+import time
 import sys
 import os
 
 # Add the src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.pipeline.predict_pipeline import CustomData, PredictPipeline
+from src.pipeline.predict_pipeline import CustomData, BatchData, PredictPipeline
+from src.pipeline.schema import feature_schema, describe_errors
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.history_store import PredictionHistoryStore
+from src.pipeline.artifact_store import ArtifactWatcher
+from src.pipeline.readiness import ReadinessMonitor
+from src.pipeline import binary_format
+# Imported by the same name as in PredictPipeline, so both record into one registry
+from exception import ValidationError, wrap_error
+from instrumentation import span, metrics, profiler, HTTP_METRIC, PROFILER_ENABLED
+from logger import setup_logging
 
 application = Flask(__name__)
 app = application
 
-# Store prediction history (optional)
-prediction_history = []
+# Upper bound on rows accepted by the batch endpoint
+MAX_BATCH_ROWS = 100000
+
+# Prediction history: bounded in memory, flushed in batches to SQLite
+prediction_history = PredictionHistoryStore()
+
+# One pipeline per process; artifacts are cached in its registry
+predict_pipeline = PredictPipeline()
+
+# Repeated single-diamond requests are answered from an LRU/TTL cache
+prediction_cache = PredictionCache()
+
+def predict_single(data):
+    # Returns (price, was_cached) for one CustomData. Keyed on the version recorded by
+    # activate(), so hits don't stat the artifacts; unversioned artifacts are fingerprinted.
+    return prediction_cache.get_or_compute(
+        data.get_data_as_dict(),
+        predict_pipeline.active_version or predict_pipeline.artifact_version(),
+        lambda: float(predict_pipeline.predict(dataframe(data))[0])
+    )
+
+def error_response(error, invalid_message, failed_message):
+    # Status and code come from the exception type: ValidationError 400, ArtifactError 503, others 500
+    error = wrap_error(error)
+    message = invalid_message if isinstance(error, ValidationError) else failed_message
+    return jsonify({
+        'success': False,
+        'error': f'{message}: {error.reason}',
+        'code': error.code
+    }), error.http_status
+
+def parse_json():
+    # Malformed bodies are the client's error (400), not a werkzeug BadRequest wrapped as a 500
+    with span('parse_json'):
+        json_data = request.get_json(silent=True)
+    if json_data is None:
+        raise ValidationError('Request body is not valid JSON')
+    return json_data
+
+def dataframe(data):
+    with span('dataframe'):
+        return data.get_data_as_data_frame()
+
+## Startup warm-up: traffic is only routed here once this succeeds (/api/health/ready).
+# A failed warm-up is retried in the background, e.g. once artifacts are deployed
+READINESS_RETRY_SECONDS = 30
+readiness = ReadinessMonitor(predict_pipeline, retry_interval=READINESS_RETRY_SECONDS).start()
+
+# Newly published artifact versions are loaded off the request path and swapped in
+artifact_watcher = ArtifactWatcher(predict_pipeline).start()
+
+# Optional shadow evaluation: SHADOW_MODEL_VERSION=<published version> SHADOW_FRACTION=0.1
+if os.environ.get('SHADOW_MODEL_VERSION'):
+    try:
+        predict_pipeline.enable_shadow(
+            os.environ['SHADOW_MODEL_VERSION'],
+            fraction=float(os.environ.get('SHADOW_FRACTION', '0.1'))
+        )
+    except Exception as e:
+        logging.warning(f"Shadow evaluation not enabled: {str(e)}")
 
 ## Route for home page
 @app.route('/')
@@ -27,38 +96,32 @@ def predict_datapoint():
         return render_template('home.html')
     else:
         try:
-            data = CustomData(
-                carat=float(request.form.get('carat')),
-                cut=request.form.get('cut'),
-                color=request.form.get('color'),
-                clarity=request.form.get('clarity'),
-                depth=float(request.form.get('depth')),
-                table=float(request.form.get('table')),
-                x=float(request.form.get('x')),
-                y=float(request.form.get('y')),
-                z=float(request.form.get('z'))
-            )
-            
-            pred_df = data.get_data_as_data_frame()
-            print("Input data:")
-            print(pred_df)
+            # Rejected by the schema before any model work
+            with span('validate'):
+                record, errors = feature_schema.validate_record(request.form)
+            if errors:
+                return render_template('home.html', results=f"Error: {describe_errors(errors)}")
+
+            data = CustomData(**record)
+            # Arguments are only formatted when DEBUG logging is on
+            logging.debug("Prediction input: %s", record)
             
-            predict_pipeline = PredictPipeline()
-            results = predict_pipeline.predict(pred_df)
+            predicted_price, _ = predict_single(data)
             
             # Store prediction in history (optional)
             prediction_record = {
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'input': pred_df.to_dict('records')[0],
-                'predicted_price': float(results[0])
+                'input': data.get_data_as_dict(),
+                'predicted_price': predicted_price
             }
-            prediction_history.append(prediction_record)
+            with span('history_write'):
+                prediction_history.append(prediction_record)
             
-            return render_template('home.html', results=f"${results[0]:,.2f}")
+            return render_template('home.html', results=f"${predicted_price:,.2f}")
         
         except Exception as e:
-            print(f"Error in prediction: {str(e)}")
-            return render_template('home.html', results=f"Error: {str(e)}")
+            logging.error("Error in prediction: %s", e)
+            return render_template('home.html', results=f"Error: {wrap_error(e).reason}")
 
 ## API Endpoint for Programmatic Access
 @app.route('/api/predict', methods=['POST'])
@@ -70,84 +133,281 @@ def api_predict():
                 'error': 'Content-Type must be application/json'
             }), 400
         
-        json_data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['carat', 'cut', 'color', 'clarity', 'depth', 'table', 'x', 'y', 'z']
-        missing_fields = [field for field in required_fields if field not in json_data]
+        json_data = parse_json()
+        if not isinstance(json_data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
         
-        if missing_fields:
+        # Validate types, categories and ranges against the shared schema
+        with span('validate'):
+            record, errors = feature_schema.validate_record(json_data)
+        if errors:
             return jsonify({
                 'success': False,
-                'error': f'Missing required fields: {", ".join(missing_fields)}'
+                'error': describe_errors(errors),
+                'errors': errors
             }), 400
         
         # Create CustomData object
-        data = CustomData(
-            carat=float(json_data['carat']),
-            cut=str(json_data['cut']),
-            color=str(json_data['color']),
-            clarity=str(json_data['clarity']),
-            depth=float(json_data['depth']),
-            table=float(json_data['table']),
-            x=float(json_data['x']),
-            y=float(json_data['y']),
-            z=float(json_data['z'])
-        )
+        data = CustomData(**record)
         
-        # Convert to DataFrame and make prediction
-        pred_df = data.get_data_as_data_frame()
-        predict_pipeline = PredictPipeline()
-        results = predict_pipeline.predict(pred_df)
+        # Make prediction (served from the cache for repeated diamonds)
+        predicted_price, cached = predict_single(data)
         
         # Calculate price per carat
-        price_per_carat = float(results[0]) / float(json_data['carat'])
+        price_per_carat = predicted_price / record['carat']
         
         # Store prediction in history
         prediction_record = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'input': json_data,
-            'predicted_price': float(results[0])
+            'predicted_price': predicted_price
         }
-        prediction_history.append(prediction_record)
+        with span('history_write'):
+            prediction_history.append(prediction_record)
         
         return jsonify({
             'success': True,
-            'predicted_price': round(float(results[0]), 2),
+            'predicted_price': round(predicted_price, 2),
             'price_per_carat': round(price_per_carat, 2),
             'input_data': json_data,
+            'cached': cached,
             'timestamp': prediction_record['timestamp']
         })
         
-    except ValueError as ve:
-        return jsonify({
-            'success': False,
-            'error': f'Invalid data type: {str(ve)}'
-        }), 400
     except Exception as e:
+        return error_response(e, 'Invalid data type', 'Prediction failed')
+
+## Batch API Endpoint: one transform/predict call for the whole payload
+@app.route('/api/predict/batch', methods=['POST'])
+def api_predict_batch():
+    try:
+        if not request.is_json:
+            return jsonify({
+                'success': False,
+                'error': 'Content-Type must be application/json'
+            }), 400
+
+        batch = BatchData(parse_json())
+
+        n_rows = batch.n_rows()
+        if n_rows > MAX_BATCH_ROWS:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large: {n_rows} rows (max {MAX_BATCH_ROWS})'
+            }), 413
+
+        with span('dataframe'):
+            batch_df = batch.get_data_as_data_frame()
+
+        with span('validate'):
+            valid_df, errors = batch.validate(batch_df)
+
+        results = [None] * len(batch_df)
+        for error in errors:
+            results[error['index']] = error
+
+        if len(valid_df):
+            prices = np.asarray(predict_pipeline.predict(valid_df), dtype='float64')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                per_carat = prices / valid_df['carat'].to_numpy()
+            per_carat = np.where(np.isfinite(per_carat), np.round(per_carat, 2), np.nan)
+
+            for i, price, ppc in zip(valid_df.index.tolist(), np.round(prices, 2).tolist(), per_carat.tolist()):
+                results[i] = {
+                    'index': i,
+                    'predicted_price': price,
+                    'price_per_carat': None if ppc != ppc else ppc
+                }
+
         return jsonify({
-            'success': False,
-            'error': f'Prediction failed: {str(e)}'
-        }), 500
+            'success': True,
+            'total': len(batch_df),
+            'predicted': len(valid_df),
+            'failed': len(errors),
+            'results': results,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    except Exception as e:
+        return error_response(e, 'Invalid batch payload', 'Batch prediction failed')
+
+## Binary batch endpoint: Arrow IPC stream or raw float32/int8 buffer in, same format out
+@app.route('/api/predict/binary', methods=['POST'])
+def api_predict_binary():
+    try:
+        content_type = request.mimetype
+        if content_type == binary_format.ARROW_CONTENT_TYPE:
+            read, write = binary_format.read_arrow, binary_format.write_arrow_predictions
+        elif content_type == binary_format.RAW_CONTENT_TYPE:
+            read, write = binary_format.read_raw, binary_format.write_raw_predictions
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Content-Type must be {binary_format.ARROW_CONTENT_TYPE} or {binary_format.RAW_CONTENT_TYPE}'
+            }), 415
+
+        # Arrays are views into the request body; no per-row Python objects are built
+        with span('decode'):
+            columns = read(request.get_data())
+        n_rows = len(columns['carat'])
+        if n_rows > MAX_BATCH_ROWS:
+            return jsonify({
+                'success': False,
+                'error': f'Batch too large: {n_rows} rows (max {MAX_BATCH_ROWS})'
+            }), 413
+
+        with span('validate'):
+            valid_columns, errors = feature_schema.validate_encoded(columns)
+        prices = predict_pipeline.predict_encoded(valid_columns) if n_rows > len(errors) else []
 
-## API endpoint to get prediction history
+        response = Response(write(prices, n_rows, errors), mimetype=content_type)
+        response.headers['X-Rows'] = str(n_rows)
+        response.headers['X-Failed-Rows'] = str(len(errors))
+        return response
+
+    except Exception as e:
+        return error_response(e, 'Invalid binary payload', 'Batch prediction failed')
+
+## API endpoint to get prediction history (newest first, paged, optional time range)
 @app.route('/api/history', methods=['GET'])
 def api_history():
+    try:
+        page = request.args.get('page', 1, type=int)
+        page_size = min(request.args.get('page_size', 10, type=int), 1000)
+        result = prediction_history.query(
+            page=page,
+            page_size=page_size,
+            start=request.args.get('start'),
+            end=request.args.get('end')
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid history query: {str(e)}'
+        }), 400
+
+    return jsonify({
+        'success': True,
+        'total_predictions': result['total'],
+        'page': result['page'],
+        'page_size': result['page_size'],
+        'history': result['history']
+    })
+
+## Artifact cache statistics (load timings and hit counts) and the served version
+@app.route('/api/artifacts', methods=['GET'])
+def api_artifacts():
+    active_version = predict_pipeline.active_version
+    return jsonify({
+        'success': True,
+        'artifacts': predict_pipeline.registry.stats(),
+        'versions': artifact_watcher.stats(),
+        'manifest': predict_pipeline.store.manifest(active_version) if active_version else None
+    })
+
+## Shadow evaluation statistics (candidate vs primary deltas and latency)
+@app.route('/api/shadow', methods=['GET'])
+def api_shadow():
+    shadow = predict_pipeline.shadow
     return jsonify({
         'success': True,
-        'total_predictions': len(prediction_history),
-        'history': prediction_history[-10:]  # Return last 10 predictions
+        'enabled': shadow is not None,
+        'shadow': shadow.stats() if shadow is not None else None
     })
 
-## Health check endpoint
+## Prediction cache statistics (hits, misses, evictions)
+@app.route('/api/cache', methods=['GET'])
+def api_cache():
+    return jsonify({
+        'success': True,
+        'cache': prediction_cache.stats()
+    })
+
+## Request timing for /metrics, labelled by route pattern (not raw path) to bound the series
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe(HTTP_METRIC, time.perf_counter() - start,
+                        endpoint=endpoint, method=request.method, status=str(response.status_code))
+    return response
+
+## Prometheus metrics: per-stage and per-endpoint latency histograms
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+## Sampling profiler: start, then stop to get the hottest stacks (collapsed format).
+# Off unless PROFILER_ENABLED=1, as anyone who can reach the API could run it
+@app.before_request
+def require_profiler_enabled():
+    if request.path.startswith('/api/profile') and not PROFILER_ENABLED:
+        return jsonify({'success': False, 'error': 'Profiler is disabled (set PROFILER_ENABLED=1)'}), 404
+
+@app.route('/api/profile/start', methods=['POST'])
+def profile_start():
+    interval_ms = request.args.get('interval_ms', type=float)
+    if interval_ms is not None and not 0 < interval_ms < 60000:
+        return jsonify({'success': False, 'error': 'interval_ms must be between 0 and 60000'}), 400
+    # Intervals below MIN_PROFILE_INTERVAL (1 ms) are raised to it by the profiler
+    started = profiler.start(interval=interval_ms / 1000 if interval_ms else None)
+    return jsonify({
+        'success': started,
+        'running': profiler.running,
+        'interval_ms': profiler.interval * 1000
+    }), 200 if started else 409
+
+@app.route('/api/profile/stop', methods=['POST'])
+def profile_stop():
+    return Response(profiler.stop(), mimetype='text/plain')
+
+@app.route('/api/profile', methods=['GET'])
+def profile_report():
+    # Hot stacks so far, without stopping the profiler
+    return Response(profiler.report(top=request.args.get('top', 50, type=int)), mimetype='text/plain')
+
+## Health check endpoint: healthy only when a model is loaded and warmed up
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    ready = readiness.ready
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if ready else 'unavailable',
         'service': 'Diamond Price Prediction API',
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'version': '1.0.0'
+    }), 200 if ready else 503
+
+## Liveness: the process is up and serving requests
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    return jsonify({
+        'status': 'alive',
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
+## Readiness: artifacts loaded, validated and warmed up
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    report = readiness.report()
+    ready = report['ready']
+    if ready:
+        # The watcher may have swapped versions since the warm-up
+        report['model_path'], report['preprocessor_path'] = predict_pipeline.artifact_paths()
+        report['model_version'] = predict_pipeline.artifact_version()
+    return jsonify({
+        'status': 'ready' if ready else 'not ready',
+        **report,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }), 200 if ready else 503
+
 if __name__ == "__main__":
+    setup_logging()
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.schema import feature_schema, describe_errors
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.history_store import PredictionHistoryStore
+from src.pipeline.micro_batcher import MicroBatcher
+from src.pipeline.artifact_store import ArtifactWatcher
+from src.pipeline.readiness import ReadinessMonitor
+from exception import ValidationError, wrap_error
+from instrumentation import span, metrics
+from logger import setup_logging
+
+# Async serving mode: concurrent /api/predict requests share micro-batched model calls.
+# Run with `python asgi_app.py` or any ASGI server, e.g. `uvicorn asgi_app:app`.
+
+predict_pipeline = PredictPipeline()
+prediction_cache = PredictionCache()
+prediction_history = PredictionHistoryStore()
+micro_batcher = MicroBatcher(predict_pipeline.predict)
+artifact_watcher = ArtifactWatcher(predict_pipeline)
+
+# Warmed up at lifespan startup, then retried in the background until it succeeds
+readiness = ReadinessMonitor(predict_pipeline)
+
+async def read_body(receive):
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+async def send_json(send, payload, status=200):
+    await send_body(send, json.dumps(payload).encode(), b'application/json', status)
+
+async def send_body(send, body, content_type, status=200):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+## Single prediction: cache first, otherwise joins the next micro-batch
+async def api_predict(body):
+    try:
+        with span('parse_json'):
+            json_data = json.loads(body or b'null')
+    except ValueError:
+        return {'success': False, 'error': 'Request body must be JSON'}, 400
+    if not isinstance(json_data, dict):
+        return {'success': False, 'error': 'Request body must be a JSON object'}, 400
+
+    # Invalid requests never reach the micro-batcher
+    with span('validate'):
+        features, errors = feature_schema.validate_record(json_data)
+    if errors:
+        return {'success': False, 'error': describe_errors(errors), 'errors': errors}, 400
+
+    try:
+        # The active version is read without I/O; unversioned artifacts are fingerprinted off the event loop
+        model_version = predict_pipeline.active_version
+        if model_version is None:
+            model_version = await asyncio.get_running_loop().run_in_executor(
+                micro_batcher.executor, predict_pipeline.artifact_version)
+        predicted_price = prediction_cache.lookup(features, model_version)
+        cached = predicted_price is not None
+        if not cached:
+            predicted_price = await micro_batcher.submit(features)
+            prediction_cache.store(features, model_version, predicted_price)
+    except Exception as e:
+        # Status and code come from the exception type, as in app.py
+        error = wrap_error(e)
+        message = 'Invalid data type' if isinstance(error, ValidationError) else 'Prediction failed'
+        return {'success': False, 'error': f'{message}: {error.reason}', 'code': error.code}, error.http_status
+
+    prediction_record = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'input': json_data,
+        'predicted_price': predicted_price
+    }
+    with span('history_write'):
+        prediction_history.append(prediction_record)
+
+    return {
+        'success': True,
+        'predicted_price': round(predicted_price, 2),
+        'price_per_carat': round(predicted_price / features['carat'], 2),
+        'input_data': json_data,
+        'cached': cached,
+        'timestamp': prediction_record['timestamp']
+    }, 200
+
+async def api_stats(body):
+    return {
+        'success': True,
+        'micro_batcher': micro_batcher.stats(),
+        'cache': prediction_cache.stats(),
+        'history': prediction_history.stats(),
+        'versions': artifact_watcher.stats()
+    }, 200
+
+async def metrics_text(body):
+    # Prometheus text format; returned as a string, not JSON
+    return metrics.render(), 200
+
+async def health_check(body):
+    ready = readiness.ready
+    return {
+        'status': 'healthy' if ready else 'unavailable',
+        'service': 'Diamond Price Prediction API (async)',
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'version': '1.0.0'
+    }, 200 if ready else 503
+
+async def health_live(body):
+    return {'status': 'alive', 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}, 200
+
+async def health_ready(body):
+    report = readiness.report()
+    ready = report['ready']
+    return {
+        'status': 'ready' if ready else 'not ready',
+        **report,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }, 200 if ready else 503
+
+ROUTES = {
+    ('POST', '/api/predict'): api_predict,
+    ('GET', '/api/stats'): api_stats,
+    ('GET', '/metrics'): metrics_text,
+    ('GET', '/api/health'): health_check,
+    ('GET', '/api/health/live'): health_live,
+    ('GET', '/api/health/ready'): health_ready
+}
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Preload, validate and warm up before the server accepts traffic
+            readiness.start()
+            micro_batcher.start()
+            artifact_watcher.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await micro_batcher.stop()
+            artifact_watcher.stop()
+            readiness.stop()
+            prediction_history.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    handler = ROUTES.get((scope['method'], scope['path']))
+    if handler is None:
+        known_path = any(path == scope['path'] for _, path in ROUTES)
+        status = 405 if known_path else 404
+        return await send_json(send, {'success': False, 'error': 'Method not allowed' if known_path else 'Not found'}, status)
+
+    body = await read_body(receive)
+    payload, status = await handler(body)
+    if isinstance(payload, str):
+        return await send_body(send, payload.encode(), b'text/plain; version=0.0.4', status)
+    await send_json(send, payload, status)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve the prediction API with request micro-batching')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=micro_batcher.max_batch_size)
+    parser.add_argument('--max-wait-ms', type=float, default=micro_batcher.max_wait * 1000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn is required for the async server: pip install uvicorn")
+        sys.exit(1)
+
+    micro_batcher.max_batch_size = args.max_batch_size
+    micro_batcher.max_wait = args.max_wait_ms / 1000
+    setup_logging()
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import platform
+import shutil
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+STAGES = ['dataframe', 'artifact_load', 'transform', 'predict', 'lookup', 'pipeline', 'flask', 'flask_binary']
+
+## Timing and memory helpers
+def reset_peak_rss():
+    # Linux resets the VmHWM high-water mark when 5 is written to clear_refs
+    try:
+        with open('/proc/self/clear_refs', 'w') as file_obj:
+            file_obj.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    try:
+        with open('/proc/self/status') as file_obj:
+            for line in file_obj:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Process-wide peak since start (kB on Linux, bytes on macOS)
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def measure(fn, min_time=1.0, min_runs=3, max_runs=1000):
+    # One untimed call, then repeat until both min_runs and min_time are reached
+    fn()
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+def summarize(stage, batch_size, timings, peak_mb):
+    # batch_size is None for stages that do not process rows (artifact load)
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {
+        'stage': stage,
+        'batch_size': batch_size,
+        'runs': len(timings),
+        'mean_ms': float(np.mean(timings)),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'rows_per_sec': float(batch_size / (p50 / 1000)) if batch_size and p50 > 0 else None,
+        'peak_rss_mb': peak_mb
+    }
+
+## Synthetic artifacts, for machines without a trained model
+def synthetic_diamonds(n_rows, seed=0):
+    import pandas as pd
+    from src.Components.data_transformation import CATEGORIES
+
+    rng = np.random.default_rng(seed)
+    carat = rng.uniform(0.2, 3.0, n_rows)
+    size = 6.4 * np.cbrt(carat) * rng.normal(1.0, 0.02, n_rows)
+    data = {
+        'id': np.arange(n_rows),
+        'carat': carat,
+        'depth': rng.normal(61.8, 1.4, n_rows),
+        'table': rng.normal(57.0, 2.2, n_rows),
+        'x': size,
+        'y': size * rng.normal(1.0, 0.01, n_rows),
+        'z': size * 0.618
+    }
+    price = 4000 * carat ** 1.7
+    for col, categories in CATEGORIES.items():
+        codes = rng.integers(0, len(categories), n_rows)
+        data[col] = np.asarray(categories, dtype=object)[codes]
+        price *= 1 + 0.05 * codes
+    data['price'] = price * rng.normal(1.0, 0.05, n_rows)
+    return pd.DataFrame(data)
+
+def write_synthetic_artifacts(work_dir, n_rows=20000):
+    # model.pkl + preprocessor.pkl under work_dir/artifacts, fitted like the training pipeline
+    from sklearn.ensemble import GradientBoostingRegressor
+    from src.Components.data_transformation import DataTransformation
+    from src.utils import save_object
+
+    df = synthetic_diamonds(n_rows)
+    preprocessor = DataTransformation().get_data_transformation_object()
+    X = preprocessor.fit_transform(df.drop(columns=['id', 'price']))
+    model = GradientBoostingRegressor(n_estimators=100, random_state=0).fit(X, df['price'])
+
+    save_object(os.path.join(work_dir, 'artifacts', 'preprocessor.pkl'), preprocessor)
+    save_object(os.path.join(work_dir, 'artifacts', 'model.pkl'), model)
+
+## Benchmark cases
+def run_benchmarks(stages=None, batch_sizes=None, min_time=1.0, log=print):
+    # Imported here: with --synthetic the working directory is switched first
+    sys.path.insert(0, ROOT)
+    import app as flask_app
+    from src.pipeline.predict_pipeline import PredictPipeline, CustomData, BatchData
+    from src.pipeline.artifact_registry import ArtifactRegistry
+    from src.pipeline.history_store import PredictionHistoryStore
+    from src.pipeline import binary_format
+
+    stages = stages or STAGES
+    batch_sizes = batch_sizes or DEFAULT_BATCH_SIZES
+
+    # Benchmark requests must not end up in the real prediction history
+    history_dir = tempfile.mkdtemp(prefix='bench-history-')
+    flask_app.prediction_history = PredictionHistoryStore(db_file_path=os.path.join(history_dir, 'history.db'))
+    client = flask_app.app.test_client()
+
+    pipeline = flask_app.predict_pipeline
+    model, preprocessor = pipeline.load_artifacts()
+    # Linear models only: the precomputed categorical table replaces transform + predict
+    table = pipeline.feature_table(model, preprocessor)
+    results = []
+
+    def record(stage, batch_size, fn, **kwargs):
+        reset_peak_rss()
+        timings = measure(fn, min_time=min_time, **kwargs)
+        result = summarize(stage, batch_size, timings, peak_rss_mb())
+        results.append(result)
+        log(f"{stage:>14} {str(batch_size):>7}  p50 {result['p50_ms']:10.3f} ms  p95 {result['p95_ms']:10.3f} ms  "
+            f"p99 {result['p99_ms']:10.3f} ms  {result['rows_per_sec'] or 0:12,.0f} rows/s  {result['peak_rss_mb']:8.1f} MB")
+
+    if 'artifact_load' in stages:
+        # Unpickle and compile from disk with an empty registry (no shared cache)
+        record('artifact_load', None, lambda: PredictPipeline(registry=ArtifactRegistry()).load_artifacts(),
+               min_runs=3, max_runs=10)
+
+    for batch_size in batch_sizes:
+        df = PredictPipeline.sample_frame(batch_size)
+        records = df.to_dict('records')
+
+        if 'dataframe' in stages:
+            # The single-diamond path builds its frame from CustomData, batches from BatchData
+            if batch_size == 1:
+                data = CustomData(**records[0])
+                record('dataframe', batch_size, data.get_data_as_data_frame)
+            else:
+                record('dataframe', batch_size, lambda: BatchData(records).get_data_as_data_frame())
+
+        if 'transform' in stages:
+            record('transform', batch_size, lambda: preprocessor.transform(df))
+
+        if 'predict' in stages:
+            X = preprocessor.transform(df)
+            record('predict', batch_size, lambda: model.predict(X))
+
+        if 'lookup' in stages and table is not None:
+            record('lookup', batch_size, lambda: table.predict(df))
+
+        if 'pipeline' in stages:
+            record('pipeline', batch_size, lambda: pipeline.predict(df))
+
+        if 'flask' in stages:
+            if batch_size == 1:
+                # A different diamond per request, so the prediction cache never answers
+                pool = PredictPipeline.sample_frame(100000).to_dict('records')
+                requests_iter = iter(pool)
+                record('flask', batch_size, lambda: check(client.post('/api/predict', json=next(requests_iter))),
+                       max_runs=len(pool) - 1)
+            else:
+                payload = json.dumps({col: df[col].tolist() for col in df.columns})
+                record('flask', batch_size, lambda: check(client.post(
+                    '/api/predict/batch', data=payload, content_type='application/json')))
+
+        if 'flask_binary' in stages:
+            body = binary_format.write_raw({col: df[col].to_numpy() for col in df.columns})
+            record('flask_binary', batch_size, lambda: check(client.post(
+                '/api/predict/binary', data=body, content_type=binary_format.RAW_CONTENT_TYPE)))
+
+    flask_app.prediction_history.close()
+    shutil.rmtree(history_dir, ignore_errors=True)
+    return {
+        'metadata': environment_metadata(pipeline),
+        'results': results
+    }
+
+def check(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark request failed with {response.status_code}: {response.get_data(as_text=True)[:500]}")
+    return response
+
+def environment_metadata(pipeline):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    model, preprocessor = pipeline.load_artifacts()
+    return {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'model': type(model).__name__,
+        'feature_table': pipeline.feature_table(model, preprocessor) is not None,
+        'model_version': pipeline.artifact_version()
+    }
+
+## Regression check against a saved run
+def compare_results(current, baseline, threshold=0.10, min_delta_ms=0.05):
+    # A case regresses when its p50 is more than threshold slower and min_delta_ms worse
+    base = {(r['stage'], r['batch_size']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = base.get((result['stage'], result['batch_size']))
+        if before is None:
+            continue
+        change = result['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] > 0 else 0.0
+        rows.append({
+            'stage': result['stage'],
+            'batch_size': result['batch_size'],
+            'baseline_p50_ms': before['p50_ms'],
+            'p50_ms': result['p50_ms'],
+            'change': change,
+            'regression': change > threshold and result['p50_ms'] - before['p50_ms'] > min_delta_ms
+        })
+    return rows
+
+def print_comparison(rows, threshold, current=None, baseline=None):
+    # Timings are only comparable on the same machine and model
+    if current is not None and baseline is not None:
+        keys = ['platform', 'cpu_count', 'model', 'synthetic']
+        if not current['metadata'].get('synthetic'):
+            # Synthetic artifacts are refitted, and so get a new version, on every run
+            keys.append('model_version')
+        for key in keys:
+            if current['metadata'].get(key) != baseline['metadata'].get(key):
+                print(f"Note: {key} differs from the baseline "
+                      f"({baseline['metadata'].get(key)} -> {current['metadata'].get(key)})")
+    print(f"\n{'stage':>14} {'batch':>7} {'baseline p50':>14} {'p50':>12} {'change':>9}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['stage']:>14} {str(row['batch_size']):>7} {row['baseline_p50_ms']:>11.3f} ms "
+              f"{row['p50_ms']:>9.3f} ms {row['change']:>+8.1%}{flag}")
+    regressions = [row for row in rows if row['regression']]
+    print(f"\n{len(regressions)} of {len(rows)} cases slower than the baseline by more than {threshold:.0%}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Latency and throughput benchmarks for the prediction stack')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results')
+    parser.add_argument('--stages', nargs='*', choices=STAGES, help='Stages to run (default: all)')
+    parser.add_argument('--batch-sizes', type=int, nargs='*', help=f'Default: {DEFAULT_BATCH_SIZES}')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds spent on each case')
+    parser.add_argument('--synthetic', action='store_true', help='Fit and use throwaway artifacts in a temporary directory')
+    parser.add_argument('--compare', metavar='BASELINE', help='Flag regressions against a saved results file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed p50 slowdown before flagging')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file_obj:
+            baseline = json.load(file_obj)
+
+    work_dir = None
+    if args.synthetic:
+        sys.path.insert(0, ROOT)
+        work_dir = tempfile.mkdtemp(prefix='bench-')
+        print(f"Fitting synthetic artifacts in {work_dir}")
+        write_synthetic_artifacts(work_dir)
+        os.chdir(work_dir)
+
+    try:
+        report = run_benchmarks(args.stages, args.batch_sizes, args.min_time)
+    finally:
+        if work_dir is not None:
+            os.chdir(ROOT)
+            shutil.rmtree(work_dir, ignore_errors=True)
+    report['metadata']['synthetic'] = args.synthetic
+    with open(output, 'w') as file_obj:
+        json.dump(report, file_obj, indent=2)
+    print(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = print_comparison(compare_results(report, baseline, args.threshold), args.threshold,
+                                       report, baseline)
+        sys.exit(1 if regressions else 0)
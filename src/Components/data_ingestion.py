@@ -9,13 +9,17 @@ import logging
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from exception import CustomException
+from utils import save_table
 
 # Initialize the data ingestion configuration
 @dataclass
 class DataIngestionConfig:
-    train_data_path: str = os.path.join('artifacts', 'train.csv')
-    test_data_path: str = os.path.join('artifacts', 'test.csv')
-    raw_data_path: str = os.path.join('artifacts', 'raw.csv')
+    train_data_path: str = os.path.join('artifacts', 'train.parquet')
+    test_data_path: str = os.path.join('artifacts', 'test.parquet')
+    raw_data_path: str = os.path.join('artifacts', 'raw.parquet')
+    compression: str = 'zstd'
+    # Also write raw.csv/train.csv/test.csv next to the Parquet files
+    export_csv: bool = False
 
 # Create a data ingestion class
 class DataIngestion:
@@ -30,16 +34,20 @@ class DataIngestion:
             df = pd.read_csv('notebooks/data/diamonds.csv')  # Change this to your diamond dataset path
             logging.info("Dataset read as pandas dataframe")
             
-            os.makedirs(os.path.dirname(self.ingestion_config.raw_data_path), exist_ok=True)
-
-            df.to_csv(self.ingestion_config.raw_data_path, index=False)
+            config = self.ingestion_config
+            save_table(df, config.raw_data_path, compression=config.compression)
             logging.info("Raw data saved")
             
             logging.info("Train test split initiated")
             train_set, test_set = train_test_split(df, test_size=0.30, random_state=42)
 
-            train_set.to_csv(self.ingestion_config.train_data_path, index=False, header=True)
-            test_set.to_csv(self.ingestion_config.test_data_path, index=False, header=True)
+            save_table(train_set, config.train_data_path, compression=config.compression)
+            save_table(test_set, config.test_data_path, compression=config.compression)
+
+            if config.export_csv:
+                for data, path in [(df, config.raw_data_path), (train_set, config.train_data_path), (test_set, config.test_data_path)]:
+                    save_table(data, os.path.splitext(path)[0] + '.csv')
+                logging.info("CSV copies exported")
 
             logging.info("Ingestion of data is completed successfully")
 
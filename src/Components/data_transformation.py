@@ -1,19 +1,33 @@
 import os
 import sys
-import pandas as pd
 import numpy as np 
 import logging
 from dataclasses import dataclass
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler, OrdinalEncoder
-from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
 
 # Add the parent directory to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from exception import CustomException
-from utils import save_object
+from utils import save_object, load_table
+from logger import lazy
+
+# The serving path imports the column constants below; sklearn is only
+# imported when a preprocessor is actually built
+
+# Define categorical and numerical columns for DIAMOND data
+CATEGORICAL_COLS = ['cut', 'color', 'clarity']
+NUMERICAL_COLS = ['carat', 'depth', 'table', 'x', 'y', 'z']
+
+# Define categories for ordinal encoding
+CUT_CATEGORIES = ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal']
+COLOR_CATEGORIES = ['D', 'E', 'F', 'G', 'H', 'I', 'J']
+CLARITY_CATEGORIES = ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
+
+CATEGORIES = {
+    'cut': CUT_CATEGORIES,
+    'color': COLOR_CATEGORIES,
+    'clarity': CLARITY_CATEGORIES
+}
 
 ## Data transformation config 
 @dataclass
@@ -27,16 +41,12 @@ class DataTransformation:
 
     def get_data_transformation_object(self):
         try:
-            logging.info('Data Transformation initiated')
-
-            # Define categorical and numerical columns for DIAMOND data
-            categorical_cols = ['cut', 'color', 'clarity']
-            numerical_cols = ['carat', 'depth', 'table', 'x', 'y', 'z']
+            from sklearn.impute import SimpleImputer
+            from sklearn.preprocessing import StandardScaler, OrdinalEncoder
+            from sklearn.pipeline import Pipeline
+            from sklearn.compose import ColumnTransformer
 
-            # Define categories for ordinal encoding
-            cut_categories = ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal']
-            color_categories = ['D', 'E', 'F', 'G', 'H', 'I', 'J']
-            clarity_categories = ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
+            logging.info('Data Transformation initiated')
 
             # Numerical pipeline
             num_pipeline = Pipeline(
@@ -50,14 +60,14 @@ class DataTransformation:
             cat_pipeline = Pipeline(    
                 steps=[
                     ('imputer', SimpleImputer(strategy='most_frequent')),  # Fixed typo
-                    ('ordinal_encoder', OrdinalEncoder(categories=[cut_categories, color_categories, clarity_categories])),
+                    ('ordinal_encoder', OrdinalEncoder(categories=[CUT_CATEGORIES, COLOR_CATEGORIES, CLARITY_CATEGORIES])),
                     ('scaler', StandardScaler())
                 ]
             )
 
             preprocessor = ColumnTransformer([
-                ('num_pipeline', num_pipeline, numerical_cols),  # Fixed variable name
-                ('cat_pipeline', cat_pipeline, categorical_cols)
+                ('num_pipeline', num_pipeline, NUMERICAL_COLS),  # Fixed variable name
+                ('cat_pipeline', cat_pipeline, CATEGORICAL_COLS)
             ])
 
             logging.info('Pipeline Completed')
@@ -69,12 +79,12 @@ class DataTransformation:
 
     def initiate_data_transformation(self, train_path, test_path):  # Fixed parameter names
         try:
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            train_df = load_table(train_path)
+            test_df = load_table(test_path)
 
             logging.info("Read train and test data completed")
-            logging.info(f'Train Dataframe Head:\n{train_df.head().to_string()}')
-            logging.info(f'Test Dataframe Head:\n{test_df.head().to_string()}')
+            logging.debug('Train Dataframe Head:\n%s', lazy(lambda: train_df.head().to_string()))
+            logging.debug('Test Dataframe Head:\n%s', lazy(lambda: test_df.head().to_string()))
             logging.info("Obtaining preprocessing object")
 
             preprocessing_obj = self.get_data_transformation_object()
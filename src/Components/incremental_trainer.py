@@ -0,0 +1,221 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import logging
+from dataclasses import dataclass
+from sklearn.linear_model import SGDRegressor, PassiveAggressiveRegressor
+from sklearn.preprocessing import StandardScaler
+
+# Add the parent directory to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exception import CustomException
+from utils import save_object
+from Components.data_transformation import CATEGORIES, CATEGORICAL_COLS, NUMERICAL_COLS
+from pipeline.compiled_preprocessor import CompiledPreprocessor
+from pipeline.artifact_store import ArtifactStore
+from pipeline.feature_table import FeatureTableBuilder
+
+@dataclass
+class IncrementalTrainerConfig:
+    data_path: str = os.path.join('notebooks', 'data', 'diamonds.csv')
+    chunk_size: int = 100000
+    test_size: float = 0.30
+    n_epochs: int = 5
+    # Values kept per column for the running median approximation
+    reservoir_size: int = 100000
+    random_state: int = 42
+    target_column: str = 'price'
+    trained_model_file_path = os.path.join('artifacts', 'model.pkl')
+    preprocessor_obj_file_path = os.path.join('artifacts', 'preprocessor.pkl')
+    feature_table_file_path = os.path.join('artifacts', 'feature_table.pkl')
+
+## Running median approximation over a bounded reservoir sample
+class ReservoirMedian:
+    def __init__(self, capacity, random_state=42):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(random_state)
+        self.reservoir = np.empty(0, dtype=np.float64)
+        self.seen = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+
+        free = self.capacity - len(self.reservoir)
+        if free > 0:
+            self.reservoir = np.concatenate([self.reservoir, values[:free]])
+            self.seen += len(values[:free])
+            values = values[free:]
+
+        if len(values):
+            # Algorithm R: the i-th value replaces a random slot with probability capacity / i
+            slots = self.rng.integers(0, self.seen + np.arange(1, len(values) + 1))
+            keep = slots < self.capacity
+            self.reservoir[slots[keep]] = values[keep]
+            self.seen += len(values)
+
+    def median(self):
+        return float(np.median(self.reservoir)) if len(self.reservoir) else np.nan
+
+## Out-of-core training: streaming statistics and partial_fit regressors
+class IncrementalTrainer:
+    def __init__(self, regressor=None, store=None):
+        self.incremental_trainer_config = IncrementalTrainerConfig()
+        config = self.incremental_trainer_config
+        self.regressor = regressor if regressor is not None else SGDRegressor(
+            penalty='l2', alpha=1e-4, random_state=config.random_state
+        )
+        self.artifact_store = store if store is not None else ArtifactStore()
+        self.version = None
+
+    def iter_chunks(self, data_path):
+        config = self.incremental_trainer_config
+        usecols = NUMERICAL_COLS + CATEGORICAL_COLS + [config.target_column]
+        for chunk_index, chunk in enumerate(pd.read_csv(data_path, chunksize=config.chunk_size, usecols=usecols)):
+            # Rows without a target or with unknown grades cannot be used for training
+            usable = chunk[config.target_column].notna().to_numpy()
+            for col in CATEGORICAL_COLS:
+                usable &= (chunk[col].isna() | chunk[col].isin(CATEGORIES[col])).to_numpy()
+            if not usable.all():
+                logging.warning(f"Skipping {int((~usable).sum())} unusable rows in chunk {chunk_index}")
+                chunk = chunk[usable]
+
+            # Deterministic per-row split, identical on every pass over the file
+            rng = np.random.default_rng([config.random_state, chunk_index])
+            is_test = rng.random(len(chunk)) < config.test_size
+            yield chunk, is_test
+
+    def fit_statistics(self, data_path):
+        # Pass 1: imputation statistics (approximate medians, exact modes)
+        config = self.incremental_trainer_config
+        medians = {col: ReservoirMedian(config.reservoir_size, config.random_state) for col in NUMERICAL_COLS}
+        counts = {col: pd.Series(dtype='int64') for col in CATEGORICAL_COLS}
+
+        for chunk, is_test in self.iter_chunks(data_path):
+            train = chunk[~is_test]
+            for col in NUMERICAL_COLS:
+                medians[col].update(train[col].to_numpy())
+            for col in CATEGORICAL_COLS:
+                counts[col] = counts[col].add(train[col].value_counts(), fill_value=0)
+
+        # Same tie-break as SimpleImputer(most_frequent): smallest value among the most frequent
+        modes = {}
+        for col in CATEGORICAL_COLS:
+            top = counts[col][counts[col] == counts[col].max()]
+            modes[col] = sorted(top.index)[0]
+
+        columns = NUMERICAL_COLS + CATEGORICAL_COLS
+        fill = [medians[col].median() for col in NUMERICAL_COLS] + [modes[col] for col in CATEGORICAL_COLS]
+        category_maps = [None] * len(NUMERICAL_COLS) + [
+            {value: code for code, value in enumerate(CATEGORIES[col])} for col in CATEGORICAL_COLS
+        ]
+        return columns, fill, category_maps
+
+    def fit_preprocessor(self, data_path):
+        # Pass 2: scaler statistics on imputed/encoded rows, plus target statistics
+        config = self.incremental_trainer_config
+        columns, fill, category_maps = self.fit_statistics(data_path)
+        unscaled = CompiledPreprocessor(columns, fill, category_maps, np.zeros(len(columns)), np.ones(len(columns)))
+
+        feature_scaler = StandardScaler()
+        target_scaler = StandardScaler()
+        for chunk, is_test in self.iter_chunks(data_path):
+            train = chunk[~is_test]
+            if len(train):
+                feature_scaler.partial_fit(unscaled.transform(train))
+                target_scaler.partial_fit(train[[config.target_column]].to_numpy(dtype=np.float64))
+
+        preprocessor = CompiledPreprocessor(columns, fill, category_maps, feature_scaler.mean_, feature_scaler.scale_)
+        return preprocessor, target_scaler.mean_[0], target_scaler.scale_[0]
+
+    def initiate_incremental_training(self, data_path=None):
+        try:
+            config = self.incremental_trainer_config
+            data_path = data_path or config.data_path
+            logging.info(f"Incremental training started on {data_path}")
+
+            preprocessor, y_mean, y_scale = self.fit_preprocessor(data_path)
+            logging.info("Streaming preprocessor statistics computed")
+
+            # Linear SGD models learn a standardized target; the scaling is folded back in afterwards
+            scale_target = isinstance(self.regressor, (SGDRegressor, PassiveAggressiveRegressor))
+            if not scale_target:
+                y_mean, y_scale = 0.0, 1.0
+
+            rng = np.random.default_rng(config.random_state)
+            for epoch in range(config.n_epochs):
+                for chunk, is_test in self.iter_chunks(data_path):
+                    train = chunk[~is_test]
+                    if not len(train):
+                        continue
+                    order = rng.permutation(len(train))
+                    X = preprocessor.transform(train)[order]
+                    y = (train[config.target_column].to_numpy(dtype=np.float64)[order] - y_mean) / y_scale
+                    self.regressor.partial_fit(X, y)
+                logging.info(f"Incremental training epoch {epoch + 1}/{config.n_epochs} completed")
+
+            model = self.regressor
+            if scale_target:
+                model.coef_ = model.coef_ * y_scale
+                model.intercept_ = model.intercept_ * y_scale + y_mean
+
+            r2 = self.evaluate(model, preprocessor, data_path)
+            logging.info(f"Incremental model R2 Score on held-out rows: {r2}")
+
+            save_object(file_path=config.preprocessor_obj_file_path, obj=preprocessor)
+            save_object(file_path=config.trained_model_file_path, obj=model)
+            logging.info("Incremental model and preprocessor saved")
+
+            # Linear models are served from precomputed categorical contributions
+            feature_table_path = FeatureTableBuilder().initiate_feature_table(
+                config.trained_model_file_path, config.preprocessor_obj_file_path, config.feature_table_file_path
+            )
+
+            # Published as a new version, like train_pipeline, so serving processes swap to it
+            self.version = self.artifact_store.publish(
+                model_path=config.trained_model_file_path,
+                preprocessor_path=config.preprocessor_obj_file_path,
+                metrics={
+                    'model_name': type(model).__name__,
+                    'r2_score': r2,
+                    'training': 'incremental'
+                },
+                schema={
+                    'numerical': NUMERICAL_COLS,
+                    'categorical': CATEGORIES,
+                    'target': config.target_column
+                },
+                extra_files={'feature_table': feature_table_path} if feature_table_path else None
+            )
+            logging.info(f"Published artifact version {self.version}")
+
+            return r2
+
+        except Exception as e:
+            logging.error("Exception occurred during incremental training")
+            raise CustomException(e, sys)
+
+    def evaluate(self, model, preprocessor, data_path):
+        # Streaming R2 over the held-out rows
+        target = self.incremental_trainer_config.target_column
+        n, sse, total, total_sq = 0, 0.0, 0.0, 0.0
+        for chunk, is_test in self.iter_chunks(data_path):
+            test = chunk[is_test]
+            if not len(test):
+                continue
+            y = test[target].to_numpy(dtype=np.float64)
+            sse += float(np.sum((y - model.predict(preprocessor.transform(test))) ** 2))
+            n += len(y)
+            total += float(y.sum())
+            total_sq += float(np.sum(y ** 2))
+
+        variance = total_sq - total ** 2 / n if n else 0.0
+        return 1 - sse / variance if variance > 0 else float('nan')
+
+if __name__ == "__main__":
+    trainer = IncrementalTrainer()
+    score = trainer.initiate_incremental_training()
+    print(f"Incremental training completed. R2 Score: {score}")
+    print(f"Published artifact version: {trainer.version}")
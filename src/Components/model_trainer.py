@@ -1,5 +1,8 @@
 import os
 import sys
+import json
+import math
+import time
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
@@ -7,17 +10,215 @@ from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import logging
+import multiprocessing
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
 # Add the parent directory to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from exception import CustomException
-from utils import save_object, evaluate_models
+from utils import save_object, load_object, evaluate_models, _fit_and_score, hash_arrays, model_cache_path
+
+# Hyperparameter values sampled by the search, per candidate family
+SEARCH_SPACES = {
+    'Lasso': {'alpha': [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0]},
+    'Ridge': {'alpha': [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0]},
+    'ElasticNet': {
+        'alpha': [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0],
+        'l1_ratio': [0.1, 0.3, 0.5, 0.7, 0.9]
+    },
+    'Decision Tree': {
+        'max_depth': [None, 8, 12, 16, 24],
+        'min_samples_leaf': [1, 2, 4, 8, 16]
+    },
+    'Random Forest': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [None, 12, 20],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': [1.0, 0.6, 'sqrt']
+    },
+    'Gradient Boosting': {
+        'n_estimators': [200, 400, 800],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'max_depth': [3, 4, 5, 6],
+        'subsample': [0.7, 0.85, 1.0],
+        # Boosting stops early once the internal validation score stalls
+        'n_iter_no_change': [10]
+    }
+}
 
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path = os.path.join('artifacts', 'model.pkl')
+    # Candidates are trained concurrently within this core budget
+    n_workers: int = os.cpu_count() or 1
+    # Fitted candidates keyed by data + hyperparameter hash; None disables the cache
+    model_cache_dir: str = os.path.join('artifacts', 'model_cache')
+    # Successive-halving search over SEARCH_SPACES after the default models are scored;
+    # off unless MODEL_SEARCH=1, as it multiplies training time
+    search_enabled: bool = os.environ.get('MODEL_SEARCH', '0') == '1'
+    search_candidates_per_model: int = 6
+    search_eta: int = 3
+    search_min_resource: float = 0.1
+    search_time_budget: float = 300.0
+    search_history_file_path = os.path.join('artifacts', 'search_history.json')
+
+## Successive-halving hyperparameter search
+class SuccessiveHalvingSearch:
+    def __init__(self, models, search_spaces, n_candidates=6, eta=3, min_resource=0.1,
+                 time_budget=300.0, n_workers=1, random_state=42, cache_dir=None, cache_namespace=None):
+        self.models = models
+        self.search_spaces = search_spaces
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_resource = min_resource
+        self.time_budget = time_budget
+        self.n_workers = max(1, n_workers)
+        self.random_state = random_state
+        # Trials share the model cache of evaluate_models, under the hash of its training data
+        self.cache_dir = cache_dir
+        self.cache_namespace = cache_namespace
+        self.history = []
+
+    def sample_configs(self):
+        rng = np.random.default_rng(self.random_state)
+        configs = []
+        for model_name, space in self.search_spaces.items():
+            if model_name not in self.models:
+                continue
+            seen = set()
+            for _ in range(self.n_candidates * 10):
+                params = {name: values[rng.integers(len(values))] for name, values in space.items()}
+                key = json.dumps(params, sort_keys=True, default=str)
+                if key not in seen:
+                    seen.add(key)
+                    configs.append((model_name, params))
+                if len(seen) == self.n_candidates:
+                    break
+        return configs
+
+    def _build(self, model_name, params):
+        from sklearn.base import clone
+
+        model = clone(self.models[model_name]).set_params(**params)
+        if 'random_state' in model.get_params():
+            model.set_params(random_state=self.random_state)
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+        return model
+
+    def _record(self, trial_id, rung, n_rows, status, **fields):
+        model_name, params = self.trials[trial_id]
+        self.history.append(dict({
+            'trial_id': trial_id,
+            'model': model_name,
+            'params': params,
+            'rung': rung,
+            'n_rows': n_rows,
+            'status': status
+        }, **fields))
+
+    def _run_rung(self, trials, X_fit, y_fit, X_val, y_val, deadline, rung):
+        # Runs one rung; when the deadline passes, queued trials are cancelled and
+        # running ones are stopped by terminating their worker processes
+        results = {}
+        models = {trial_id: self._build(model_name, params) for trial_id, (model_name, params) in trials.items()}
+
+        data_hash = hash_arrays(X_fit, y_fit, X_val, y_val) if self.cache_dir else None
+        for trial_id, model in list(models.items()):
+            cache_path = model_cache_path(self.cache_dir, model, data_hash, self.cache_namespace) if self.cache_dir else None
+            if cache_path and os.path.exists(cache_path):
+                cached = load_object(cache_path)
+                results[trial_id] = cached['score']
+                self._record(trial_id, rung, len(X_fit), 'completed', score=cached['score'], **dict(cached['timings'], cached=True))
+                del models[trial_id]
+        if not models:
+            return results
+
+        # The pool's workers are the child processes started after this point
+        other_children = set(multiprocessing.active_children())
+        executor = ProcessPoolExecutor(max_workers=min(self.n_workers, len(models)))
+        pending = set()
+        try:
+            futures = {
+                executor.submit(_fit_and_score, trial_id, model, X_fit, y_fit, X_val, y_val): trial_id
+                for trial_id, model in models.items()
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        trial_id, model, score, fit_seconds, predict_seconds = future.result()
+                    except BrokenProcessPool as e:
+                        # A worker died (e.g. out of memory); the trials it took down cannot finish
+                        self._record(futures[future], rung, len(X_fit), 'failed', error=str(e))
+                        continue
+                    results[trial_id] = score
+                    timings = {'fit_seconds': fit_seconds, 'predict_seconds': predict_seconds}
+                    self._record(trial_id, rung, len(X_fit), 'completed', score=score, cached=False, **timings)
+                    if self.cache_dir:
+                        save_object(model_cache_path(self.cache_dir, model, data_hash, self.cache_namespace),
+                                    {'model': model, 'score': score, 'timings': dict(timings, cached=False)})
+                if pending and time.time() >= deadline:
+                    for future in pending:
+                        self._record(futures[future], rung, len(X_fit), 'stopped')
+                    break
+        finally:
+            if pending:
+                processes = [process for process in multiprocessing.active_children() if process not in other_children]
+                executor.shutdown(wait=False, cancel_futures=True)
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.join()
+                logging.info(f"Search budget exhausted in rung {rung}: stopped {len(pending)} trials")
+            else:
+                executor.shutdown()
+        return results
+
+    def run(self, X, y):
+        """
+        Returns (model_name, params) of the best configuration, or None.
+
+        Every sampled configuration is trained on a small subsample first;
+        only the best 1/eta of each rung advances to eta times more rows.
+        """
+        from sklearn.model_selection import train_test_split
+
+        X_fit, X_val, y_fit, y_val = train_test_split(X, y, test_size=0.2, random_state=self.random_state)
+        order = np.random.default_rng(self.random_state).permutation(len(X_fit))
+
+        self.trials = trials = dict(enumerate(self.sample_configs()))
+        deadline = time.time() + self.time_budget
+        n_rungs = 1 + int(math.floor(math.log(1 / self.min_resource, self.eta) + 1e-9))
+        best = None
+
+        for rung in range(n_rungs):
+            # The halving ends on all of X_fit: in the last rung, or once a single trial is left
+            final = rung == n_rungs - 1 or len(trials) == 1
+            n_rows = len(X_fit) if final else int(len(X_fit) * self.min_resource * self.eta ** rung)
+            rows = order[:n_rows]
+            scores = self._run_rung(trials, X_fit[rows], y_fit[rows], X_val, y_val, deadline, rung)
+            if not scores:
+                break
+
+            ranked = sorted(scores, key=scores.get, reverse=True)
+            best = trials[ranked[0]]
+            logging.info(f"Search rung {rung}: {len(scores)} trials on {n_rows} rows, best {best} R2 {scores[ranked[0]]:.4f}")
+
+            if final or time.time() >= deadline:
+                break
+            trials = {trial_id: trials[trial_id] for trial_id in ranked[:max(1, len(ranked) // self.eta)]}
+
+        return best
+
+    def save_history(self, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as file_obj:
+            json.dump(self.history, file_obj, indent=2, default=str)
 
 class ModelTrainer:
     def __init__(self):
@@ -44,10 +245,20 @@ class ModelTrainer:
                 'Gradient Boosting': GradientBoostingRegressor()
             }
 
-            model_report: dict = evaluate_models(X_train, y_train, X_test, y_test, models)
+            model_timings = {}
+            model_report: dict = evaluate_models(
+                X_train, y_train, X_test, y_test, models,
+                n_workers=self.model_trainer_config.n_workers,
+                cache_dir=self.model_trainer_config.model_cache_dir,
+                timings=model_timings
+            )
             print(model_report)
+            for model_name, timing in model_timings.items():
+                source = 'cached' if timing['cached'] else 'trained'
+                print(f"{model_name}: fit {timing['fit_seconds']:.2f}s, predict {timing['predict_seconds']:.2f}s ({source})")
             print('\n==============================================================================')
             logging.info(f'Model Report: {model_report}')
+            logging.info(f'Model Timings: {model_timings}')
 
             # Get the best model score from dict
             best_model_score = max(sorted(model_report.values()))
@@ -57,6 +268,11 @@ class ModelTrainer:
                 list(model_report.values()).index(best_model_score)
             ]
             best_model = models[best_model_name]
+
+            if self.model_trainer_config.search_enabled:
+                best_model_name, best_model_score, best_model = self.search_hyperparameters(
+                    models, X_train, y_train, X_test, y_test, best_model_name, best_model_score, best_model
+                )
             
             print(f'Best Model Found, Model Name: {best_model_name}, R2 Score: {best_model_score}')
             print('\n=================================================================================')
@@ -67,8 +283,46 @@ class ModelTrainer:
                 obj=best_model
             )
 
+            # Recorded in the manifest when the artifacts are published as a version
+            self.best_model_name = best_model_name
+            self.best_model_score = best_model_score
+            self.model_report = model_report
+
             return best_model_score
 
         except Exception as e:
             logging.error("Exception occurred during model training")
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+    def search_hyperparameters(self, models, X_train, y_train, X_test, y_test,
+                               best_model_name, best_model_score, best_model):
+        # Keeps the default winner unless a tuned configuration scores higher on the test set
+        config = self.model_trainer_config
+        search = SuccessiveHalvingSearch(
+            models, SEARCH_SPACES,
+            n_candidates=config.search_candidates_per_model,
+            eta=config.search_eta,
+            min_resource=config.search_min_resource,
+            time_budget=config.search_time_budget,
+            n_workers=config.n_workers,
+            cache_dir=config.model_cache_dir,
+            cache_namespace=hash_arrays(X_train, y_train, X_test, y_test) if config.model_cache_dir else None
+        )
+        result = search.run(X_train, y_train)
+        search.save_history(config.search_history_file_path)
+        logging.info(f'Search history saved to {config.search_history_file_path}')
+
+        if result is None:
+            return best_model_name, best_model_score, best_model
+
+        model_name, params = result
+        tuned_models, timings = {model_name: search._build(model_name, params)}, {}
+        tuned_score = evaluate_models(X_train, y_train, X_test, y_test, tuned_models,
+                                      cache_dir=config.model_cache_dir, timings=timings)[model_name]
+        tuned_model = tuned_models[model_name]
+        print(f'Tuned {model_name} {params}: R2 Score: {tuned_score} (fit {timings[model_name]["fit_seconds"]:.2f}s)')
+        logging.info(f'Tuned {model_name} {params}: R2 Score: {tuned_score}')
+
+        if tuned_score > best_model_score:
+            return f'{model_name} (tuned)', tuned_score, tuned_model
+        return best_model_name, best_model_score, best_model
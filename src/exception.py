@@ -1,23 +1,89 @@
 import sys
 import logging
 
+ERROR_MESSAGE_FORMAT = "Error occurred in Python script name [{0}] line number [{1}] error message [{2}]"
+
 def error_message_details(error, error_details: sys):
     _, _, exc_tb = error_details.exc_info()
     file_name = exc_tb.tb_frame.f_code.co_filename
 
-    error_message = "Error occurred in Python script name [{0}] line number [{1}] error message [{2}]".format(
-        file_name, exc_tb.tb_lineno, str(error)
-    )
+    error_message = ERROR_MESSAGE_FORMAT.format(file_name, exc_tb.tb_lineno, str(error))
     return error_message
 
 class CustomException(Exception):
-    def __init__(self, error_message, error_details: sys):
+    """
+    Base of the project's errors. `code` is a machine-readable error code and
+    `http_status` the status the API answers with.
+
+    Only the location of the active exception is recorded here; the message is
+    formatted on the first str(). When `error_message` is an exception it becomes
+    the __cause__, so the original traceback is kept instead of being re-rendered
+    at every layer.
+    """
+
+    code = 'internal_error'
+    http_status = 500
+
+    def __init__(self, error_message, error_details: sys = sys):
         super().__init__(error_message)
-        self.error_message = error_message_details(error_message, error_details=error_details)  # Fixed: pass error_message instead of error
+        self.error = error_message
+        if isinstance(error_message, BaseException):
+            self.__cause__ = error_message
+
+        exc_tb = error_details.exc_info()[2] if error_details is not None else None
+        if exc_tb is not None:
+            self.file_name, self.line_number = exc_tb.tb_frame.f_code.co_filename, exc_tb.tb_lineno
+        else:
+            self.file_name = self.line_number = None
+        self._error_message = None
+
+    @property
+    def error_message(self):
+        if self._error_message is None:
+            if self.file_name is None:
+                self._error_message = str(self.error)
+            else:
+                self._error_message = ERROR_MESSAGE_FORMAT.format(self.file_name, self.line_number, self.reason)
+        return self._error_message
+
+    @property
+    def reason(self):
+        # Message of the original error, without the locations added by wrapping layers
+        error = self.error
+        while isinstance(error, CustomException):
+            error = error.error
+        return str(error)
 
     def __str__(self):
         return self.error_message
 
+    def to_dict(self):
+        return {'code': self.code, 'error': self.reason}
+
+class ValidationError(CustomException, ValueError):
+    # Input that cannot be scored as sent; also a ValueError for existing handlers
+    code = 'invalid_input'
+    http_status = 400
+
+class ArtifactError(CustomException):
+    # Model or preprocessor missing, unreadable or failing its checks
+    code = 'artifact_unavailable'
+    http_status = 503
+
+class InferenceError(CustomException):
+    # The model or preprocessor failed on valid input
+    code = 'inference_failed'
+    http_status = 500
+
+def wrap_error(error, error_type=None):
+    # Project errors pass through unchanged; others are wrapped once, by default as a
+    # ValidationError for ValueErrors (request parsing and decoding) and CustomException otherwise
+    if isinstance(error, CustomException):
+        return error
+    if error_type is None:
+        error_type = ValidationError if isinstance(error, ValueError) else CustomException
+    return error_type(error, sys)
+
 # Test section
 if __name__ == '__main__':
     logging.info("Logging has started")
@@ -26,4 +92,4 @@ if __name__ == '__main__':
         a = 1 / 0
     except Exception as e:
         logging.info('Division by zero error')
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
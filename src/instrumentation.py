@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+# Spans are always recorded unless INSTRUMENTATION_ENABLED=0; one span costs 1-2 microseconds
+ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', '1') != '0'
+
+# The /api/profile endpoints exist only with PROFILER_ENABLED=1; they are unauthenticated
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '0') == '1'
+# Shorter sampling intervals would keep the profiler thread busy walking stacks
+MIN_PROFILE_INTERVAL = 0.001
+
+# Histogram upper bounds in seconds, from 50us (cached single predictions) to 10s (100k-row batches)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_METRIC = 'diamond_stage_duration_seconds'
+HTTP_METRIC = 'diamond_http_request_duration_seconds'
+
+HELP = {
+    STAGE_METRIC: 'Time spent in each prediction stage',
+    HTTP_METRIC: 'Time spent handling each HTTP request'
+}
+
+class Histogram:
+    # Bucket counts are kept per bucket and made cumulative when rendered
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for n in counts:
+            running += n
+            cumulative.append(running)
+        return cumulative, total, count
+
+## Process-wide histograms, rendered in the Prometheus text format
+class MetricsRegistry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def histogram(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, name, value, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        lines, seen = [], set()
+        for (name, labels), histogram in items:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+
+            cumulative, total, count = histogram.snapshot()
+            label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+            prefix = label_text + ',' if label_text else ''
+            for bound, n in zip(histogram.buckets, cumulative):
+                lines.append(f'{name}_bucket{{{prefix}le="{bound:g}"}} {n}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {cumulative[-1]}')
+            lines.append(f"{name}_sum{{{label_text}}} {total:.9g}")
+            lines.append(f"{name}_count{{{label_text}}} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, name=STAGE_METRIC):
+        # {stage: {'count', 'mean_ms'}} for JSON endpoints and quick checks
+        with self._lock:
+            items = [(labels, histogram) for (metric, labels), histogram in self._histograms.items() if metric == name]
+        result = {}
+        for labels, histogram in items:
+            _, total, count = histogram.snapshot()
+            key = ','.join(str(value) for _, value in labels)
+            result[key] = {'count': count, 'mean_ms': total / count * 1000 if count else None}
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+        if self is metrics:
+            _stage_histograms.clear()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+metrics = MetricsRegistry()
+
+# stage -> histogram, so a span skips building the label key
+_stage_histograms = {}
+
+class span:
+    """
+    Times a block into diamond_stage_duration_seconds{stage=...}:
+
+        with span('transform'):
+            data_scaled = preprocessor.transform(features)
+
+    Recorded also when the block raises.
+    """
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, stage):
+        histogram = _stage_histograms.get(stage)
+        if histogram is None and ENABLED:
+            histogram = _stage_histograms.setdefault(stage, metrics.histogram(STAGE_METRIC, stage=stage))
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.histogram is not None:
+            self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+## On-demand sampling profiler: periodically records every thread's Python stack
+class SamplingProfiler:
+    # Innermost functions of threads that are blocked rather than working
+    IDLE_FUNCTIONS = frozenset({'wait', 'select', 'poll', 'accept', 'sleep', '_wait_for_tstate_lock',
+                                'readinto', 'recv', 'recv_into'})
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples = Counter()
+        self.n_samples = 0
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=None):
+        # Clears the previous profile
+        with self._lock:
+            if self.running:
+                return False
+            self.interval = max(MIN_PROFILE_INTERVAL, interval or self.interval)
+            self.samples = Counter()
+            self.n_samples = 0
+            self.started_at, self.stopped_at = time.time(), None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        thread = self._thread
+        self._stop.set()
+        if thread is not None:
+            thread.join(timeout=5)
+        self.stopped_at = self.stopped_at or time.time()
+        return self.report()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.n_samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_name in self.IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def report(self, top=50):
+        # Collapsed stacks ("outer;...;inner count"), hottest first; flamegraph tools read this format
+        samples = self.samples.copy()
+        end = self.stopped_at or time.time()
+        header = [
+            f"# samples: {self.n_samples} every {self.interval * 1000:g} ms, "
+            f"{(end - self.started_at) if self.started_at else 0:.1f} s, running: {self.running}",
+            f"# busy thread stacks: {sum(samples.values())}"
+        ]
+        return '\n'.join(header + [f"{stack} {count}" for stack, count in samples.most_common(top)]) + '\n'
+
+profiler = SamplingProfiler()
@@ -1,15 +1,142 @@
 import logging
+import logging.handlers
+import atexit
+import queue
+import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from dataclasses import dataclass
 
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-logs_path = os.path.join(os.getcwd(), "logs")
-os.makedirs(logs_path, exist_ok=True)
+## Queue-based logging: callers only enqueue records, a listener thread formats and writes them
+@dataclass
+class LoggingConfig:
+    log_dir: str = os.path.join(os.getcwd(), "logs")
+    file_name: str = "diamond_price.log"
+    level: str = os.environ.get('LOG_LEVEL', 'INFO')
+    # 'text' or 'json' (one JSON object per line)
+    log_format: str = os.environ.get('LOG_FORMAT', 'text')
+    # 'size' rotates at max_bytes, 'time' rotates on the `when` interval
+    rotation: str = os.environ.get('LOG_ROTATION', 'size')
+    max_bytes: int = 10 * 1024 * 1024
+    when: str = 'midnight'
+    backup_count: int = 5
+    # Records beyond this are dropped rather than blocking the caller
+    queue_size: int = 10000
 
-LOG_FILE_PATH = os.path.join(logs_path, LOG_FILE)
+LOG_FILE_PATH = os.path.join(LoggingConfig.log_dir, LoggingConfig.file_name)
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO
-)
+TEXT_FORMAT = "[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+class LazyFileMixin:
+    # Creates the logs directory and file on the first record, not at setup
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+class LazyRotatingFileHandler(LazyFileMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+class LazyTimedRotatingFileHandler(LazyFileMixin, logging.handlers.TimedRotatingFileHandler):
+    pass
+
+class JsonFormatter(logging.Formatter):
+    # Attributes every LogRecord has; anything else was passed through `extra=`
+    RESERVED = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in self.RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The stock handler renders the message here, on the calling thread; the listener does it instead
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class lazy:
+    """
+    Defers building an expensive log argument until a handler renders it:
+
+        logging.debug("Train Dataframe Head:\\n%s", lazy(lambda: train_df.head().to_string()))
+
+    Nothing is computed when DEBUG is disabled, and otherwise only on the listener thread.
+    """
+
+    __slots__ = ('func', 'text')
+
+    def __init__(self, func):
+        self.func = func
+        self.text = None
+
+    def __str__(self):
+        # Rendered once; size-based rotation formats each record twice
+        if self.text is None:
+            self.text = str(self.func())
+        return self.text
+
+_listener = None
+
+def build_file_handler(config):
+    path = os.path.join(config.log_dir, config.file_name)
+    if config.rotation == 'time':
+        handler = LazyTimedRotatingFileHandler(path, when=config.when, backupCount=config.backup_count, delay=True)
+    elif config.rotation == 'size':
+        handler = LazyRotatingFileHandler(path, maxBytes=config.max_bytes, backupCount=config.backup_count, delay=True)
+    else:
+        raise ValueError(f"Unknown log rotation {config.rotation!r}, expected 'size' or 'time'")
+    handler.setFormatter(JsonFormatter() if config.log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+def setup_logging(config=None):
+    """
+    Routes the root logger through a bounded queue to a rotating file handler.
+    Safe to call more than once; later calls replace the previous listener.
+    """
+    global _listener
+    config = config or LoggingConfig()
+    log_queue = queue.Queue(maxsize=config.queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+
+    stop_logging()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, NonBlockingQueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(config.level.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, build_file_handler(config), respect_handler_level=True)
+    _listener.start()
+    return queue_handler
+
+def stop_logging():
+    # Flushes queued records and closes the file; registered with atexit
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(stop_logging)
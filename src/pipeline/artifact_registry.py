@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import logging
+import threading
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from exception import ArtifactError
+from utils import load_object
+
+class ArtifactRegistry:
+    """
+    Process-wide cache of unpickled artifacts.
+
+    Entries are keyed by absolute path and validated against the file's
+    (mtime, size) fingerprint, so an artifact is only loaded again when the
+    file on disk changes. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._entries = {}
+        self._stats = {}
+
+    @staticmethod
+    def _fingerprint(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _path_lock(self, path):
+        with self._lock:
+            if path not in self._path_locks:
+                self._path_locks[path] = threading.Lock()
+            return self._path_locks[path]
+
+    def _record_hit(self, path):
+        with self._lock:
+            self._stats[path]['hits'] += 1
+
+    def _get_entry(self, file_path, record_hit=True):
+        path = os.path.abspath(file_path)
+        fingerprint = self._fingerprint(path)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            if record_hit:
+                self._record_hit(path)
+            return entry
+
+        # Only one thread loads a given path; the others wait and reuse it
+        with self._path_lock(path):
+            entry = self._entries.get(path)
+            fingerprint = self._fingerprint(path)
+            if entry is not None and entry['fingerprint'] == fingerprint:
+                if record_hit:
+                    self._record_hit(path)
+                return entry
+
+            start = time.perf_counter()
+            obj = load_object(file_path=path)
+            load_seconds = time.perf_counter() - start
+
+            with self._lock:
+                stats = self._stats.setdefault(path, {
+                    'hits': 0,
+                    'loads': 0,
+                    'total_load_seconds': 0.0
+                })
+                stats['loads'] += 1
+                stats['last_load_seconds'] = load_seconds
+                stats['total_load_seconds'] += load_seconds
+                stats['loaded_at'] = time.time()
+                stats['version'] = "{0}-{1}".format(*fingerprint)
+                entry = {'fingerprint': fingerprint, 'obj': obj, 'derived': {}}
+                self._entries[path] = entry
+
+            logging.info(f"Loaded artifact {path} in {load_seconds:.3f}s")
+            return entry
+
+    def get(self, file_path):
+        return self._get_entry(file_path)['obj']
+
+    def derive(self, file_path, name, factory):
+        # Cache factory(artifact) next to the artifact; rebuilt whenever the file reloads
+        entry = self._get_entry(file_path, record_hit=False)
+        derived = entry['derived']
+        if name not in derived:
+            with self._path_lock(os.path.abspath(file_path)):
+                if name not in derived:
+                    derived[name] = factory(entry['obj'])
+        return derived[name]
+
+    def get_first(self, file_paths):
+        # Return (path, object) for the first candidate that exists and loads
+        errors = []
+        for path in file_paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                return path, self.get(path)
+            except Exception as e:
+                logging.warning(f"Failed to load artifact from {path}: {e}")
+                errors.append(f"{path}: {e}")
+
+        raise ArtifactError(f"Could not load artifact from any of {list(file_paths)} {errors}")
+
+    def version(self, file_path):
+        entry = self._entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        return "{0}-{1}".format(*entry['fingerprint'])
+
+    def evict(self, file_path):
+        # Drops a loaded artifact (e.g. a superseded model version); stats are kept
+        with self._lock:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+    def stats(self):
+        with self._lock:
+            return {path: dict(stats) for path, stats in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+# Shared by every PredictPipeline in the process
+artifact_registry = ArtifactRegistry()
@@ -0,0 +1,289 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@dataclass
+class ArtifactStoreConfig:
+    root_dir: str = os.path.join('artifacts', 'versions')
+    current_file_name: str = 'CURRENT'
+    manifest_file_name: str = 'manifest.json'
+    model_file_name: str = 'model.pkl'
+    preprocessor_file_name: str = 'preprocessor.pkl'
+    # Seconds between checks of the CURRENT pointer by serving processes
+    watch_interval: float = 5.0
+
+def _get_umask():
+    # os.umask can only be read by setting it, so this runs once at import
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+UMASK = _get_umask()
+
+def file_sha256(file_path):
+    # A directory (e.g. a compact model export) hashes its relative file names and contents
+    digest = hashlib.sha256()
+    if os.path.isdir(file_path):
+        for dir_path, dir_names, file_names in os.walk(file_path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(path, file_path).encode() + b'\0')
+                digest.update(file_sha256(path).encode())
+        return digest.hexdigest()
+
+    with open(file_path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def path_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(dir_path, name))
+                   for dir_path, _, file_names in os.walk(path) for name in file_names)
+    return os.path.getsize(path)
+
+def write_atomic(file_path, text):
+    # Readers see either the old or the new content, never a partial write
+    dir_path = os.path.dirname(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as file_obj:
+            file_obj.write(text)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        # mkstemp creates the file as 0600; readers in other accounts need the usual mode
+        os.chmod(tmp_path, 0o666 & ~UMASK)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+## Immutable, versioned model/preprocessor pairs with an atomic CURRENT pointer
+class ArtifactStore:
+    """
+    artifacts/versions/<version>/{model.pkl, preprocessor.pkl, manifest.json, extras...}
+
+    A version directory is fully written under a temporary name and renamed
+    into place, and never modified afterwards. CURRENT holds the name of the
+    version being served; switching it is a single atomic rename.
+    """
+
+    def __init__(self, root_dir=None):
+        self.config = ArtifactStoreConfig()
+        self.root_dir = root_dir or self.config.root_dir
+
+    @property
+    def current_file_path(self):
+        return os.path.join(self.root_dir, self.config.current_file_name)
+
+    def version_dir(self, version):
+        return os.path.join(self.root_dir, version)
+
+    def paths(self, version):
+        # (model_path, preprocessor_path) for a published version
+        version_dir = self.version_dir(version)
+        return (os.path.join(version_dir, self.config.model_file_name),
+                os.path.join(version_dir, self.config.preprocessor_file_name))
+
+    def extra_path(self, version, role):
+        # Path of an extra artifact published with a version (see publish), or None
+        entry = self.manifest(version)['files'].get(role)
+        return os.path.join(self.version_dir(version), entry['file']) if entry is not None else None
+
+    def manifest(self, version):
+        with open(os.path.join(self.version_dir(version), self.config.manifest_file_name)) as file_obj:
+            return json.load(file_obj)
+
+    def list_versions(self):
+        # Oldest first; version names sort by publish time
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root_dir)
+            if not name.startswith('.')
+            and os.path.isfile(os.path.join(self.root_dir, name, self.config.manifest_file_name))
+        )
+
+    def current_version(self):
+        try:
+            with open(self.current_file_path) as file_obj:
+                version = file_obj.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def publish(self, model_path, preprocessor_path, metrics=None, schema=None, activate=True, extra_files=None):
+        # Copies the model, the preprocessor and any extra_files ({role: file or directory},
+        # stored under their base names) into a new version directory and returns its name
+        os.makedirs(self.root_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(dir=self.root_dir, prefix='.staging-')
+        try:
+            # mkdtemp creates the directory as 0700
+            os.chmod(staging_dir, 0o777 & ~UMASK)
+            sources = [
+                ('model', model_path, self.config.model_file_name),
+                ('preprocessor', preprocessor_path, self.config.preprocessor_file_name)
+            ] + [(role, source, os.path.basename(os.path.normpath(source))) for role, source in (extra_files or {}).items()]
+
+            files = {}
+            for role, source, file_name in sources:
+                target = os.path.join(staging_dir, file_name)
+                if role in files or os.path.exists(target) or file_name == self.config.manifest_file_name:
+                    raise ValueError(f"Duplicate artifact role or file name: {role} ({file_name})")
+                if os.path.isdir(source):
+                    shutil.copytree(source, target)
+                else:
+                    shutil.copyfile(source, target)
+                files[role] = {
+                    'file': file_name,
+                    'sha256': file_sha256(target),
+                    'size': path_size(target),
+                    'source': source
+                }
+
+            # Names sort in publish order (microsecond timestamp) and identify the model by hash
+            created_at = datetime.now()
+            version = f"v{created_at.strftime('%Y%m%d-%H%M%S.%f')}-{files['model']['sha256'][:8]}"
+            if os.path.exists(self.version_dir(version)):
+                raise FileExistsError(f"Artifact version {version} already exists")
+
+            manifest = {
+                'version': version,
+                'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'files': files,
+                'metrics': metrics or {},
+                'schema': schema or {}
+            }
+            with open(os.path.join(staging_dir, self.config.manifest_file_name), 'w') as file_obj:
+                json.dump(manifest, file_obj, indent=2, default=str)
+
+            os.rename(staging_dir, self.version_dir(version))
+        finally:
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+        logging.info(f"Published artifact version {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def verify(self, version):
+        # True when every file still matches the hash recorded at publish time
+        manifest = self.manifest(version)
+        return all(
+            file_sha256(os.path.join(self.version_dir(version), entry['file'])) == entry['sha256']
+            for entry in manifest['files'].values()
+        )
+
+    def activate(self, version):
+        if version not in self.list_versions():
+            raise ValueError(f"Unknown artifact version {version}")
+        write_atomic(self.current_file_path, version + '\n')
+        logging.info(f"Activated artifact version {version}")
+        return version
+
+    def rollback(self):
+        # Activates the version published before the current one
+        versions = self.list_versions()
+        current = self.current_version()
+        if current not in versions or versions.index(current) == 0:
+            raise ValueError(f"No version to roll back to from {current}")
+        return self.activate(versions[versions.index(current) - 1])
+
+## Loads newly activated versions in the background and swaps them in
+class ArtifactWatcher:
+    def __init__(self, pipeline, store=None, interval=None):
+        # pipeline needs active_version and activate(version) (see PredictPipeline)
+        self.pipeline = pipeline
+        self.store = store if store is not None else pipeline.store
+        self.interval = interval if interval is not None else self.store.config.watch_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.swaps = 0
+        self.failures = 0
+        self.last_error = None
+        # Not retried until CURRENT points somewhere else
+        self._failed_version = None
+
+    def check(self):
+        # Returns True when a new version was swapped in
+        version = self.store.current_version()
+        if version is None or version == self.pipeline.active_version or version == self._failed_version:
+            return False
+        try:
+            start = time.perf_counter()
+            self.pipeline.activate(version)
+            self.swaps += 1
+            self.last_error = None
+            logging.info(f"Swapped to artifact version {version} in {time.perf_counter() - start:.3f}s")
+            return True
+        except Exception as e:
+            # Keep serving the previous version
+            self.failures += 1
+            self._failed_version = version
+            self.last_error = f"{version}: {e}"
+            logging.error(f"Failed to activate artifact version {version}: {e}")
+            return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='artifact-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self):
+        return {
+            'active_version': self.pipeline.active_version,
+            'current_version': self.store.current_version(),
+            'interval': self.interval,
+            'swaps': self.swaps,
+            'failures': self.failures,
+            'last_error': self.last_error
+        }
+
+# Shared by every PredictPipeline in the process
+artifact_store = ArtifactStore()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Inspect, activate or roll back versioned artifacts')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--list', action='store_true', help='List published versions')
+    group.add_argument('--activate', metavar='VERSION', help='Serve this version')
+    group.add_argument('--rollback', action='store_true', help='Serve the version before the current one')
+    parser.add_argument('--root-dir', default=ArtifactStoreConfig.root_dir)
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root_dir)
+    if args.list:
+        current = store.current_version()
+        for version in store.list_versions():
+            metrics = store.manifest(version).get('metrics', {})
+            print(f"{'*' if version == current else ' '} {version} {json.dumps(metrics)}")
+    elif args.activate:
+        print(f"Active version: {store.activate(args.activate)}")
+    else:
+        print(f"Rolled back to: {store.rollback()}")
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from exception import CustomException
+from pipeline.predict_pipeline import PredictPipeline, BatchData, FEATURE_COLUMNS
+
+@dataclass
+class BatchPredictConfig:
+    chunk_size: int = 50000
+    id_column: str = 'id'
+
+## Bulk scoring of CSV/Parquet files in fixed-size chunks
+class BatchPredictPipeline:
+    def __init__(self, chunk_size=None, predict_pipeline=None):
+        self.batch_predict_config = BatchPredictConfig()
+        if chunk_size is not None:
+            self.batch_predict_config.chunk_size = chunk_size
+        self.predict_pipeline = predict_pipeline if predict_pipeline is not None else PredictPipeline()
+
+    def _wanted(self, column):
+        return column in FEATURE_COLUMNS or column == self.batch_predict_config.id_column
+
+    def iter_chunks(self, input_path):
+        chunk_size = self.batch_predict_config.chunk_size
+
+        if input_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(input_path)
+            columns = [name for name in parquet_file.schema_arrow.names if self._wanted(name)]
+            for record_batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+                yield record_batch.to_pandas()
+        else:
+            yield from pd.read_csv(input_path, chunksize=chunk_size, usecols=self._wanted)
+
+    def score_chunk(self, chunk, row_offset=0):
+        chunk = chunk.reindex(columns=FEATURE_COLUMNS + [
+            col for col in chunk.columns if col not in FEATURE_COLUMNS
+        ]).reset_index(drop=True)
+        valid_df, errors = BatchData.validate(chunk)
+
+        predictions = np.full(len(chunk), np.nan)
+        if len(valid_df):
+            predictions[valid_df.index.to_numpy()] = self.predict_pipeline.predict(valid_df[FEATURE_COLUMNS])
+
+        error_messages = np.full(len(chunk), None, dtype=object)
+        for error in errors:
+            error_messages[error['index']] = error['error']
+
+        output = pd.DataFrame({'row': np.arange(row_offset, row_offset + len(chunk))})
+        id_column = self.batch_predict_config.id_column
+        if id_column in chunk.columns:
+            output[id_column] = chunk[id_column].to_numpy()
+        output['predicted_price'] = predictions
+        output['error'] = pd.array(error_messages, dtype='string')
+        return output, len(errors)
+
+    def initiate_batch_prediction(self, input_path, output_path):
+        try:
+            logging.info(f"Batch prediction started: {input_path} -> {output_path}")
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+            # Load artifacts before the first chunk so timings reflect scoring only
+            self.predict_pipeline.load_artifacts()
+
+            start = time.perf_counter()
+            rows, failed = 0, 0
+            parquet_writer = None
+            try:
+                for chunk in self.iter_chunks(input_path):
+                    output, chunk_failed = self.score_chunk(chunk, row_offset=rows)
+
+                    if output_path.endswith('.parquet'):
+                        import pyarrow as pa
+                        import pyarrow.parquet as pq
+
+                        table = pa.Table.from_pandas(output, preserve_index=False)
+                        if parquet_writer is None:
+                            parquet_writer = pq.ParquetWriter(output_path, table.schema)
+                        parquet_writer.write_table(table.cast(parquet_writer.schema))
+                    else:
+                        output.to_csv(output_path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+
+                    rows += len(output)
+                    failed += chunk_failed
+            finally:
+                if parquet_writer is not None:
+                    parquet_writer.close()
+
+            elapsed = time.perf_counter() - start
+            summary = {
+                'rows': rows,
+                'predicted': rows - failed,
+                'failed': failed,
+                'seconds': elapsed,
+                'rows_per_second': rows / elapsed if elapsed > 0 else 0.0
+            }
+            logging.info(f"Batch prediction completed: {summary}")
+            return summary
+
+        except Exception as e:
+            logging.error("Error occurred in batch prediction")
+            raise CustomException(e, sys)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score a CSV or Parquet file of diamonds in chunks')
+    parser.add_argument('--input', required=True, help='Input .csv or .parquet file')
+    parser.add_argument('--output', required=True, help='Output .csv or .parquet file')
+    parser.add_argument('--chunk-size', type=int, default=BatchPredictConfig.chunk_size)
+    parser.add_argument('--workers', type=int, default=1, help='Score each chunk across this many processes')
+    args = parser.parse_args()
+
+    predict_pipeline = None
+    if args.workers > 1:
+        from pipeline.parallel_predict_pipeline import ParallelPredictPipeline
+        predict_pipeline = ParallelPredictPipeline(n_workers=args.workers)
+
+    try:
+        batch_pipeline = BatchPredictPipeline(chunk_size=args.chunk_size, predict_pipeline=predict_pipeline)
+        summary = batch_pipeline.initiate_batch_prediction(args.input, args.output)
+        print(f"Scored {summary['rows']} rows ({summary['failed']} failed) "
+              f"in {summary['seconds']:.2f}s, {summary['rows_per_second']:,.0f} rows/sec")
+
+        if predict_pipeline is not None:
+            for pid, stats in predict_pipeline.worker_report().items():
+                print(f"Worker {pid}: {stats['rows']} rows, {stats['rows_per_second']:,.0f} rows/sec")
+    finally:
+        if predict_pipeline is not None:
+            predict_pipeline.close()
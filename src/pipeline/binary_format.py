@@ -0,0 +1,131 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from Components.data_transformation import CATEGORIES, CATEGORICAL_COLS, NUMERICAL_COLS
+
+# pyarrow is only imported when an Arrow request arrives
+
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+RAW_CONTENT_TYPE = 'application/octet-stream'
+
+# Raw request layout for N rows, little-endian, no header:
+#   N x 6 float32  carat, depth, table, x, y, z   (row-major, 24 bytes per row)
+#   N x 3 int8     cut, color, clarity codes      (row-major, 3 bytes per row)
+# Codes index CATEGORIES[col]; -1 marks a missing value.
+# The response is N little-endian float32 prices, NaN for rows that failed validation.
+RAW_NUMERIC_DTYPE = np.dtype('<f4')
+RAW_CODE_DTYPE = np.dtype('i1')
+RAW_ROW_BYTES = len(NUMERICAL_COLS) * RAW_NUMERIC_DTYPE.itemsize + len(CATEGORICAL_COLS) * RAW_CODE_DTYPE.itemsize
+
+def read_raw(buffer):
+    # Returns {column: 1-D array}; every array is a view into buffer, nothing is copied
+    if len(buffer) == 0 or len(buffer) % RAW_ROW_BYTES:
+        raise ValueError(f'Raw payload must be a non-empty multiple of {RAW_ROW_BYTES} bytes per row, got {len(buffer)} bytes')
+
+    n_rows = len(buffer) // RAW_ROW_BYTES
+    numeric = np.frombuffer(buffer, dtype=RAW_NUMERIC_DTYPE, count=n_rows * len(NUMERICAL_COLS))
+    numeric = numeric.reshape(n_rows, len(NUMERICAL_COLS))
+    codes = np.frombuffer(buffer, dtype=RAW_CODE_DTYPE, offset=numeric.nbytes)
+    codes = codes.reshape(n_rows, len(CATEGORICAL_COLS))
+
+    columns = {col: numeric[:, k] for k, col in enumerate(NUMERICAL_COLS)}
+    columns.update({col: codes[:, k] for k, col in enumerate(CATEGORICAL_COLS)})
+    return columns
+
+def write_raw(columns):
+    # Client-side encoder for read_raw(); categoricals may be codes or category strings
+    n_rows = len(columns[NUMERICAL_COLS[0]])
+    numeric = np.empty((n_rows, len(NUMERICAL_COLS)), dtype=RAW_NUMERIC_DTYPE)
+    for k, col in enumerate(NUMERICAL_COLS):
+        numeric[:, k] = columns[col]
+    codes = np.empty((n_rows, len(CATEGORICAL_COLS)), dtype=RAW_CODE_DTYPE)
+    for k, col in enumerate(CATEGORICAL_COLS):
+        codes[:, k] = encode_categories(col, columns[col])
+    return numeric.tobytes() + codes.tobytes()
+
+def encode_categories(col, values):
+    # Category strings -> codes into CATEGORIES[col]; missing -> -1, unknown -> len(categories)
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values
+    codes = pd.Index(CATEGORIES[col]).get_indexer(values)
+    codes[codes < 0] = len(CATEGORIES[col])
+    codes[pd.isna(values)] = -1
+    return codes
+
+def scatter_predictions(prices, n_rows, errors, dtype=np.float64):
+    # Predictions for the valid rows spread back over all n_rows; failed rows are NaN
+    out = np.full(n_rows, np.nan, dtype=dtype)
+    valid = np.ones(n_rows, dtype=bool)
+    valid[[error['index'] for error in errors]] = False
+    out[valid] = prices
+    return out
+
+def write_raw_predictions(prices, n_rows, errors=()):
+    return scatter_predictions(prices, n_rows, errors, RAW_NUMERIC_DTYPE).tobytes()
+
+def read_arrow(buffer):
+    # Decodes an Arrow IPC stream. Float columns without nulls are wrapped zero-copy;
+    # categoricals may be integer codes, dictionary-encoded or plain strings.
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(pa.py_buffer(buffer)).read_all()
+    missing = [col for col in NUMERICAL_COLS + CATEGORICAL_COLS if col not in table.column_names]
+    if missing:
+        raise ValueError(f'Arrow stream is missing columns: {", ".join(missing)}')
+
+    columns = {}
+    for col in NUMERICAL_COLS + CATEGORICAL_COLS:
+        chunked = table.column(col)
+        array = chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+        if col in CATEGORIES:
+            columns[col] = _arrow_codes(pa, col, array)
+        elif pa.types.is_floating(array.type):
+            columns[col] = array.to_numpy(zero_copy_only=False)
+        elif pa.types.is_integer(array.type):
+            columns[col] = array.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        else:
+            raise ValueError(f'Arrow column {col} must be numeric, got {array.type}')
+    return columns
+
+def _arrow_codes(pa, col, array):
+    if pa.types.is_dictionary(array.type):
+        # Remap the (small) dictionary once, then gather by index
+        lookup = np.append(encode_categories(col, array.dictionary.to_numpy(zero_copy_only=False)), -1)
+        indices = array.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return lookup[indices]
+    if pa.types.is_integer(array.type):
+        return array.fill_null(-1).to_numpy(zero_copy_only=False)
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        return encode_categories(col, array.to_numpy(zero_copy_only=False))
+    raise ValueError(f'Arrow column {col} must be integer codes or strings, got {array.type}')
+
+def write_arrow_predictions(prices, n_rows, errors=()):
+    # Arrow IPC stream with predicted_price (null for failed rows) and error columns
+    import pyarrow as pa
+
+    out = scatter_predictions(prices, n_rows, errors)
+    messages = [None] * n_rows
+    for error in errors:
+        messages[error['index']] = error['error']
+
+    table = pa.table({
+        'predicted_price': pa.array(out, mask=np.isnan(out)),
+        'error': pa.array(messages, type=pa.string())
+    })
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def to_data_frame(columns):
+    # Decodes category codes back to strings, for preprocessors without transform_encoded()
+    data = {col: columns[col] for col in NUMERICAL_COLS}
+    for col in CATEGORICAL_COLS:
+        data[col] = np.asarray(CATEGORIES[col], dtype=object)[columns[col]]
+    return pd.DataFrame(data)
@@ -0,0 +1,207 @@
+import os
+import sys
+import logging
+import numpy as np
+import pandas as pd
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+class CompiledPreprocessor:
+    """
+    Flat NumPy equivalent of the fitted ColumnTransformer built by
+    DataTransformation: impute -> (ordinal encode) -> standard scale, per column.
+
+    Produces output bit-identical to the sklearn object, without pandas or
+    sklearn dispatch on the request path.
+    """
+
+    def __init__(self, columns, fill, category_maps, mean, scale):
+        self.columns = list(columns)
+        self.fill = list(fill)
+        self.category_maps = list(category_maps)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+        # Python floats for the single-record path; same IEEE doubles as the arrays
+        self._mean_list = self.mean.tolist()
+        self._scale_list = self.scale.tolist()
+        self._category_index = [
+            None if mapping is None else pd.Index(list(mapping), dtype=object)
+            for mapping in self.category_maps
+        ]
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor):
+        # Raises ValueError for any structure the compiled form cannot reproduce exactly
+        from sklearn.impute import SimpleImputer
+        from sklearn.preprocessing import OrdinalEncoder, StandardScaler
+
+        columns, fill, category_maps, mean, scale = [], [], [], [], []
+        for name, transformer, group_columns in preprocessor.transformers_:
+            if transformer == 'drop' or len(group_columns) == 0:
+                continue
+            if transformer == 'passthrough' or not hasattr(transformer, 'steps'):
+                raise ValueError(f"Unsupported transformer '{name}'")
+
+            steps = [step for _, step in transformer.steps]
+            imputer = steps.pop(0) if steps and isinstance(steps[0], SimpleImputer) else None
+            encoder = steps.pop(0) if steps and isinstance(steps[0], OrdinalEncoder) else None
+            scaler = steps.pop(0) if steps and isinstance(steps[0], StandardScaler) else None
+            if steps:
+                raise ValueError(f"Unsupported step {type(steps[0]).__name__} in '{name}'")
+            if imputer is not None and (imputer.add_indicator or not _is_nan(imputer.missing_values)):
+                raise ValueError(f"Unsupported imputer settings in '{name}'")
+            if encoder is not None and encoder.handle_unknown != 'error':
+                raise ValueError(f"Unsupported encoder settings in '{name}'")
+
+            for i, col in enumerate(group_columns):
+                columns.append(col)
+
+                statistic = None if imputer is None else imputer.statistics_[i]
+                if encoder is None:
+                    if statistic is not None and np.isnan(statistic):
+                        raise ValueError(f"Imputer dropped all-missing column '{col}'")
+                    fill.append(None if statistic is None else float(statistic))
+                    category_maps.append(None)
+                else:
+                    fill.append(statistic)
+                    category_maps.append({value: code for code, value in enumerate(encoder.categories_[i])})
+
+                mean.append(scaler.mean_[i] if scaler is not None and scaler.with_mean else 0.0)
+                scale.append(scaler.scale_[i] if scaler is not None and scaler.with_std else 1.0)
+
+        return cls(columns, fill, category_maps, mean, scale)
+
+    def transform(self, features):
+        # Accepts a DataFrame, a single record dict, a list of records or a dict of columns
+        if isinstance(features, dict):
+            first = features[self.columns[0]]
+            if np.ndim(first) == 0:
+                return self.transform_record(features)
+            return self.transform_columns(features)
+        if isinstance(features, list):
+            return self.transform_columns({col: [record[col] for record in features] for col in self.columns})
+        return self.transform_columns({col: features[col].to_numpy() for col in self.columns})
+
+    def transform_record(self, record):
+        row = []
+        for j, col in enumerate(self.columns):
+            value = record[col]
+            mapping = self.category_maps[j]
+            if mapping is None:
+                value = np.nan if value is None else float(value)
+                if value != value and self.fill[j] is not None:
+                    value = self.fill[j]
+            else:
+                if value is None or value != value:
+                    value = self.fill[j]
+                code = mapping.get(value)
+                if code is None:
+                    raise ValueError(f"Found unknown categories [{value!r}] in column '{col}' during transform")
+                value = float(code)
+            row.append((value - self._mean_list[j]) / self._scale_list[j])
+        return np.array([row], dtype=np.float64)
+
+    def transform_columns(self, columns):
+        n_rows = len(columns[self.columns[0]])
+        out = np.empty((n_rows, len(self.columns)), dtype=np.float64)
+
+        for j, col in enumerate(self.columns):
+            if self.category_maps[j] is None:
+                values = np.asarray(columns[col], dtype=np.float64)
+                if self.fill[j] is not None:
+                    missing = np.isnan(values)
+                    if missing.any():
+                        values = np.where(missing, self.fill[j], values)
+                out[:, j] = values
+            else:
+                out[:, j] = self._encode(j, col, np.asarray(columns[col], dtype=object))
+
+        out -= self.mean
+        out /= self.scale
+        return out
+
+    def transform_encoded(self, columns, categories):
+        # Columns whose categoricals are already integer codes into categories[col]
+        # (e.g. wrapped straight from a binary request); numeric arrays may be float32
+        n_rows = len(columns[self.columns[0]])
+        out = np.empty((n_rows, len(self.columns)), dtype=np.float64)
+
+        for j, col in enumerate(self.columns):
+            values = columns[col]
+            if self.category_maps[j] is None:
+                out[:, j] = values
+                if self.fill[j] is not None:
+                    missing = np.isnan(out[:, j])
+                    if missing.any():
+                        out[missing, j] = self.fill[j]
+            else:
+                lookup = self._code_lookup(j, col, categories[col])
+                # Negative codes would silently wrap around when indexing
+                if n_rows and (values.min() < 0 or values.max() >= len(lookup)):
+                    raise ValueError(f"Category codes out of range in column '{col}'")
+                out[:, j] = lookup[values]
+
+        out -= self.mean
+        out /= self.scale
+        return out
+
+    def _code_lookup(self, j, col, categories):
+        # Request code -> fitted encoder code; identity when both use the same category order
+        mapping = self.category_maps[j]
+        unknown = [value for value in categories if value not in mapping]
+        if unknown:
+            raise ValueError(f"Found unknown categories {unknown} in column '{col}' during transform")
+        return np.array([mapping[value] for value in categories], dtype=np.int64)
+
+    def _encode(self, j, col, values):
+        missing = pd.isna(values)
+        if missing.any():
+            values = np.where(missing, self.fill[j], values)
+
+        codes = self._category_index[j].get_indexer(values)
+        if (codes < 0).any():
+            unknown = sorted({str(value) for value in values[codes < 0]})
+            raise ValueError(f"Found unknown categories {unknown} in column '{col}' during transform")
+        return codes
+
+    def probe_frame(self):
+        # Rows covering every category (plus missing values) for equivalence checks
+        n_rows = max([len(mapping) for mapping in self.category_maps if mapping is not None] + [1]) + 1
+        data = {}
+        for j, col in enumerate(self.columns):
+            mapping = self.category_maps[j]
+            if mapping is None:
+                base = self._mean_list[j]
+                values = [base + (i - n_rows / 2) * self._scale_list[j] / n_rows for i in range(n_rows)]
+                if self.fill[j] is not None:
+                    values[-1] = np.nan
+            else:
+                categories = list(mapping)
+                values = [categories[i % len(categories)] for i in range(n_rows)]
+            data[col] = values
+        return pd.DataFrame(data)
+
+def _is_nan(value):
+    return isinstance(value, float) and value != value
+
+def check_equivalence(preprocessor, compiled, features):
+    # True when the compiled transformer reproduces the sklearn output bit for bit
+    expected = np.asarray(preprocessor.transform(features), dtype=np.float64)
+    actual = compiled.transform(features)
+    return expected.shape == actual.shape and np.array_equal(expected, actual)
+
+def compile_preprocessor(preprocessor):
+    # Returns None when the preprocessor cannot be compiled exactly; callers keep using sklearn
+    if isinstance(preprocessor, CompiledPreprocessor):
+        return preprocessor
+
+    try:
+        compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+        if not check_equivalence(preprocessor, compiled, compiled.probe_frame()):
+            raise ValueError("compiled output differs from the fitted preprocessor")
+        return compiled
+    except Exception as e:
+        logging.warning(f"Using the sklearn preprocessor, could not compile it: {e}")
+        return None
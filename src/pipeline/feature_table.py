@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from exception import CustomException
+from utils import save_object, load_object
+from Components.data_transformation import CATEGORIES
+
+@dataclass
+class FeatureTableConfig:
+    model_file_path: str = os.path.join('artifacts', 'model.pkl')
+    preprocessor_file_path: str = os.path.join('artifacts', 'preprocessor.pkl')
+    feature_table_file_path: str = os.path.join('artifacts', 'feature_table.pkl')
+
+# Batches up to this size map grade names with dict lookups instead of pd.Index
+SMALL_BATCH_ROWS = 512
+
+# Models whose prediction is intercept + coef . x, so the categorical part can be precomputed
+ADDITIVE_MODELS = ('LinearRegression', 'Ridge', 'Lasso', 'ElasticNet', 'SGDRegressor')
+
+def is_additive(model):
+    return (type(model).__name__ in ADDITIVE_MODELS
+            and type(model).__module__.startswith('sklearn.linear_model')
+            and np.ndim(getattr(model, 'coef_', None)) == 1)
+
+def fingerprint(model, preprocessor):
+    # Identifies the fitted coefficients and scaling the table was built from
+    digest = hashlib.sha256()
+    digest.update(type(model).__name__.encode())
+    digest.update(np.ascontiguousarray(model.coef_, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(np.ravel(model.intercept_), dtype=np.float64).tobytes())
+    digest.update(json.dumps([preprocessor.columns, preprocessor.fill,
+                              [None if m is None else list(m.items()) for m in preprocessor.category_maps]],
+                             default=str).encode())
+    digest.update(preprocessor.mean.tobytes())
+    digest.update(preprocessor.scale.tobytes())
+    return digest.hexdigest()
+
+class FeatureTable:
+    """
+    Every cut x color x clarity combination (5 x 7 x 8 = 280 rows), indexed by
+    the grade codes in CATEGORIES order:
+
+    - block: the encoded and scaled categorical columns for that combination
+    - contribution: for an additive model, intercept + categorical terms - numeric mean terms
+
+    so a linear model's prediction is contribution[index] + numeric @ weights.
+    """
+
+    def __init__(self, numeric_columns, numeric_fill, categorical_columns, categories,
+                 categorical_fill, block, contribution, weights, fingerprint):
+        self.numeric_columns = list(numeric_columns)
+        self.numeric_fill = list(numeric_fill)
+        self.categorical_columns = list(categorical_columns)
+        self.categories = {col: list(categories[col]) for col in self.categorical_columns}
+        # Code used for a missing grade (the imputer's most frequent value)
+        self.categorical_fill = list(categorical_fill)
+        self.block = np.asarray(block, dtype=np.float64)
+        self.contribution = np.asarray(contribution, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.fingerprint = fingerprint
+
+        sizes = [len(self.categories[col]) for col in self.categorical_columns]
+        self.strides = [int(np.prod(sizes[i + 1:], dtype=np.int64)) for i in range(len(sizes))]
+        self._build_index()
+
+    def _build_index(self):
+        # Grade name -> code lookups; rebuilt after unpickling rather than saved
+        self._category_index = [pd.Index(self.categories[col], dtype=object) for col in self.categorical_columns]
+        self._category_codes = [{value: code for code, value in enumerate(self.categories[col])}
+                                for col in self.categorical_columns]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_category_index'], state['_category_codes']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_index()
+
+    @classmethod
+    def build(cls, model, preprocessor, categories=CATEGORIES, rtol=1e-9, atol=1e-6):
+        # preprocessor is a CompiledPreprocessor; raises ValueError when the table cannot
+        # reproduce model.predict(preprocessor.transform(...))
+        if not is_additive(model):
+            raise ValueError(f"{type(model).__name__} is not an additive model")
+
+        numeric = [j for j, mapping in enumerate(preprocessor.category_maps) if mapping is None]
+        categorical = [j for j, mapping in enumerate(preprocessor.category_maps) if mapping is not None]
+        categorical_columns = [preprocessor.columns[j] for j in categorical]
+        if sorted(categorical_columns) != sorted(categories):
+            raise ValueError(f"Preprocessor categoricals {categorical_columns} do not match {list(categories)}")
+
+        # All combinations, last column varying fastest, through the preprocessor itself
+        grids = np.meshgrid(*[np.arange(len(categories[col])) for col in categorical_columns], indexing='ij')
+        columns = {col: grid.ravel() for col, grid in zip(categorical_columns, grids)}
+        n_rows = len(columns[categorical_columns[0]])
+        for j in numeric:
+            columns[preprocessor.columns[j]] = np.zeros(n_rows)
+        block = preprocessor.transform_encoded(columns, categories)[:, categorical]
+
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        intercept = float(np.ravel(model.intercept_)[0]) if np.size(model.intercept_) else 0.0
+        weights = coef[numeric] / preprocessor.scale[numeric]
+        offset = intercept - float(np.dot(coef[numeric], preprocessor.mean[numeric] / preprocessor.scale[numeric]))
+        contribution = block @ coef[categorical] + offset
+
+        table = cls(
+            numeric_columns=[preprocessor.columns[j] for j in numeric],
+            numeric_fill=[preprocessor.fill[j] for j in numeric],
+            categorical_columns=categorical_columns,
+            categories=categories,
+            categorical_fill=[
+                -1 if preprocessor.fill[j] is None else list(categories[preprocessor.columns[j]]).index(preprocessor.fill[j])
+                for j in categorical
+            ],
+            block=block,
+            contribution=contribution,
+            weights=weights,
+            fingerprint=fingerprint(model, preprocessor)
+        )
+
+        probe = preprocessor.probe_frame()
+        expected = np.asarray(model.predict(preprocessor.transform(probe)), dtype=np.float64)
+        if not np.allclose(table.predict(probe), expected, rtol=rtol, atol=atol):
+            raise ValueError("Table predictions differ from the model")
+        return table
+
+    def index(self, codes):
+        # Grade codes (one array per categorical column, -1 = missing) -> table row
+        flat = np.zeros(len(codes[0]), dtype=np.int64)
+        for col, values, stride, fill in zip(self.categorical_columns, codes, self.strides, self.categorical_fill):
+            values = np.asarray(values, dtype=np.int64)
+            if len(values) and values.min() < 0:
+                if fill < 0:
+                    raise ValueError(f"Missing values in column '{col}'")
+                values = np.where(values < 0, fill, values)
+            if len(values) and values.max() >= len(self.categories[col]):
+                raise ValueError(f"Category codes out of range in column '{col}'")
+            flat += values * stride
+        return flat
+
+    def numeric(self, columns):
+        out = np.empty((len(columns[self.numeric_columns[0]]), len(self.numeric_columns)), dtype=np.float64)
+        for j, col in enumerate(self.numeric_columns):
+            out[:, j] = np.asarray(columns[col], dtype=np.float64)
+            missing = np.isnan(out[:, j])
+            if missing.any():
+                # Without an imputer the model itself would reject the NaN
+                if self.numeric_fill[j] is None:
+                    raise ValueError(f"Input contains NaN in column '{col}'")
+                out[missing, j] = self.numeric_fill[j]
+        return out
+
+    def predict(self, features):
+        # A DataFrame (or dict of columns) with grade names
+        codes = []
+        for col, index, mapping in zip(self.categorical_columns, self._category_index, self._category_codes):
+            values = np.asarray(features[col], dtype=object)
+            # pd.Index.get_indexer has a fixed cost of ~80us, a dict lookup ~0.1us per row
+            if len(values) <= SMALL_BATCH_ROWS:
+                col_codes = np.array([mapping.get(value, -1) for value in values], dtype=np.int64)
+            else:
+                col_codes = index.get_indexer(values)
+            if (col_codes < 0).any():
+                unknown = (col_codes < 0) & ~pd.isna(values)
+                if unknown.any():
+                    names = sorted({str(value) for value in values[unknown]})
+                    raise ValueError(f"Found unknown categories {names} in column '{col}' during transform")
+            codes.append(col_codes)
+        return self.contribution[self.index(codes)] + self.numeric(features) @ self.weights
+
+    def predict_encoded(self, columns):
+        # Columns from a binary request: numeric arrays plus grade codes in CATEGORIES order
+        codes = [columns[col] for col in self.categorical_columns]
+        return self.contribution[self.index(codes)] + self.numeric(columns) @ self.weights
+
+def load_feature_table(model, preprocessor, file_path=None):
+    # The table saved at file_path when it was built from this model and preprocessor, otherwise
+    # one built in memory (a few milliseconds); None for models that are not additive
+    if preprocessor is None or not hasattr(preprocessor, 'transform_encoded') or not is_additive(model):
+        return None
+
+    try:
+        if file_path is not None and os.path.exists(file_path):
+            table = load_object(file_path)
+            if table.fingerprint == fingerprint(model, preprocessor):
+                return table
+            logging.info(f"Feature table {file_path} was built for another model, rebuilding it")
+        return FeatureTable.build(model, preprocessor)
+    except Exception as e:
+        logging.warning(f"Not using a feature table: {e}")
+        return None
+
+class FeatureTableBuilder:
+    def __init__(self):
+        self.feature_table_config = FeatureTableConfig()
+
+    def initiate_feature_table(self, model_path=None, preprocessor_path=None, output_path=None):
+        # Post-training step: saves the table for additive models, returns None for other models
+        try:
+            from pipeline.compiled_preprocessor import compile_preprocessor
+
+            config = self.feature_table_config
+            output_path = output_path or config.feature_table_file_path
+            model = load_object(model_path or config.model_file_path)
+            preprocessor = compile_preprocessor(load_object(preprocessor_path or config.preprocessor_file_path))
+
+            if not is_additive(model) or preprocessor is None:
+                logging.info(f"No feature table for {type(model).__name__}; it is served by the general path")
+                return None
+
+            table = FeatureTable.build(model, preprocessor)
+            save_object(output_path, table)
+            logging.info(f"Feature table with {len(table.contribution)} rows saved to {output_path}")
+            return output_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Precompute categorical contributions for a linear model')
+    parser.add_argument('--model', default=FeatureTableConfig.model_file_path)
+    parser.add_argument('--preprocessor', default=FeatureTableConfig.preprocessor_file_path)
+    parser.add_argument('--output', default=FeatureTableConfig.feature_table_file_path)
+    args = parser.parse_args()
+
+    path = FeatureTableBuilder().initiate_feature_table(args.model, args.preprocessor, args.output)
+    print(f"Feature table saved to {path}" if path else "Model is not additive; no feature table written")
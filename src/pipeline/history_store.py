@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import time
+import uuid
+import atexit
+import sqlite3
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import quote
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+@dataclass
+class HistoryStoreConfig:
+    db_file_path: str = os.path.join('artifacts', 'prediction_history.db')
+    flush_interval: float = 1.0
+    flush_batch_size: int = 500
+    # Records waiting for the writer beyond this are dropped (oldest first)
+    max_pending: int = 50000
+    busy_timeout_ms: int = 5000
+
+def parse_timestamp(value):
+    # Accepts epoch seconds or 'YYYY-mm-dd[ HH:MM:SS]' / ISO 8601 strings
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+## Prediction history: bounded in-memory queue flushed in batches to SQLite (WAL)
+class PredictionHistoryStore:
+    def __init__(self, db_file_path=None, flush_interval=None):
+        config = HistoryStoreConfig()
+        self.config = config
+        self.db_file_path = db_file_path or config.db_file_path
+        self.flush_interval = flush_interval if flush_interval is not None else config.flush_interval
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        # (seq, ts, record) not yet committed; a batch leaves only once it is on disk
+        self._pending = deque()
+        self._seq = 0
+        # Identifies this process's rows in history_writers, which records the last seq committed
+        self._writer_id = uuid.uuid4().hex
+        self._pid = None
+        self._thread = None
+        self._stopped = False
+        # The writer connection (used under self._write_lock) and idle read-only connections
+        self._conn_pid = None
+        self._writer_conn = None
+        self._readers = []
+        self._schema_pid = None
+
+        self.written = 0
+        self.dropped = 0
+        self.flush_errors = 0
+        atexit.register(self.close)
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_file_path) or '.', exist_ok=True)
+        # Used by the writer thread and by close(), never concurrently
+        conn = sqlite3.connect(self.db_file_path, timeout=self.config.busy_timeout_ms / 1000,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={self.config.busy_timeout_ms}')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS prediction_history ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'ts REAL NOT NULL, '
+            'timestamp TEXT NOT NULL, '
+            'input TEXT NOT NULL, '
+            'predicted_price REAL, '
+            'pid INTEGER)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_prediction_history_ts ON prediction_history (ts)')
+        conn.execute('CREATE TABLE IF NOT EXISTS history_writers (writer TEXT PRIMARY KEY, last_seq INTEGER NOT NULL)')
+        return conn
+
+    def _check_fork(self):
+        # Called under self._lock. A forked child must not use its parent's connections,
+        # so they are abandoned rather than closed
+        if self._conn_pid != os.getpid():
+            self._conn_pid = os.getpid()
+            self._writer_conn = None
+            self._readers = []
+
+    def _writer(self):
+        # Called under self._write_lock; opened once per process
+        with self._lock:
+            self._check_fork()
+        if self._writer_conn is None:
+            self._writer_conn = self._connect()
+        return self._writer_conn
+
+    def _close_writer(self):
+        # Called under self._write_lock
+        if self._writer_conn is not None and self._conn_pid == os.getpid():
+            self._writer_conn.close()
+        self._writer_conn = None
+
+    @contextmanager
+    def _reader(self):
+        # Long-lived read-only connections, one per concurrent query. WAL readers see the
+        # last commit without waiting for the writer; a connection that fails is closed
+        with self._lock:
+            self._check_fork()
+            conn = self._readers.pop() if self._readers else None
+        if conn is None:
+            if self._schema_pid != os.getpid():
+                # Creates the database and schema if no writer has yet; idempotent
+                self._connect().close()
+                self._schema_pid = os.getpid()
+            conn = sqlite3.connect(f"file:{quote(os.path.abspath(self.db_file_path))}?mode=ro",
+                                   uri=True, timeout=self.config.busy_timeout_ms / 1000,
+                                   isolation_level=None, check_same_thread=False)
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            if self._conn_pid == os.getpid():
+                self._readers.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def _close_connections(self):
+        with self._write_lock:
+            self._close_writer()
+        with self._lock:
+            readers, self._readers = self._readers, []
+            if self._conn_pid == os.getpid():
+                for conn in readers:
+                    conn.close()
+
+    def _ensure_writer(self):
+        # Called under self._lock. Forked workers (gunicorn --preload) need their own writer thread
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None:
+            return
+        if self._pid is not None and self._pid != pid:
+            self._pending.clear()
+            self._writer_id = uuid.uuid4().hex
+            self._write_lock = threading.Lock()
+        self._pid = pid
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run_writer, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        # record: {'timestamp', 'input', 'predicted_price'}; never blocks on disk
+        ts = time.time()
+        record = dict(record)
+        record.setdefault('timestamp', datetime.fromtimestamp(ts).strftime(TIMESTAMP_FORMAT))
+
+        with self._lock:
+            self._ensure_writer()
+            self._seq += 1
+            self._pending.append((self._seq, ts, record))
+            while len(self._pending) > self.config.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            wake = len(self._pending) >= self.config.flush_batch_size
+
+        if wake:
+            self._wakeup.set()
+
+    def flush(self):
+        # Writes everything pending in one transaction; returns the number of rows written
+        with self._write_lock:
+            with self._lock:
+                batch = list(self._pending)
+                writer_id = self._writer_id
+            if not batch:
+                return 0
+
+            rows = [
+                (ts, record['timestamp'], json.dumps(record.get('input', {}), default=str),
+                 record.get('predicted_price'), self._pid)
+                for _, ts, record in batch
+            ]
+            last_seq = batch[-1][0]
+            try:
+                conn = self._writer()
+                with conn:
+                    conn.executemany(
+                        'INSERT INTO prediction_history (ts, timestamp, input, predicted_price, pid) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        rows
+                    )
+                    # Committed with the rows, so a query can tell which pending records its snapshot holds
+                    conn.execute('INSERT OR REPLACE INTO history_writers (writer, last_seq) VALUES (?, ?)',
+                                 (writer_id, last_seq))
+                written = len(rows)
+            except sqlite3.Error as e:
+                logging.error(f"Prediction history flush failed, {len(rows)} records dropped: {e}")
+                # Reopened by the next flush
+                self._close_writer()
+                written = 0
+
+            with self._lock:
+                removed = 0
+                while self._pending and self._pending[0][0] <= last_seq:
+                    self._pending.popleft()
+                    removed += 1
+                if written:
+                    self.written += written
+                else:
+                    self.flush_errors += 1
+                    self.dropped += removed
+            return written
+
+    def _run_writer(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def query(self, page=1, page_size=10, start=None, end=None):
+        # Newest first; start/end bound the record time (epoch seconds or ISO strings).
+        # Records the writer has not flushed yet are served from memory (with id None),
+        # so the request thread never writes to disk
+        page = max(1, int(page))
+        page_size = max(1, int(page_size))
+        offset = (page - 1) * page_size
+
+        clauses, params = [], []
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('ts <= ?')
+            params.append(end)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock:
+            memory = list(self._pending)
+            writer_id = self._writer_id
+
+        # One read transaction, without the write lock: records committed in its snapshot
+        # are skipped in memory, so a batch being flushed is listed exactly once
+        with self._reader() as conn:
+            conn.execute('BEGIN')
+            row = conn.execute('SELECT last_seq FROM history_writers WHERE writer = ?', (writer_id,)).fetchone()
+            flushed_seq = row[0] if row is not None else 0
+            pending = [
+                record for seq, ts, record in reversed(memory)
+                if seq > flushed_seq and (start is None or ts >= start) and (end is None or ts <= end)
+            ]
+            total = conn.execute(f'SELECT COUNT(*) FROM prediction_history{where}', params).fetchone()[0]
+            from_memory = pending[offset:offset + page_size]
+            limit = page_size - len(from_memory)
+            rows = []
+            if limit:
+                rows = conn.execute(
+                    f'SELECT id, timestamp, input, predicted_price FROM prediction_history{where} '
+                    'ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?',
+                    params + [limit, max(0, offset - len(pending))]
+                ).fetchall()
+            conn.execute('COMMIT')
+
+        history = [
+            {'id': None, 'timestamp': record['timestamp'],
+             'input': json.loads(json.dumps(record.get('input', {}), default=str)),
+             'predicted_price': record.get('predicted_price')}
+            for record in from_memory
+        ] + [
+            {'id': row[0], 'timestamp': row[1], 'input': json.loads(row[2]), 'predicted_price': row[3]}
+            for row in rows
+        ]
+        return {'total': total + len(pending), 'page': page, 'page_size': page_size, 'history': history}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'db_file_path': self.db_file_path,
+                'pending': len(self._pending),
+                'written': self.written,
+                'dropped': self.dropped,
+                'flush_errors': self.flush_errors
+            }
+
+    def close(self):
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+        self._close_connections()
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import pandas as pd
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.predict_pipeline import BatchData, FEATURE_COLUMNS
+
+@dataclass
+class MicroBatcherConfig:
+    max_batch_size: int = 64
+    # Longest a request waits for others to join its batch
+    max_wait_ms: float = 2.0
+
+## Coalesces concurrent single-row requests into one vectorized predict call
+class MicroBatcher:
+    def __init__(self, predict_fn, max_batch_size=None, max_wait_ms=None, executor=None):
+        # predict_fn takes a DataFrame of FEATURE_COLUMNS and returns one price per row
+        config = MicroBatcherConfig()
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size or config.max_batch_size
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.max_wait_ms) / 1000
+        self.executor = executor
+
+        self._queue = None
+        self._worker = None
+        self.batches = 0
+        self.rows = 0
+        self.max_seen_batch = 0
+        self.total_predict_seconds = 0.0
+
+    def start(self):
+        # Must be called from the running event loop
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, record):
+        # record: dict with FEATURE_COLUMNS; resolves to the predicted price
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect(self):
+        # Block for the first request, then take whatever arrives before the deadline
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Requests whose callers went away are not scored
+            batch = [(record, future) for record, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                results = await loop.run_in_executor(self.executor, self._predict_batch, [r for r, _ in batch])
+            except Exception as e:
+                logging.error(f"Micro-batch of {len(batch)} rows failed: {e}")
+                results = [e] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _predict_batch(self, records):
+        # Returns a price or a ValueError per record, in order
+        start = time.perf_counter()
+        df = pd.DataFrame.from_records(records, columns=FEATURE_COLUMNS)
+        valid_df, errors = BatchData.validate(df)
+
+        results = [None] * len(records)
+        for error in errors:
+            results[error['index']] = ValueError(error['error'])
+
+        if len(valid_df):
+            preds = self.predict_fn(valid_df[FEATURE_COLUMNS])
+            for position, pred in zip(valid_df.index, preds):
+                results[position] = float(pred)
+
+        self.batches += 1
+        self.rows += len(records)
+        self.max_seen_batch = max(self.max_seen_batch, len(records))
+        self.total_predict_seconds += time.perf_counter() - start
+        return results
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'rows': self.rows,
+            'mean_batch_size': self.rows / self.batches if self.batches else 0.0,
+            'max_seen_batch': self.max_seen_batch,
+            'total_predict_seconds': self.total_predict_seconds
+        }
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import logging
+import argparse
+import numpy as np
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from exception import CustomException
+from utils import load_object, load_table
+from pipeline.tree_engine import FlatTreeEnsemble, MANIFEST_FILE_NAME
+from pipeline.artifact_store import ArtifactStore
+
+@dataclass
+class ModelExportConfig:
+    model_file_path: str = os.path.join('artifacts', 'model.pkl')
+    preprocessor_file_path: str = os.path.join('artifacts', 'preprocessor.pkl')
+    test_data_path: str = os.path.join('artifacts', 'test.parquet')
+    # First entry of MODEL_PATHS in predict_pipeline: served when present
+    export_dir: str = os.path.join('artifacts', 'model_compact')
+    # Largest R2 loss against the full model accepted when reducing the tree count
+    max_r2_drop: float = 0.001
+
+def r2_score(y_true, y_pred):
+    residual = np.sum((y_true - y_pred) ** 2)
+    total = np.sum((y_true - np.mean(y_true)) ** 2)
+    return float(1 - residual / total)
+
+def export_report(model, engine, X, y, tree_counts=None):
+    # Size and accuracy of each candidate export against the original model, fewest trees first
+    model_bytes = len(pickle.dumps(model, protocol=4))
+    baseline = np.asarray(model.predict(X), dtype=np.float64)
+    baseline_r2 = r2_score(y, baseline)
+
+    # Counts beyond the ensemble (e.g. after early stopping) are skipped
+    counts = {n for n in tree_counts or [] if 1 <= n < engine.n_trees} | {engine.n_trees}
+    report = []
+    for n_trees in sorted(counts):
+        compact = engine.compact(n_trees)
+        start = time.perf_counter()
+        preds = compact.predict(X)
+        predict_ms = (time.perf_counter() - start) * 1000
+        diffs = np.abs(preds - baseline)
+        r2 = r2_score(y, preds)
+        report.append({
+            'n_trees': n_trees,
+            'size_bytes': compact.nbytes,
+            'size_ratio': compact.nbytes / model_bytes,
+            'r2_score': r2,
+            'r2_drop': baseline_r2 - r2,
+            'max_abs_diff': float(diffs.max()),
+            'mean_abs_diff': float(diffs.mean()),
+            'predict_ms': predict_ms
+        })
+    return {
+        'model': type(model).__name__,
+        'model_size_bytes': model_bytes,
+        'model_r2_score': baseline_r2,
+        'rows': len(y),
+        'candidates': report
+    }
+
+def choose_tree_count(report, max_r2_drop):
+    # Fewest trees within the accuracy budget; the full ensemble always qualifies as a fallback
+    for candidate in report['candidates']:
+        if candidate['r2_drop'] <= max_r2_drop:
+            return candidate['n_trees']
+    return report['candidates'][-1]['n_trees']
+
+def export_is_current(export_dir, model_sha256):
+    # True when the export was built from the model with this hash; a retrained model.pkl
+    # makes an older export stale
+    try:
+        with open(os.path.join(export_dir, MANIFEST_FILE_NAME)) as file_obj:
+            manifest = json.load(file_obj)
+    except (OSError, ValueError):
+        return False
+    return manifest.get('metadata', {}).get('source_sha256') == model_sha256
+
+def publish_export(model_path, preprocessor_path, export_dir, exported, store=None):
+    # Publishes model, preprocessor and export as a new version. Metrics, schema and extra
+    # artifacts are carried over from the current version when it holds the same model.
+    store = store if store is not None else ArtifactStore()
+    with open(model_path, 'rb') as file_obj:
+        model_sha256 = hashlib.sha256(file_obj.read()).hexdigest()
+
+    current = store.current_version()
+    base = store.manifest(current) if current is not None else {}
+    if base.get('files', {}).get('model', {}).get('sha256') != model_sha256:
+        base = {}
+    extra_files = {
+        role: store.extra_path(current, role) for role in base.get('files', {})
+        if role not in ('model', 'preprocessor', 'model_compact')
+    }
+    extra_files['model_compact'] = export_dir
+
+    return store.publish(
+        model_path=model_path,
+        preprocessor_path=preprocessor_path,
+        metrics=dict(base.get('metrics', {}), export=exported),
+        schema=base.get('schema'),
+        extra_files=extra_files
+    )
+
+def write_export(engine, export_dir, metadata):
+    # Written beside the target and renamed into place; processes that still map the
+    # previous export keep their pages until they reload
+    parent_dir = os.path.dirname(os.path.abspath(export_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    staging_dir = os.path.join(parent_dir, f".{os.path.basename(export_dir)}.{os.getpid()}.tmp")
+    old_dir = staging_dir + '.old'
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    try:
+        manifest = engine.save(staging_dir, metadata)
+        if os.path.exists(export_dir):
+            os.rename(export_dir, old_dir)
+        os.rename(staging_dir, export_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+## Prunes and compacts a trained tree model into a memory-mappable export
+class ModelExporter:
+    def __init__(self):
+        self.model_export_config = ModelExportConfig()
+
+    def initiate_model_export(self, model_path=None, preprocessor_path=None, test_data_path=None,
+                              export_dir=None, tree_counts=None, max_r2_drop=None, publish=False):
+        try:
+            config = self.model_export_config
+            model_path = model_path or config.model_file_path
+            preprocessor_path = preprocessor_path or config.preprocessor_file_path
+            export_dir = export_dir or config.export_dir
+            max_r2_drop = config.max_r2_drop if max_r2_drop is None else max_r2_drop
+
+            model = load_object(model_path)
+            preprocessor = load_object(preprocessor_path)
+            engine = FlatTreeEnsemble.from_estimator(model)
+
+            test_df = load_table(test_data_path or config.test_data_path)
+            X = preprocessor.transform(test_df.drop(columns=['price', 'id'], errors='ignore'))
+            y = test_df['price'].to_numpy(dtype=np.float64)
+
+            report = export_report(model, engine, X, y, tree_counts)
+            n_trees = choose_tree_count(report, max_r2_drop)
+            logging.info(f"Exporting {n_trees} of {engine.n_trees} trees to {export_dir}")
+
+            with open(model_path, 'rb') as file_obj:
+                model_sha256 = hashlib.sha256(file_obj.read()).hexdigest()
+            chosen = next(c for c in report['candidates'] if c['n_trees'] == n_trees)
+            manifest = write_export(engine.compact(n_trees), export_dir, {
+                # Versioned by source model and tree count
+                'version': f"{model_sha256[:8]}-{n_trees}t",
+                'source_model': model_path,
+                'source_sha256': model_sha256,
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'accuracy': chosen
+            })
+            report['exported'] = {'export_dir': export_dir, 'version': manifest['metadata']['version'], 'n_trees': n_trees}
+
+            # Served from the version directory; once versions exist, artifacts/model_compact is not used
+            if publish:
+                report['published_version'] = publish_export(model_path, preprocessor_path, export_dir, report['exported'])
+            return report
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export a trained tree model in a compact, memory-mappable format')
+    parser.add_argument('--model', default=ModelExportConfig.model_file_path)
+    parser.add_argument('--preprocessor', default=ModelExportConfig.preprocessor_file_path)
+    parser.add_argument('--test-data', default=ModelExportConfig.test_data_path)
+    parser.add_argument('--output', default=ModelExportConfig.export_dir)
+    parser.add_argument('--trees', type=int, nargs='*', help='Candidate tree counts to evaluate (default: all trees)')
+    parser.add_argument('--max-r2-drop', type=float, default=ModelExportConfig.max_r2_drop)
+    parser.add_argument('--publish', action='store_true', help='Publish model, preprocessor and export as a new version')
+    args = parser.parse_args()
+
+    result = ModelExporter().initiate_model_export(
+        model_path=args.model, preprocessor_path=args.preprocessor, test_data_path=args.test_data,
+        export_dir=args.output, tree_counts=args.trees, max_r2_drop=args.max_r2_drop, publish=args.publish
+    )
+
+    print(f"{'trees':>6} {'size':>10} {'ratio':>7} {'r2':>8} {'r2 drop':>9} {'max |diff|':>11}")
+    for c in result['candidates']:
+        print(f"{c['n_trees']:>6} {c['size_bytes']:>10,} {c['size_ratio']:>7.3f} {c['r2_score']:>8.5f} "
+              f"{c['r2_drop']:>9.6f} {c['max_abs_diff']:>11.4f}")
+    print(f"Original model: {result['model']} {result['model_size_bytes']:,} bytes, r2 {result['model_r2_score']:.5f}")
+    print(f"Exported: {json.dumps(result['exported'])}")
+    if 'published_version' in result:
+        print(f"Published artifact version: {result['published_version']}")
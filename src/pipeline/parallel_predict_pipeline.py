@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from exception import ValidationError, InferenceError, wrap_error
+from utils import load_object, save_object
+from pipeline.predict_pipeline import PredictPipeline
+
+# Artifacts of the current worker process, loaded once by _init_worker
+_worker_artifacts = None
+
+def _init_worker(model_path, preprocessor_path):
+    global _worker_artifacts
+
+    _worker_artifacts = (
+        load_object(model_path, mmap_mode='r'),
+        load_object(preprocessor_path, mmap_mode='r')
+    )
+
+def _score_shard(shard):
+    model, preprocessor = _worker_artifacts
+    start = time.perf_counter()
+    # Typed by stage as in PredictPipeline._score, so the parent sees the same errors
+    try:
+        data_scaled = preprocessor.transform(shard)
+    except (KeyError, TypeError, ValueError) as e:
+        raise wrap_error(e, ValidationError)
+    try:
+        preds = model.predict(data_scaled)
+    except Exception as e:
+        raise wrap_error(e, InferenceError)
+    return os.getpid(), np.asarray(preds), len(shard), time.perf_counter() - start
+
+# Never fork: the parent runs the artifact watcher, history writer and logging threads,
+# and a child forked while one of them holds a lock would deadlock
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+@dataclass
+class ParallelPredictConfig:
+    n_workers: int = os.cpu_count() or 1
+    min_shard_rows: int = 10000
+    mmap_dir: str = os.path.join('artifacts', 'mmap')
+    start_method: str = START_METHOD
+
+## Process-pool scoring mode for PredictPipeline
+class ParallelPredictPipeline:
+    def __init__(self, n_workers=None, predict_pipeline=None):
+        self.parallel_predict_config = ParallelPredictConfig()
+        if n_workers is not None:
+            self.parallel_predict_config.n_workers = max(1, n_workers)
+        self.predict_pipeline = predict_pipeline if predict_pipeline is not None else PredictPipeline()
+        self.worker_stats = {}
+        self._executor = None
+        self._executor_versions = None
+        # Memory-mapped artifact copies of the running pool, removed with it in close()
+        self._mmap_dir = None
+
+    def load_artifacts(self):
+        return self.predict_pipeline.load_artifacts()
+
+    def _mmap_path(self, path, obj):
+        # Pickles cannot be memory-mapped, so the pool gets an uncompressed joblib copy.
+        # Compact exports (directories of .npy files) are mapped as they are.
+        if path.endswith('.joblib') or os.path.isdir(path):
+            return path
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        mmap_path = os.path.join(self._mmap_dir, f"{name}.joblib")
+        save_object(mmap_path, obj)
+        return mmap_path
+
+    def _get_executor(self):
+        model, preprocessor = self.load_artifacts()
+        model_path, preprocessor_path = self.predict_pipeline.artifact_paths()
+        registry = self.predict_pipeline.registry
+        versions = (model_path, registry.version(model_path), preprocessor_path, registry.version(preprocessor_path))
+
+        # Restart the workers when another version is active or an artifact changed on disk
+        if self._executor is not None and self._executor_versions != versions:
+            self.close()
+
+        if self._executor is None:
+            # Workers memory-map the same read-only copy instead of unpickling their own
+            os.makedirs(self.parallel_predict_config.mmap_dir, exist_ok=True)
+            self._mmap_dir = tempfile.mkdtemp(prefix='pool-', dir=self.parallel_predict_config.mmap_dir)
+            model_path = self._mmap_path(model_path, model)
+            preprocessor_path = self._mmap_path(preprocessor_path, preprocessor)
+
+            start_method = self.parallel_predict_config.start_method
+            if start_method == 'fork':
+                raise ValueError("The fork start method is not supported; use 'forkserver' or 'spawn'")
+            mp_context = multiprocessing.get_context(start_method)
+            if start_method == 'forkserver':
+                # Preloading makes the server import this module with the parent's sys.path
+                mp_context.set_forkserver_preload([__name__])
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.parallel_predict_config.n_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(model_path, preprocessor_path)
+            )
+            self._executor_versions = versions
+            logging.info(f"Started {self.parallel_predict_config.n_workers} scoring workers")
+        return self._executor
+
+    def predict(self, features):
+        try:
+            n_workers = self.parallel_predict_config.n_workers
+            n_shards = min(n_workers, max(1, len(features) // self.parallel_predict_config.min_shard_rows))
+            if n_shards <= 1:
+                return self.predict_pipeline.predict(features)
+
+            shards = [features.iloc[start:stop] for start, stop in self._shard_bounds(len(features), n_shards)]
+
+            # map() yields results in submission order, so shards come back in input order
+            results = []
+            for pid, preds, rows, seconds in self._get_executor().map(_score_shard, shards):
+                stats = self.worker_stats.setdefault(pid, {'rows': 0, 'seconds': 0.0})
+                stats['rows'] += rows
+                stats['seconds'] += seconds
+                results.append(preds)
+
+            return np.concatenate(results)
+
+        except Exception as e:
+            raise wrap_error(e)
+
+    @staticmethod
+    def _shard_bounds(n_rows, n_shards):
+        edges = np.linspace(0, n_rows, n_shards + 1).astype(int)
+        return zip(edges[:-1], edges[1:])
+
+    def worker_report(self):
+        return {
+            pid: dict(stats, rows_per_second=stats['rows'] / stats['seconds'] if stats['seconds'] > 0 else 0.0)
+            for pid, stats in self.worker_stats.items()
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._mmap_dir is not None:
+            shutil.rmtree(self._mmap_dir, ignore_errors=True)
+            self._mmap_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
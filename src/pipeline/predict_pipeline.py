@@ -1,5 +1,7 @@
 import os
 import sys
+import time
+import logging
 import pandas as pd
 import numpy as np
 import warnings
@@ -8,69 +10,298 @@ warnings.filterwarnings('ignore')
 # Add the src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from exception import CustomException
-from utils import load_object
+from exception import ValidationError, ArtifactError, InferenceError, wrap_error
+from instrumentation import span
+from pipeline.artifact_registry import artifact_registry
+from pipeline.artifact_store import artifact_store, file_sha256
+from pipeline.compiled_preprocessor import compile_preprocessor
+from pipeline.tree_engine import compile_tree_model
+from pipeline.feature_table import load_feature_table, FeatureTableConfig
+from pipeline.model_export import export_is_current
+from pipeline.schema import feature_schema, FEATURE_COLUMNS
+from Components.data_transformation import CATEGORIES
+
+# Candidate artifact locations, in order of preference
+MODEL_PATHS = [
+    "artifacts/model_compact",
+    "artifacts/model.joblib",
+    "artifacts/model_v4.pkl",
+    "artifacts/model.pkl"
+]
+
+PREPROCESSOR_PATHS = [
+    "artifacts/preprocessor.joblib",
+    "artifacts/preprocessor_v4.pkl",
+    "artifacts/preprocessor.pkl"
+]
 
 class PredictPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, registry=None, use_compiled=True, store=None):
+        # Artifacts are loaded once per process and shared through the registry
+        self.registry = registry if registry is not None else artifact_registry
+        self.use_compiled = use_compiled
+        # Versioned artifacts take precedence over MODEL_PATHS/PREPROCESSOR_PATHS once published
+        self.store = store if store is not None else artifact_store
+        # (version, model_path, preprocessor_path) being served, replaced as a whole on swap
+        self._active = None
+        self._store_checked = False
+        self._loaded_versions = []
+        # Optional ShadowEvaluator scoring a sample of traffic with a candidate model
+        self.shadow = None
+        # (model, preprocessor, FeatureTable or None) for the artifacts last scored with
+        self._feature_table = None
+        # version -> its published feature table (or None), resolved once on activate()
+        self._feature_table_paths = {}
+        # ((export, model.pkl) stat fingerprints, export is current) for unversioned artifacts
+        self._export_check = None
+
+    @property
+    def active_version(self):
+        active = self._active
+        return active[0] if active is not None else None
+
+    def _current(self):
+        # The first call picks up the published version; later swaps come from activate()
+        if self._active is None and not self._store_checked:
+            self._store_checked = True
+            if self.store.current_version() is not None:
+                self.activate()
+        return self._active
+
+    def _compile(self, model_path, model, preprocessor_path, preprocessor):
+        # Compiled fast paths are built once per artifact version
+        if self.use_compiled:
+            compiled = self.registry.derive(preprocessor_path, 'compiled_preprocessor', compile_preprocessor)
+            if compiled is not None:
+                preprocessor = compiled
+
+            tree_engine = self.registry.derive(model_path, 'tree_engine', compile_tree_model)
+            if tree_engine is not None:
+                model = tree_engine
+
+        return model, preprocessor
+
+    def _model_paths(self):
+        # The compact export is served ahead of model.pkl only while it was exported from it
+        export_dir, model_path = MODEL_PATHS[0], MODEL_PATHS[-1]
+        try:
+            key = tuple((st.st_mtime_ns, st.st_size) for st in (os.stat(export_dir), os.stat(model_path)))
+        except OSError:
+            return MODEL_PATHS
+
+        if self._export_check is None or self._export_check[0] != key:
+            current = export_is_current(export_dir, file_sha256(model_path))
+            if not current:
+                logging.warning(f"{export_dir} was not exported from the current {model_path}; serving {model_path}")
+            self._export_check = (key, current)
+        return MODEL_PATHS if self._export_check[1] else MODEL_PATHS[1:]
+
+    def _version_model_path(self, version):
+        # A compact export published with the version is served in place of its model.pkl
+        model_path, _ = self.store.paths(version)
+        export_dir = self.store.extra_path(version, 'model_compact')
+        if export_dir is not None:
+            if export_is_current(export_dir, self.store.manifest(version)['files']['model']['sha256']):
+                return export_dir
+            logging.warning(f"Export in artifact version {version} was not built from its model; serving {model_path}")
+        return model_path
+
+    def load_artifacts(self):
+        active = self._current()
+        if active is not None:
+            _, model_path, preprocessor_path = active
+            model = self.registry.get(model_path)
+            preprocessor = self.registry.get(preprocessor_path)
+        else:
+            model_path, model = self.registry.get_first(self._model_paths())
+            preprocessor_path, preprocessor = self.registry.get_first(PREPROCESSOR_PATHS)
+
+        return self._compile(model_path, model, preprocessor_path, preprocessor)
+
+    def feature_table(self, model, preprocessor):
+        # Precomputed categorical contributions for linear models (pipeline/feature_table.py);
+        # None sends tree and other models through transform + predict
+        if not self.use_compiled:
+            return None
+        cached = self._feature_table
+        if cached is None or cached[0] is not model or cached[1] is not preprocessor:
+            # A published version carries its own table; unversioned artifacts use artifacts/
+            version = self.active_version
+            file_path = (self._feature_table_paths.get(version) if version is not None
+                         else FeatureTableConfig.feature_table_file_path)
+            cached = (model, preprocessor, load_feature_table(model, preprocessor, file_path))
+            self._feature_table = cached
+        return cached[2]
+
+    def activate(self, version=None):
+        # Loads, compiles and checks a published version, then swaps it in.
+        # Requests keep using the previous version until the swap.
+        version = version or self.store.current_version()
+        if version is None:
+            raise ArtifactError(f"No published artifact version in {self.store.root_dir}")
+
+        if not self.store.verify(version):
+            raise ArtifactError(f"Artifact version {version} does not match its manifest hashes")
+
+        _, preprocessor_path = self.store.paths(version)
+        model_path = self._version_model_path(version)
+        model, preprocessor = self._compile(
+            model_path, self.registry.get(model_path),
+            preprocessor_path, self.registry.get(preprocessor_path)
+        )
+        preds = np.asarray(model.predict(preprocessor.transform(self.sample_frame(16))), dtype=np.float64)
+        if preds.shape != (16,) or not np.isfinite(preds).all():
+            raise ArtifactError(f"Artifact version {version} produced invalid predictions")
+
+        self._feature_table_paths[version] = self.store.extra_path(version, 'feature_table')
+        self._active = (version, model_path, preprocessor_path)
+
+        # The previous version stays loaded so a rollback swaps back instantly
+        self._loaded_versions = [v for v in self._loaded_versions if v != version] + [version]
+        for stale in self._loaded_versions[:-2]:
+            self._feature_table_paths.pop(stale, None)
+            for path in self.store.paths(stale) + (self.store.extra_path(stale, 'model_compact'),):
+                if path is not None:
+                    self.registry.evict(path)
+        self._loaded_versions = self._loaded_versions[-2:]
+        return version
+
+    def artifact_paths(self):
+        active = self._current()
+        if active is not None:
+            return active[1], active[2]
+
+        model_path, _ = self.registry.get_first(self._model_paths())
+        preprocessor_path, _ = self.registry.get_first(PREPROCESSOR_PATHS)
+        return model_path, preprocessor_path
+
+    def artifact_version(self):
+        # Published version name, or the on-disk fingerprints of unversioned artifacts
+        active = self._current()
+        if active is not None:
+            return active[0]
+
+        model_path, preprocessor_path = self.artifact_paths()
+        return f"{self.registry.version(model_path)}/{self.registry.version(preprocessor_path)}"
+
+    def enable_shadow(self, candidate_version, fraction=None, log_file_path=None):
+        # Scores a fraction of predict() calls with a published candidate version in the background
+        from pipeline.shadow_evaluator import ShadowEvaluator
+
+        candidate = PredictPipeline(registry=self.registry, use_compiled=self.use_compiled, store=self.store)
+        candidate.activate(candidate_version)
+        self.disable_shadow()
+        self.shadow = ShadowEvaluator(candidate, candidate_version, fraction=fraction, log_file_path=log_file_path)
+        return self.shadow
+
+    def disable_shadow(self):
+        shadow, self.shadow = self.shadow, None
+        if shadow is not None:
+            shadow.close(wait=False)
+
+    def _score(self, transform, lookup):
+        # Failures are typed by stage: artifacts, input transformation, then the model
+        try:
+            with span('artifact_load'):
+                model, preprocessor = self.load_artifacts()
+                table = self.feature_table(model, preprocessor)
+        except Exception as e:
+            raise wrap_error(e, ArtifactError)
+
+        # Linear models: a table lookup and a dot product replace transform + predict
+        if table is not None:
+            try:
+                with span('lookup'):
+                    return lookup(table)
+            except (KeyError, TypeError, ValueError) as e:
+                raise wrap_error(e, ValidationError)
+
+        try:
+            with span('transform'):
+                data_scaled = transform(preprocessor)
+        except (KeyError, TypeError, ValueError) as e:
+            raise wrap_error(e, ValidationError)
+        except Exception as e:
+            raise wrap_error(e, InferenceError)
+
+        try:
+            with span('predict'):
+                return model.predict(data_scaled)
+        except Exception as e:
+            raise wrap_error(e, InferenceError)
 
     def predict(self, features):
+        start = time.perf_counter()
+        preds = self._score(lambda preprocessor: preprocessor.transform(features),
+                            lambda table: table.predict(features))
+
+        shadow = self.shadow
+        if shadow is not None:
+            shadow.submit(features, preds, (time.perf_counter() - start) * 1000, self.active_version)
+        return preds
+
+    def predict_encoded(self, columns):
+        # Columns from a binary request (see pipeline.binary_format): numeric arrays plus
+        # integer codes into CATEGORIES, already validated. The compiled preprocessor reads
+        # them in place; other preprocessors get the codes decoded to a DataFrame.
+        # Not mirrored to the shadow evaluator.
+        def transform(preprocessor):
+            if hasattr(preprocessor, 'transform_encoded'):
+                return preprocessor.transform_encoded(columns, CATEGORIES)
+            from pipeline.binary_format import to_data_frame
+            return preprocessor.transform(to_data_frame(columns))
+
+        return self._score(transform, lambda table: table.predict_encoded(columns))
+
+    @staticmethod
+    def sample_frame(n_rows):
+        # Plausible synthetic diamonds covering every grade, for warm-up and smoke checks
+        carat = np.linspace(0.3, 2.5, n_rows) if n_rows > 1 else np.array([1.0])
+        size = 6.4 * np.cbrt(carat)
+        data = {
+            'carat': carat,
+            'depth': np.full(n_rows, 61.8),
+            'table': np.full(n_rows, 57.0),
+            'x': size,
+            'y': size,
+            'z': size * 0.618
+        }
+        for col, categories in CATEGORIES.items():
+            data[col] = [categories[i % len(categories)] for i in range(n_rows)]
+        return pd.DataFrame(data)[FEATURE_COLUMNS]
+
+    def warm_up(self, batch_sizes=(1, 256), repeats=3):
+        # Loads and validates the artifacts, then exercises every predict path once per batch size
         try:
-            # Try different file paths and formats
-            model_paths = [
-                "artifacts/model.joblib",
-                "artifacts/model_v4.pkl", 
-                "artifacts/model.pkl"
-            ]
-            
-            preprocessor_paths = [
-                "artifacts/preprocessor.joblib",
-                "artifacts/preprocessor_v4.pkl",
-                "artifacts/preprocessor.pkl"
-            ]
-            
-            # Load model
-            model = None
-            for path in model_paths:
-                if os.path.exists(path):
-                    try:
-                        print(f"Trying to load model from: {path}")
-                        model = load_object(file_path=path)
-                        print(f"Successfully loaded model from: {path}")
-                        break
-                    except Exception as e:
-                        print(f"Failed to load from {path}: {e}")
-                        continue
-            
-            if model is None:
-                raise Exception("Could not load model from any path")
-            
-            # Load preprocessor
-            preprocessor = None
-            for path in preprocessor_paths:
-                if os.path.exists(path):
-                    try:
-                        print(f"Trying to load preprocessor from: {path}")
-                        preprocessor = load_object(file_path=path)
-                        print(f"Successfully loaded preprocessor from: {path}")
-                        break
-                    except Exception as e:
-                        print(f"Failed to load from {path}: {e}")
-                        continue
-            
-            if preprocessor is None:
-                raise Exception("Could not load preprocessor from any path")
-            
-            print("Both model and preprocessor loaded successfully")
-            
-            # Transform and predict
-            data_scaled = preprocessor.transform(features)
-            preds = model.predict(data_scaled)
-            return preds
-        
+            start = time.perf_counter()
+            self.load_artifacts()
+            load_seconds = time.perf_counter() - start
+
+            latency_ms = {}
+            for batch_size in batch_sizes:
+                sample = self.sample_frame(batch_size)
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    preds = np.asarray(self.predict(sample), dtype=np.float64)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                if preds.shape != (batch_size,) or not np.isfinite(preds).all():
+                    raise ArtifactError(f"Warm-up batch of {batch_size} rows produced invalid predictions")
+                # The first call pays for lazy initialisation; report steady state
+                latency_ms[str(batch_size)] = float(np.median(timings[1:] or timings))
+
+            model_path, preprocessor_path = self.artifact_paths()
+            return {
+                'model_path': model_path,
+                'preprocessor_path': preprocessor_path,
+                'model_version': self.artifact_version(),
+                'load_seconds': load_seconds,
+                'warmup_latency_ms': latency_ms
+            }
+
         except Exception as e:
-            raise CustomException(e, sys)
+            raise wrap_error(e, ArtifactError)
 
 class CustomData:
     def __init__(self,
@@ -94,6 +325,9 @@ class CustomData:
         self.y = y
         self.z = z
 
+    def get_data_as_dict(self):
+        return {col: getattr(self, col) for col in FEATURE_COLUMNS}
+
     def get_data_as_data_frame(self):
         try:
             custom_data_input_dict = {
@@ -111,7 +345,41 @@ class CustomData:
             return pd.DataFrame(custom_data_input_dict)
 
         except Exception as e:
-            raise CustomException(e, sys)
+            raise ValidationError(e, sys)
+
+class BatchData:
+    def __init__(self, payload):
+        # A list of records, or a columnar dict mapping each field to a list
+        self.payload = payload
+
+    def n_rows(self):
+        # Counted on the payload itself, so oversized batches are rejected before any DataFrame is built
+        if isinstance(self.payload, list):
+            return len(self.payload)
+        if isinstance(self.payload, dict):
+            return max((len(values) for values in self.payload.values() if isinstance(values, list)), default=0)
+        raise ValidationError('Payload must be a list of records or a columnar object')
+
+    def get_data_as_data_frame(self):
+        if isinstance(self.payload, list):
+            if not all(isinstance(record, dict) for record in self.payload):
+                raise ValidationError('Each record must be a JSON object')
+            return pd.DataFrame.from_records(self.payload, columns=FEATURE_COLUMNS)
+
+        if isinstance(self.payload, dict):
+            lengths = {len(values) for values in self.payload.values() if isinstance(values, list)}
+            if len(lengths) != 1 or not all(isinstance(values, list) for values in self.payload.values()):
+                raise ValidationError('Columnar payload must map each field to a list of equal length')
+
+            columns = {col: values for col, values in self.payload.items() if col in FEATURE_COLUMNS}
+            return pd.DataFrame(columns, columns=FEATURE_COLUMNS, index=pd.RangeIndex(lengths.pop()))
+
+        raise ValidationError('Payload must be a list of records or a columnar object')
+
+    @staticmethod
+    def validate(df):
+        # Shared schema: (valid rows, per-row errors) in one vectorized pass
+        return feature_schema.validate(df)
 
 # Test the prediction pipeline
 if __name__ == '__main__':
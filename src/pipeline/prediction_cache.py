@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@dataclass
+class PredictionCacheConfig:
+    max_entries: int = 10000
+    ttl_seconds: float = 3600.0
+    # Round numeric features to this many decimals in the key; None keeps exact values
+    quantize_decimals: int = None
+
+## Cache backends: anything with get/set/clear/stats can stand in for a shared cache
+class CacheBackend:
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+class LocalLRUBackend(CacheBackend):
+    # In-process LRU with per-entry TTL; bounded by max_entries
+    def __init__(self, max_entries=10000, ttl_seconds=3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+## Prediction cache keyed on canonical diamond features and the model version
+class PredictionCache:
+    def __init__(self, backend=None, quantize_decimals=None):
+        config = PredictionCacheConfig()
+        self.backend = backend if backend is not None else LocalLRUBackend(config.max_entries, config.ttl_seconds)
+        self.quantize_decimals = quantize_decimals if quantize_decimals is not None else config.quantize_decimals
+        self._lock = threading.Lock()
+        self._model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _canonical(self, value):
+        if isinstance(value, str):
+            return value.strip()
+        value = float(value)
+        if self.quantize_decimals is not None:
+            value = round(value, self.quantize_decimals)
+        # 1 and 1.0 (and -0.0 and 0.0) must map to the same key
+        return value + 0.0
+
+    def make_key(self, features, model_version):
+        canonical = {name: self._canonical(value) for name, value in features.items()}
+        payload = json.dumps([model_version, sorted(canonical.items())], separators=(',', ':'))
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _check_version(self, model_version):
+        # A new model makes every cached price stale
+        with self._lock:
+            if model_version != self._model_version:
+                if self._model_version is not None:
+                    self.backend.clear()
+                    self.invalidations += 1
+                self._model_version = model_version
+
+    def lookup(self, features, model_version):
+        # Returns the cached value or None; counts a hit or a miss
+        self._check_version(model_version)
+        value = self.backend.get(self.make_key(features, model_version))
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value
+
+    def store(self, features, model_version, value):
+        self.backend.set(self.make_key(features, model_version), value)
+
+    def get_or_compute(self, features, model_version, compute):
+        # Returns (value, was_cached)
+        value = self.lookup(features, model_version)
+        if value is not None:
+            return value, True
+
+        value = compute()
+        self.store(features, model_version, value)
+        return value, False
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations,
+                'model_version': self._model_version,
+                'quantize_decimals': self.quantize_decimals
+            }
+        stats.update(self.backend.stats())
+        return stats
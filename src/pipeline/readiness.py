@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+## Startup warm-up and its background retries; traffic is only routed here once it succeeds
+class ReadinessMonitor:
+    def __init__(self, pipeline, retry_interval=30.0, poll_interval=1.0):
+        # pipeline needs warm_up() and active_version (see PredictPipeline)
+        self.pipeline = pipeline
+        self.retry_interval = retry_interval
+        self.poll_interval = min(poll_interval, retry_interval)
+        self.state = {'ready': False, 'error': None}
+        self.checked_at = None
+        self.attempts = 0
+        self._attempted_version = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self.state['ready']
+
+    def warm_up(self):
+        # One attempt; returns whether the pipeline is ready
+        with self._lock:
+            self.checked_at = time.time()
+            self.attempts += 1
+            self._attempted_version = self.pipeline.active_version
+            try:
+                report = self.pipeline.warm_up()
+                self.state = dict(report, ready=True, error=None,
+                                  ready_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            except Exception as e:
+                self.state = {'ready': False, 'error': str(e)}
+                logging.warning(f"Warm-up failed, not ready: {str(e)}")
+            return self.state['ready']
+
+    def _due(self):
+        # Retried every retry_interval, and right away once the watcher swaps in another version
+        return (self.pipeline.active_version != self._attempted_version
+                or time.time() - self.checked_at >= self.retry_interval)
+
+    def _run(self):
+        while not self.ready and not self._stop.wait(self.poll_interval):
+            if self._due():
+                self.warm_up()
+
+    def start(self):
+        # Warms up now (blocking) and keeps retrying in the background until it succeeds
+        if self.checked_at is None:
+            self.warm_up()
+        if not self.ready and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='warm-up-retry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def report(self):
+        return dict(self.state)
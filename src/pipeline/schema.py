@@ -0,0 +1,172 @@
+import os
+import sys
+import math
+import numpy as np
+import pandas as pd
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from Components.data_transformation import CATEGORIES, NUMERICAL_COLS
+
+# Input columns in the order produced by CustomData
+FEATURE_COLUMNS = ['carat', 'cut', 'color', 'clarity', 'depth', 'table', 'x', 'y', 'z']
+
+# Inclusive bounds for numeric features; generous enough for every diamond in the training data
+NUMERIC_RANGES = {
+    'carat': (0.01, 10.0),
+    'depth': (1.0, 100.0),
+    'table': (1.0, 100.0),
+    'x': (0.0, 100.0),
+    'y': (0.0, 100.0),
+    'z': (0.0, 100.0)
+}
+
+class FeatureSchema:
+    """
+    Types, category sets and numeric ranges for the model inputs.
+
+    validate() checks a whole DataFrame column by column with vectorized
+    masks; validate_record() applies the same rules to a single dict without
+    building a DataFrame. Both report errors as
+    {'field', 'code', 'message'} with code one of missing, unknown_category,
+    not_numeric or out_of_range.
+    """
+
+    def __init__(self, categories=None, numeric_ranges=None):
+        self.categories = categories if categories is not None else CATEGORIES
+        self.numeric_ranges = numeric_ranges if numeric_ranges is not None else NUMERIC_RANGES
+        self.columns = FEATURE_COLUMNS
+        self.numerical_cols = [col for col in self.columns if col in NUMERICAL_COLS]
+        self._category_sets = {col: frozenset(values) for col, values in self.categories.items()}
+
+    @staticmethod
+    def _error(field, code, message):
+        return {'field': field, 'code': code, 'message': message}
+
+    def _range_message(self, col):
+        low, high = self.numeric_ranges[col]
+        return f'{col} must be between {low:g} and {high:g}'
+
+    def validate(self, df):
+        # Returns (valid rows with numeric columns as float64, per-row errors by position)
+        df = df.copy()
+        checks = []
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = np.nan
+            values = df[col]
+            missing = values.isna().to_numpy()
+            checks.append((missing, self._error(col, 'missing', f'missing {col}')))
+
+            if col in self._category_sets:
+                invalid = ~missing & ~values.isin(self.categories[col]).to_numpy()
+                checks.append((invalid, self._error(col, 'unknown_category', f'unknown {col}')))
+            else:
+                numeric = pd.to_numeric(values, errors='coerce').astype('float64')
+                # JSON true/false are not numbers, although to_numeric and float() accept them
+                if values.dtype == object:
+                    numeric = numeric.mask(values.map(type).isin([bool, np.bool_]))
+                elif values.dtype == bool:
+                    numeric[:] = np.nan
+                invalid = ~missing & numeric.isna().to_numpy()
+                checks.append((invalid, self._error(col, 'not_numeric', f'{col} must be numeric')))
+
+                if col in self.numeric_ranges:
+                    low, high = self.numeric_ranges[col]
+                    array = numeric.to_numpy()
+                    with np.errstate(invalid='ignore'):
+                        out_of_range = ~np.isnan(array) & ~((array >= low) & (array <= high))
+                    checks.append((out_of_range, self._error(col, 'out_of_range', self._range_message(col))))
+                df[col] = numeric
+
+        bad, errors = self._row_errors(checks, len(df))
+        return df[~bad], errors
+
+    def validate_encoded(self, columns):
+        # Same rules for columns with categoricals as integer codes into self.categories
+        # (-1 = missing). Returns (valid columns, errors); the input arrays are passed
+        # through untouched when every row is valid.
+        n_rows = len(columns[self.columns[0]])
+        checks = []
+        for col in self.columns:
+            values = columns[col]
+            if col in self._category_sets:
+                missing = values == -1
+                checks.append((missing, self._error(col, 'missing', f'missing {col}')))
+                invalid = ~missing & ((values < 0) | (values >= len(self.categories[col])))
+                checks.append((invalid, self._error(col, 'unknown_category', f'unknown {col}')))
+            else:
+                missing = np.isnan(values)
+                checks.append((missing, self._error(col, 'missing', f'missing {col}')))
+                if col in self.numeric_ranges:
+                    # Bounds in the column's own precision, so float32 0.01 is in range
+                    low, high = (values.dtype.type(bound) for bound in self.numeric_ranges[col])
+                    with np.errstate(invalid='ignore'):
+                        out_of_range = ~missing & ~((values >= low) & (values <= high))
+                    checks.append((out_of_range, self._error(col, 'out_of_range', self._range_message(col))))
+
+        bad, errors = self._row_errors(checks, n_rows)
+        if errors:
+            columns = {col: values[~bad] for col, values in columns.items()}
+        return columns, errors
+
+    @staticmethod
+    def _row_errors(checks, n_rows):
+        bad = np.zeros(n_rows, dtype=bool)
+        for mask, _ in checks:
+            bad |= mask
+
+        # Only failing rows are visited individually
+        errors = []
+        for i in np.flatnonzero(bad):
+            details = [error for mask, error in checks if mask[i]]
+            errors.append({
+                'index': int(i),
+                'error': '; '.join(error['message'] for error in details),
+                'details': details
+            })
+        return bad, errors
+
+    def validate_record(self, record):
+        # Returns (clean record, errors) for one dict; the same rules as validate()
+        clean, errors = {}, []
+        for col in self.columns:
+            value = record.get(col)
+            if value is None or value == '' or (isinstance(value, float) and math.isnan(value)):
+                errors.append(self._error(col, 'missing', f'missing {col}'))
+                continue
+
+            if col in self._category_sets:
+                if not isinstance(value, str) or value not in self._category_sets[col]:
+                    errors.append(self._error(col, 'unknown_category', f'unknown {col}'))
+                    continue
+                clean[col] = value
+            else:
+                try:
+                    if isinstance(value, (bool, np.bool_)):
+                        raise TypeError(f'{col} must be numeric')
+                    number = float(value)
+                except (TypeError, ValueError):
+                    errors.append(self._error(col, 'not_numeric', f'{col} must be numeric'))
+                    continue
+                if math.isnan(number):
+                    errors.append(self._error(col, 'missing', f'missing {col}'))
+                    continue
+                if col in self.numeric_ranges:
+                    low, high = self.numeric_ranges[col]
+                    if not low <= number <= high:
+                        errors.append(self._error(col, 'out_of_range', self._range_message(col)))
+                        continue
+                clean[col] = number
+        return clean, errors
+
+def describe_errors(errors):
+    # One-line summary of validate_record() errors, listing missing fields first
+    missing = [error['field'] for error in errors if error['code'] == 'missing']
+    if missing:
+        return f'Missing required fields: {", ".join(missing)}'
+    return 'Invalid input: ' + '; '.join(error['message'] for error in errors)
+
+# Shared by the single, batch and streaming prediction paths
+feature_schema = FeatureSchema()
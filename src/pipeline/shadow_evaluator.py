@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@dataclass
+class ShadowConfig:
+    # Share of primary predictions that are also scored by the candidate
+    fraction: float = 0.1
+    n_workers: int = 1
+    # Shadow requests waiting beyond this are dropped instead of queued
+    max_pending: int = 1000
+    # Recent rows/requests kept for the live delta and latency statistics
+    stats_window: int = 10000
+    log_file_path: str = os.path.join('artifacts', 'shadow', 'shadow_log.jsonl')
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else None
+
+## Scores sampled traffic with a candidate model in the background and records the differences
+class ShadowEvaluator:
+    def __init__(self, candidate, candidate_version, fraction=None, log_file_path=None, n_workers=None, random_state=None):
+        # candidate: a PredictPipeline (or anything with predict) serving the candidate version
+        config = ShadowConfig()
+        self.config = config
+        self.candidate = candidate
+        self.candidate_version = candidate_version
+        self.fraction = fraction if fraction is not None else config.fraction
+        self.log_file_path = log_file_path or config.log_file_path
+
+        self._rng = random.Random(random_state)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=n_workers or config.n_workers, thread_name_prefix='shadow')
+        self._log_file = None
+
+        self.pending = 0
+        self.sampled = 0
+        self.dropped = 0
+        self.failed = 0
+        self.rows = 0
+        self.abs_deltas = deque(maxlen=config.stats_window)
+        self.latency_ms = {
+            'primary': deque(maxlen=config.stats_window),
+            'candidate': deque(maxlen=config.stats_window)
+        }
+
+    def submit(self, features, primary_preds, primary_latency_ms, primary_version=None):
+        # Called on the request path: only a sampling decision and a queue put
+        if self.fraction <= 0 or self._rng.random() >= self.fraction:
+            return False
+
+        with self._lock:
+            if self.pending >= self.config.max_pending:
+                self.dropped += 1
+                return False
+            self.pending += 1
+            self.sampled += 1
+
+        self._executor.submit(self._evaluate, features, np.asarray(primary_preds, dtype=np.float64),
+                              primary_latency_ms, primary_version)
+        return True
+
+    def _evaluate(self, features, primary_preds, primary_latency_ms, primary_version):
+        try:
+            start = time.perf_counter()
+            candidate_preds = np.asarray(self.candidate.predict(features), dtype=np.float64)
+            candidate_latency_ms = (time.perf_counter() - start) * 1000
+
+            deltas = candidate_preds - primary_preds
+            record = {
+                'timestamp': time.time(),
+                'primary_version': primary_version,
+                'candidate_version': self.candidate_version,
+                'rows': len(primary_preds),
+                'primary_latency_ms': primary_latency_ms,
+                'candidate_latency_ms': candidate_latency_ms,
+                'primary_predictions': primary_preds.tolist(),
+                'candidate_predictions': candidate_preds.tolist(),
+                'mean_abs_delta': float(np.mean(np.abs(deltas))),
+                'max_abs_delta': float(np.max(np.abs(deltas)))
+            }
+
+            with self._lock:
+                self.rows += len(primary_preds)
+                self.abs_deltas.extend(np.abs(deltas).tolist())
+                self.latency_ms['primary'].append(primary_latency_ms)
+                self.latency_ms['candidate'].append(candidate_latency_ms)
+                self._write(record)
+
+        except Exception as e:
+            logging.warning(f"Shadow prediction with {self.candidate_version} failed: {e}")
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def _write(self, record):
+        # Called under self._lock
+        if self._log_file is None:
+            os.makedirs(os.path.dirname(self.log_file_path), exist_ok=True)
+            self._log_file = open(self.log_file_path, 'a', buffering=1)
+        self._log_file.write(json.dumps(record) + '\n')
+
+    def stats(self):
+        with self._lock:
+            return {
+                'candidate_version': self.candidate_version,
+                'fraction': self.fraction,
+                'sampled': self.sampled,
+                'pending': self.pending,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'rows': self.rows,
+                'mean_abs_delta': float(np.mean(self.abs_deltas)) if self.abs_deltas else None,
+                'p95_abs_delta': percentile(self.abs_deltas, 95),
+                'latency_ms': {
+                    model: {'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+                    for model, values in self.latency_ms.items()
+                }
+            }
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+def shadow_report(log_file_path):
+    # Offline summary of a shadow log, per (primary, candidate) pair
+    groups = {}
+    with open(log_file_path) as file_obj:
+        for line in file_obj:
+            record = json.loads(line)
+            key = (record['primary_version'], record['candidate_version'])
+            group = groups.setdefault(key, {'rows': 0, 'deltas': [], 'primary': [], 'candidate': []})
+            group['rows'] += record['rows']
+            group['deltas'].extend(
+                abs(c - p) for p, c in zip(record['primary_predictions'], record['candidate_predictions'])
+            )
+            group['primary'].append(record['primary_latency_ms'])
+            group['candidate'].append(record['candidate_latency_ms'])
+
+    return [
+        {
+            'primary_version': primary_version,
+            'candidate_version': candidate_version,
+            'rows': group['rows'],
+            'mean_abs_delta': float(np.mean(group['deltas'])),
+            'p95_abs_delta': percentile(group['deltas'], 95),
+            'primary_latency_p50_ms': percentile(group['primary'], 50),
+            'candidate_latency_p50_ms': percentile(group['candidate'], 50),
+            'primary_latency_p95_ms': percentile(group['primary'], 95),
+            'candidate_latency_p95_ms': percentile(group['candidate'], 95)
+        }
+        for (primary_version, candidate_version), group in groups.items()
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Summarize a shadow evaluation log')
+    parser.add_argument('--log', default=ShadowConfig.log_file_path)
+    args = parser.parse_args()
+
+    for row in shadow_report(args.log):
+        print(json.dumps(row, indent=2))
@@ -8,11 +8,15 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from exception import CustomException
-from components.data_ingestion import DataIngestion
-from components.data_transformation import DataTransformation
-from components.model_trainer import ModelTrainer
+from logger import setup_logging
+from Components.data_ingestion import DataIngestion
+from Components.data_transformation import DataTransformation, CATEGORIES, NUMERICAL_COLS
+from Components.model_trainer import ModelTrainer
+from pipeline.artifact_store import ArtifactStore
+from pipeline.feature_table import FeatureTableBuilder
 
 if __name__ == '__main__':
+    setup_logging()
     logging.info("Training pipeline started")
     
     try:
@@ -31,6 +35,31 @@ if __name__ == '__main__':
         model_trainer = ModelTrainer()
         score = model_trainer.initiate_model_training(train_arr, test_arr)  # Fixed method name
         print(f"Model training completed. Best score: {score}")
+
+        # Step 4: Precompute categorical contributions (linear models only)
+        feature_table_path = FeatureTableBuilder().initiate_feature_table(
+            model_path=model_trainer.model_trainer_config.trained_model_file_path,
+            preprocessor_path=preprocessor_path
+        )
+        print(f"Feature table: {feature_table_path or 'not applicable to this model'}")
+
+        # Step 5: Publish model + preprocessor (+ feature table) as a new version; serving processes swap to it
+        version = ArtifactStore().publish(
+            model_path=model_trainer.model_trainer_config.trained_model_file_path,
+            preprocessor_path=preprocessor_path,
+            metrics={
+                'model_name': model_trainer.best_model_name,
+                'r2_score': score,
+                'candidate_scores': model_trainer.model_report
+            },
+            schema={
+                'numerical': NUMERICAL_COLS,
+                'categorical': CATEGORIES,
+                'target': 'price'
+            },
+            extra_files={'feature_table': feature_table_path} if feature_table_path else None
+        )
+        print(f"Published artifact version: {version}")
         
         logging.info("Training pipeline completed successfully")
         
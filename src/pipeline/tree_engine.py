@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import logging
+import numpy as np
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# sklearn marks missing children with -1
+TREE_LEAF = -1
+
+# On-disk layout written by FlatTreeEnsemble.save(); bump when it changes
+FORMAT_NAME = 'flat_tree_ensemble'
+FORMAT_VERSION = 1
+MANIFEST_FILE_NAME = 'manifest.json'
+
+class FlatTreeEnsemble:
+    """
+    Fitted regression trees exported into contiguous node arrays.
+
+    All trees are evaluated together: every (row, tree) pair that has not
+    reached a leaf advances one level per vectorized step.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 n_features, aggregation='mean', init=0.0, children=None, is_leaf=None):
+        self.feature = np.asarray(feature)
+        self.threshold = np.asarray(threshold)
+        self.left = np.asarray(left)
+        self.right = np.asarray(right)
+        self.value = np.asarray(value)
+        self.roots = np.asarray(roots)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.aggregation = aggregation
+        self.init = float(init)
+
+        # Right children first, then left: children[node + n_nodes * went_left].
+        # A loaded export passes both precomputed so memory-mapped arrays stay shared.
+        self._n_nodes = len(self.left)
+        self._children = np.concatenate([self.right, self.left]) if children is None else children
+        self._is_leaf = self.left == np.arange(self._n_nodes) if is_leaf is None else is_leaf
+
+        # Bounds the (rows x trees) node arrays for large batches
+        self.max_cells = 4_000_000
+
+    @classmethod
+    def from_trees(cls, trees, n_features, aggregation='mean', init=0.0, value_scale=1.0):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            if tree.n_outputs != 1:
+                raise ValueError("Only single-output trees are supported")
+
+            node_ids = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == TREE_LEAF
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            # Leaves point at themselves so extra steps leave them in place
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.int32))
+            values.append(tree.value[:, 0, 0] * value_scale)
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=n_features,
+            aggregation=aggregation,
+            init=init
+        )
+
+    @classmethod
+    def from_estimator(cls, model):
+        # Supports DecisionTreeRegressor, RandomForestRegressor/ExtraTreesRegressor and GradientBoostingRegressor
+        from sklearn.tree import DecisionTreeRegressor
+        from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor
+
+        if isinstance(model, DecisionTreeRegressor):
+            return cls.from_trees([model.tree_], model.n_features_in_)
+
+        if isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+            return cls.from_trees([estimator.tree_ for estimator in model.estimators_], model.n_features_in_)
+
+        if isinstance(model, GradientBoostingRegressor):
+            if model.init_ == 'zero':
+                init = 0.0
+            elif hasattr(model.init_, 'constant_'):
+                init = np.ravel(model.init_.constant_)[0]
+            else:
+                raise ValueError(f"Unsupported init estimator {type(model.init_).__name__}")
+
+            # Each stage contributes learning_rate * leaf value, scaled here once
+            return cls.from_trees(
+                [estimator.tree_ for estimator in model.estimators_[:, 0]],
+                model.n_features_in_,
+                aggregation='sum',
+                init=init,
+                value_scale=model.learning_rate
+            )
+
+        raise ValueError(f"Unsupported model {type(model).__name__}")
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._arrays().values())
+
+    def _arrays(self):
+        # Everything predict() reads; left/right are the two halves of children
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children': self._children,
+            'is_leaf': self._is_leaf,
+            'value': self.value,
+            'roots': self.roots
+        }
+
+    def compact(self, n_trees=None):
+        # float32 thresholds/values, the smallest feature index type and optionally only
+        # the first n_trees trees (a prefix: the first stages of a boosted model).
+        n_trees = self.n_trees if n_trees is None else int(n_trees)
+        if not 1 <= n_trees <= self.n_trees:
+            raise ValueError(f"n_trees must be between 1 and {self.n_trees}, got {n_trees}")
+        n_nodes = int(self.roots[n_trees]) if n_trees < self.n_trees else self._n_nodes
+
+        # Largest float32 not above each threshold: float32 features split exactly as before
+        threshold = self.threshold[:n_nodes].astype(np.float32)
+        above = threshold.astype(np.float64) > self.threshold[:n_nodes]
+        threshold[above] = np.nextafter(threshold[above], np.float32(-np.inf))
+
+        return FlatTreeEnsemble(
+            feature=self.feature[:n_nodes].astype(np.min_scalar_type(self.n_features - 1)),
+            threshold=threshold,
+            left=self.left[:n_nodes].astype(np.int32),
+            right=self.right[:n_nodes].astype(np.int32),
+            value=self.value[:n_nodes].astype(np.float32),
+            roots=self.roots[:n_trees].astype(np.int32),
+            max_depth=self.max_depth,
+            n_features=self.n_features,
+            aggregation=self.aggregation,
+            init=self.init
+        )
+
+    def save(self, dir_path, metadata=None):
+        # One .npy file per array plus a manifest; load() memory-maps them
+        os.makedirs(dir_path, exist_ok=True)
+        arrays = {}
+        for name, array in self._arrays().items():
+            np.save(os.path.join(dir_path, f"{name}.npy"), np.ascontiguousarray(array))
+            arrays[name] = {'dtype': str(array.dtype), 'shape': list(array.shape)}
+
+        manifest = {
+            'format': FORMAT_NAME,
+            'format_version': FORMAT_VERSION,
+            'n_features': self.n_features,
+            'n_trees': self.n_trees,
+            'n_nodes': self._n_nodes,
+            'max_depth': self.max_depth,
+            'aggregation': self.aggregation,
+            'init': self.init,
+            'arrays': arrays,
+            'metadata': metadata or {}
+        }
+        with open(os.path.join(dir_path, MANIFEST_FILE_NAME), 'w') as file_obj:
+            json.dump(manifest, file_obj, indent=2, default=str)
+        return manifest
+
+    @classmethod
+    def load(cls, dir_path, mmap_mode='r'):
+        # With mmap_mode='r' every process mapping the export shares one copy in the page cache
+        with open(os.path.join(dir_path, MANIFEST_FILE_NAME)) as file_obj:
+            manifest = json.load(file_obj)
+        if manifest.get('format') != FORMAT_NAME or manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model export format in {dir_path}: "
+                             f"{manifest.get('format')} v{manifest.get('format_version')}")
+
+        arrays = {name: np.load(os.path.join(dir_path, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in manifest['arrays']}
+        n_nodes = manifest['n_nodes']
+        children = arrays['children']
+        return cls(
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            left=children[n_nodes:],
+            right=children[:n_nodes],
+            value=arrays['value'],
+            roots=arrays['roots'],
+            max_depth=manifest['max_depth'],
+            n_features=manifest['n_features'],
+            aggregation=manifest['aggregation'],
+            init=manifest['init'],
+            children=children,
+            is_leaf=arrays['is_leaf']
+        )
+
+    def predict(self, X):
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X has {X.shape[1]} features, but the model expects {self.n_features}")
+
+        chunk_rows = max(1, self.max_cells // self.n_trees)
+        if len(X) <= chunk_rows:
+            return self._predict_chunk(X)
+        return np.concatenate([
+            self._predict_chunk(X[start:start + chunk_rows]) for start in range(0, len(X), chunk_rows)
+        ])
+
+    def _predict_chunk(self, X):
+        n_rows, n_trees = len(X), self.n_trees
+        X_flat = X.ravel()
+
+        # One entry per (row, tree); only entries still at a split are advanced each step
+        nodes = np.tile(self.roots, n_rows)
+        offsets = np.repeat(np.arange(n_rows) * self.n_features, n_trees)
+        active = np.flatnonzero(~self._is_leaf.take(nodes))
+
+        while active.size:
+            current = nodes.take(active)
+            x = X_flat.take(offsets.take(active) + self.feature.take(current))
+            current = self._children.take(current + self._n_nodes * (x <= self.threshold.take(current)))
+            nodes[active] = current
+            active = active[~self._is_leaf.take(current)]
+
+        # Accumulated in float64 also when the leaf values are stored as float32
+        values = self.value.take(nodes).reshape(n_rows, n_trees)
+        if self.aggregation == 'sum':
+            return self.init + values.sum(axis=1, dtype=np.float64)
+        return values.mean(axis=1, dtype=np.float64)
+
+class RoutedTreeModel:
+    # Small batches go to the flat engine, large ones to sklearn's compiled tree code
+    def __init__(self, engine, model, max_engine_rows=64):
+        self.engine = engine
+        self.model = model
+        self.max_engine_rows = max_engine_rows
+
+    def predict(self, X):
+        if len(X) <= self.max_engine_rows:
+            return self.engine.predict(X)
+        return self.model.predict(X)
+
+def compile_tree_model(model, rtol=1e-9, atol=1e-6):
+    # Returns None for non-tree models or when the flat engine does not reproduce model.predict
+    if isinstance(model, FlatTreeEnsemble):
+        # Already flat (a loaded compact export); nothing to compile against
+        return None
+    try:
+        engine = FlatTreeEnsemble.from_estimator(model)
+    except (ValueError, AttributeError) as e:
+        logging.info(f"Tree engine not used: {e}")
+        return None
+
+    # A single sklearn tree is already as fast as the engine
+    if engine.n_trees == 1:
+        return None
+
+    probe = np.random.default_rng(0).normal(size=(256, engine.n_features))
+    if not np.allclose(engine.predict(probe), model.predict(probe), rtol=rtol, atol=atol):
+        logging.warning("Tree engine output differs from model.predict, using the sklearn model")
+        return None
+    return RoutedTreeModel(engine, model)
@@ -1,33 +1,54 @@
 import os
 import sys
+import time
 import pickle
-import joblib
+import hashlib
+import logging
 import numpy as np
 import pandas as pd
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+from concurrent.futures import ProcessPoolExecutor
 
-from exception import CustomException
+from exception import CustomException, ArtifactError, wrap_error
+
+# joblib and sklearn.metrics are imported where they are used: the serving path
+# imports this module and should not pay for training-only dependencies
 
 def save_object(file_path, obj):
     try:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        # Try joblib first (better for sklearn objects)
-        if file_path.endswith('.joblib'):
-            joblib.dump(obj, file_path)
-        else:
-            with open(file_path, 'wb') as file_obj:
-                pickle.dump(obj, file_obj, protocol=4)  # Use protocol 4 for compatibility
+        # Write next to the target and rename over it, so readers never see a partial file
+        tmp_path = os.path.join(dir_path, f".{os.path.basename(file_path)}.{os.getpid()}.tmp")
+        try:
+            # Try joblib first (better for sklearn objects)
+            if file_path.endswith('.joblib'):
+                import joblib
+                joblib.dump(obj, tmp_path)
+            else:
+                with open(tmp_path, 'wb') as file_obj:
+                    pickle.dump(obj, file_obj, protocol=4)  # Use protocol 4 for compatibility
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     except Exception as e:
         raise CustomException(e, sys)
 
-def load_object(file_path):
+def load_object(file_path, mmap_mode=None):
     try:
+        # A directory is a compact tree export (pipeline/model_export.py); its arrays are
+        # memory-mapped read-only unless mmap_mode says otherwise
+        if os.path.isdir(file_path):
+            from pipeline.tree_engine import FlatTreeEnsemble
+            return FlatTreeEnsemble.load(file_path, mmap_mode=mmap_mode or 'r')
+
         # Try different loading methods
         if file_path.endswith('.joblib'):
-            return joblib.load(file_path)
+            # mmap_mode='r' maps large numpy arrays read-only instead of copying them
+            import joblib
+            return joblib.load(file_path, mmap_mode=mmap_mode)
         
         # Try different pickle protocols
         try:
@@ -40,26 +61,154 @@ def load_object(file_path):
                 with open(file_path, 'rb') as file_obj:
                     return dill.load(file_obj)
             except Exception as e2:
-                raise CustomException(f"Failed to load with both pickle and dill: {e1}, {e2}", sys)
+                raise ArtifactError(f"Failed to load {file_path} with both pickle and dill: {e1}, {e2}", sys) from e1
+
+    except Exception as e:
+        raise wrap_error(e, ArtifactError)
+
+def save_table(df, file_path, compression='zstd'):
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        if file_path.endswith('.parquet'):
+            # String columns are stored dictionary-encoded and come back as categoricals
+            df = df.astype({col: 'category' for col in df.columns if df[col].dtype == object})
+            df.to_parquet(file_path, engine='pyarrow', compression=compression, index=False)
+        else:
+            df.to_csv(file_path, index=False, header=True)
 
     except Exception as e:
         raise CustomException(e, sys)
 
-def evaluate_models(X_train, y_train, X_test, y_test, models):
+def load_table(file_path, columns=None):
+    try:
+        if file_path.endswith('.parquet'):
+            # Memory-map the file instead of reading it into a Python buffer first
+            return pd.read_parquet(file_path, engine='pyarrow', columns=columns, memory_map=True)
+        return pd.read_csv(file_path, usecols=columns)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def hash_arrays(*arrays):
+    # Content hash of the training data, used to key the model cache
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}{array.dtype}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+def model_cache_key(model, data_hash):
+    # n_jobs only changes how fast a model trains, not what it learns
+    params = {k: v for k, v in model.get_params(deep=True).items() if not k.endswith('n_jobs')}
+    signature = f"{type(model).__module__}.{type(model).__qualname__}|{sorted(params.items())!r}|{data_hash}"
+    return hashlib.sha256(signature.encode()).hexdigest()[:32]
+
+def model_cache_path(cache_dir, model, data_hash, namespace=None):
+    # Entries are prefixed with the hash of the training set they belong to (by default
+    # the data they were fitted on), so entries for older data can be pruned
+    prefix = (namespace or data_hash)[:16]
+    return os.path.join(cache_dir, f"{prefix}-{model_cache_key(model, data_hash)}.pkl")
+
+def prune_model_cache(cache_dir, namespace):
+    # Removes cached models trained for any other training set; returns how many were removed
+    prefix = f"{namespace[:16]}-"
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for file_name in os.listdir(cache_dir):
+            if file_name.endswith('.pkl') and not file_name.startswith(prefix):
+                os.remove(os.path.join(cache_dir, file_name))
+                removed += 1
+    if removed:
+        logging.info(f"Pruned {removed} stale entries from model cache {cache_dir}")
+    return removed
+
+def _fit_and_score(model_name, model, X_train, y_train, X_test, y_test):
+    from sklearn.metrics import r2_score
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_test_pred = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    return model_name, model, r2_score(y_test, y_test_pred), fit_seconds, predict_seconds
+
+def evaluate_models(X_train, y_train, X_test, y_test, models, n_workers=1, cache_dir=None, timings=None):
+    """
+    Fits every candidate and returns {model_name: test R2}.
+
+    Fitted estimators replace the entries of ``models``. With n_workers > 1
+    the candidates are trained in a process pool, and with cache_dir set a
+    candidate already trained on identical data and hyperparameters is
+    loaded instead of refitted; entries for other training data are pruned.
+    Per-model fit/predict wall times are written to ``timings`` when a dict
+    is given.
+    """
     try:
         report = {}
+        timings = {} if timings is None else timings
+        data_hash = hash_arrays(X_train, y_train, X_test, y_test) if cache_dir else None
+        if cache_dir:
+            prune_model_cache(cache_dir, data_hash)
+
+        pending = {}
         for model_name, model in models.items():
-            model.fit(X_train, y_train)
-            y_test_pred = model.predict(X_test)
-            test_model_score = r2_score(y_test, y_test_pred)
-            report[model_name] = test_model_score
-        return report
+            if cache_dir:
+                cache_path = model_cache_path(cache_dir, model, data_hash)
+                if os.path.exists(cache_path):
+                    cached = load_object(cache_path)
+                    models[model_name] = cached['model']
+                    report[model_name] = cached['score']
+                    timings[model_name] = dict(cached['timings'], cached=True)
+                    logging.info(f"Loaded {model_name} from model cache {cache_path}")
+                    continue
+            pending[model_name] = model
+
+        # Split the core budget between concurrent candidates and their own n_jobs
+        n_concurrent = max(1, min(n_workers, len(pending)))
+        for model in pending.values():
+            if 'n_jobs' in model.get_params():
+                model.set_params(n_jobs=max(1, n_workers // n_concurrent))
+
+        if n_concurrent > 1:
+            with ProcessPoolExecutor(max_workers=n_concurrent) as executor:
+                futures = [
+                    executor.submit(_fit_and_score, model_name, model, X_train, y_train, X_test, y_test)
+                    for model_name, model in pending.items()
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [
+                _fit_and_score(model_name, model, X_train, y_train, X_test, y_test)
+                for model_name, model in pending.items()
+            ]
+
+        for model_name, model, score, fit_seconds, predict_seconds in results:
+            models[model_name] = model
+            report[model_name] = score
+            timings[model_name] = {'fit_seconds': fit_seconds, 'predict_seconds': predict_seconds, 'cached': False}
+            logging.info(f"{model_name}: R2 {score:.4f}, fit {fit_seconds:.2f}s, predict {predict_seconds:.2f}s")
+
+            if cache_dir:
+                save_object(
+                    model_cache_path(cache_dir, model, data_hash),
+                    {'model': model, 'score': score, 'timings': timings[model_name]}
+                )
+
+        # Keep the caller's ordering
+        return {model_name: report[model_name] for model_name in models}
         
     except Exception as e:
         raise CustomException(e, sys)
 
 def evaluate_model(true, predicted):
     try:
+        from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
+
         mae = mean_absolute_error(true, predicted)
         mse = mean_squared_error(true, predicted)
         rmse = np.sqrt(mse)
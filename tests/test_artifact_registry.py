@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.utils import save_object
+from src.pipeline.artifact_registry import ArtifactRegistry
+from exception import ArtifactError
+
+class TestArtifactRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'model.pkl')
+        save_object(self.path, {'weights': [1, 2, 3]})
+        self.registry = ArtifactRegistry()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def rewrite(self, obj, mtime_ns):
+        save_object(self.path, obj)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_cached_until_file_changes(self):
+        first = self.registry.get(self.path)
+        self.assertIs(self.registry.get(self.path), first)
+        stats = self.registry.stats()[os.path.abspath(self.path)]
+        self.assertEqual((stats['loads'], stats['hits']), (1, 1))
+
+        # A new mtime (or size) invalidates the cached object
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        self.rewrite({'weights': [4, 5, 6]}, mtime_ns + 1_000_000)
+        second = self.registry.get(self.path)
+        self.assertEqual(second, {'weights': [4, 5, 6]})
+        self.assertEqual(self.registry.stats()[os.path.abspath(self.path)]['loads'], 2)
+        self.assertEqual(self.registry.version(self.path), f"{mtime_ns + 1_000_000}-{os.path.getsize(self.path)}")
+        print("Fingerprint invalidation test passed")
+
+    def test_derive_and_evict(self):
+        calls = []
+        def factory(obj):
+            calls.append(obj)
+            return sum(obj['weights'])
+
+        self.assertEqual(self.registry.derive(self.path, 'total', factory), 6)
+        self.assertEqual(self.registry.derive(self.path, 'total', factory), 6)
+        self.assertEqual(len(calls), 1)
+
+        # Derived values are rebuilt with the artifact
+        self.rewrite({'weights': [10]}, os.stat(self.path).st_mtime_ns + 1_000_000)
+        self.assertEqual(self.registry.derive(self.path, 'total', factory), 10)
+        self.assertEqual(len(calls), 2)
+
+        self.registry.evict(self.path)
+        self.assertIsNone(self.registry.version(self.path))
+        self.registry.get(self.path)
+        self.assertEqual(self.registry.stats()[os.path.abspath(self.path)]['loads'], 3)
+        print("Derive and evict test passed")
+
+    def test_get_first(self):
+        missing = os.path.join(self.tmp_dir.name, 'missing.pkl')
+        path, obj = self.registry.get_first([missing, self.path])
+        self.assertEqual(path, self.path)
+        with self.assertRaises(ArtifactError):
+            self.registry.get_first([missing])
+        print("get_first test passed")
+
+def run_artifact_registry_tests():
+    print("Starting Artifact Registry Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestArtifactRegistry)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All artifact registry tests passed!")
+    else:
+        print("Some artifact registry tests failed.")
+
+if __name__ == "__main__":
+    run_artifact_registry_tests()
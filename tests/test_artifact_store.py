@@ -0,0 +1,133 @@
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+from src.utils import save_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore, ArtifactWatcher
+from src.pipeline.predict_pipeline import PredictPipeline
+
+class TestArtifactStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ArtifactStore(os.path.join(self.tmp_dir.name, 'versions'))
+
+        df = PredictPipeline.sample_frame(200)
+        preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+        X = preprocessor.transform(df)
+        self.preprocessor_path = self.save('preprocessor.pkl', preprocessor)
+        self.model_a = self.save('model_a.pkl', LinearRegression().fit(X, df['carat'] * 1000))
+        self.model_b = self.save('model_b.pkl', LinearRegression().fit(X, df['carat'] * 2000))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def save(self, name, obj):
+        path = os.path.join(self.tmp_dir.name, name)
+        save_object(path, obj)
+        return path
+
+    def test_publish_activate_rollback(self):
+        version_a = self.store.publish(self.model_a, self.preprocessor_path, metrics={'r2_score': 0.9})
+        version_b = self.store.publish(self.model_b, self.preprocessor_path)
+
+        self.assertEqual(self.store.list_versions(), [version_a, version_b])
+        self.assertEqual(self.store.current_version(), version_b)
+        self.assertTrue(self.store.verify(version_a))
+        self.assertEqual(self.store.manifest(version_a)['metrics'], {'r2_score': 0.9})
+
+        self.assertEqual(self.store.rollback(), version_a)
+        self.assertEqual(self.store.current_version(), version_a)
+        with self.assertRaises(ValueError):
+            self.store.rollback()
+        # No temporary or staging files left behind
+        self.assertEqual(sorted(os.listdir(self.store.root_dir)), sorted(['CURRENT', version_a, version_b]))
+        print("Publish/activate/rollback test passed")
+
+    def test_watcher_swaps_pipeline(self):
+        version_a = self.store.publish(self.model_a, self.preprocessor_path)
+        pipeline = PredictPipeline(registry=ArtifactRegistry(), store=self.store)
+        sample = PredictPipeline.sample_frame(1)
+        self.assertAlmostEqual(pipeline.predict(sample)[0], 1000.0, places=3)
+        self.assertEqual(pipeline.artifact_version(), version_a)
+
+        watcher = ArtifactWatcher(pipeline)
+        self.assertFalse(watcher.check())
+        version_b = self.store.publish(self.model_b, self.preprocessor_path)
+        self.assertTrue(watcher.check())
+        self.assertEqual(pipeline.active_version, version_b)
+        self.assertAlmostEqual(pipeline.predict(sample)[0], 2000.0, places=3)
+
+        self.store.rollback()
+        self.assertTrue(watcher.check())
+        self.assertAlmostEqual(pipeline.predict(sample)[0], 1000.0, places=3)
+        print("Watcher swap test passed")
+
+    def test_corrupt_version_is_not_served(self):
+        version_a = self.store.publish(self.model_a, self.preprocessor_path)
+        pipeline = PredictPipeline(registry=ArtifactRegistry(), store=self.store)
+        pipeline.activate()
+
+        version_b = self.store.publish(self.model_b, self.preprocessor_path)
+        with open(self.store.paths(version_b)[0], 'ab') as file_obj:
+            file_obj.write(b'garbage')
+
+        watcher = ArtifactWatcher(pipeline)
+        self.assertFalse(watcher.check())
+        self.assertEqual(pipeline.active_version, version_a)
+        self.assertEqual(watcher.stats()['failures'], 1)
+        print("Corrupt version test passed")
+
+    def test_modes_and_extra_files(self):
+        table_path = self.save('feature_table.pkl', {'rows': 280})
+        export_dir = os.path.join(self.tmp_dir.name, 'model_compact')
+        os.makedirs(os.path.join(export_dir, 'trees'))
+        for name in ['manifest.json', os.path.join('trees', 'values.npy')]:
+            with open(os.path.join(export_dir, name), 'w') as file_obj:
+                file_obj.write(name)
+
+        version = self.store.publish(self.model_a, self.preprocessor_path,
+                                     extra_files={'feature_table': table_path, 'model_compact': export_dir})
+
+        # Not the 0700/0600 of mkdtemp/mkstemp
+        from src.pipeline.artifact_store import UMASK
+        self.assertEqual(os.stat(self.store.version_dir(version)).st_mode & 0o777, 0o777 & ~UMASK)
+        self.assertEqual(os.stat(self.store.current_file_path).st_mode & 0o777, 0o666 & ~UMASK)
+
+        self.assertEqual(self.store.extra_path(version, 'feature_table'),
+                         os.path.join(self.store.version_dir(version), 'feature_table.pkl'))
+        self.assertIsNone(self.store.extra_path(version, 'missing'))
+        self.assertEqual(sorted(self.store.manifest(version)['files']), ['feature_table', 'model', 'model_compact', 'preprocessor'])
+        self.assertTrue(self.store.verify(version))
+
+        # Files inside a published directory are covered by its hash
+        with open(os.path.join(self.store.extra_path(version, 'model_compact'), 'trees', 'values.npy'), 'a') as file_obj:
+            file_obj.write('changed')
+        self.assertFalse(self.store.verify(version))
+
+        with self.assertRaises(ValueError):
+            self.store.publish(self.model_a, self.preprocessor_path, extra_files={'copy': self.preprocessor_path})
+        print("Modes and extra files test passed")
+
+def run_artifact_store_tests():
+    print("Starting Artifact Store Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestArtifactStore)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All artifact store tests passed!")
+    else:
+        print("Some artifact store tests failed.")
+
+if __name__ == "__main__":
+    run_artifact_store_tests()
@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+import app as app_module
+from src.utils import save_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline
+
+class TestBatchApi(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        df = PredictPipeline.sample_frame(200)
+        preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+        model = LinearRegression().fit(preprocessor.transform(df), df['carat'] * 1000)
+
+        paths = []
+        for name, obj in [('model.pkl', model), ('preprocessor.pkl', preprocessor)]:
+            paths.append(os.path.join(cls.tmp_dir.name, name))
+            save_object(paths[-1], obj)
+        store = ArtifactStore(os.path.join(cls.tmp_dir.name, 'versions'))
+        store.publish(*paths)
+
+        cls.original = (app_module.predict_pipeline, app_module.MAX_BATCH_ROWS)
+        app_module.predict_pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+        cls.client = app_module.app.test_client()
+        cls.records = PredictPipeline.sample_frame(3).to_dict('records')
+
+    @classmethod
+    def tearDownClass(cls):
+        app_module.predict_pipeline, app_module.MAX_BATCH_ROWS = cls.original
+        cls.tmp_dir.cleanup()
+
+    def test_per_row_errors(self):
+        records = [dict(record) for record in self.records]
+        records[1]['cut'] = 'Flawless'
+        response = self.client.post('/api/predict/batch', json=records)
+        self.assertEqual(response.status_code, 200)
+
+        result = response.get_json()
+        self.assertEqual((result['total'], result['predicted'], result['failed']), (3, 2, 1))
+        self.assertEqual(result['results'][1]['index'], 1)
+        self.assertIn('cut', result['results'][1]['error'])
+        self.assertAlmostEqual(result['results'][0]['predicted_price'], round(records[0]['carat'] * 1000, 2), places=1)
+        self.assertEqual(result['results'][2]['index'], 2)
+        print("Per-row error test passed")
+
+    def test_oversized_batch(self):
+        app_module.MAX_BATCH_ROWS = 2
+        try:
+            response = self.client.post('/api/predict/batch', json=self.records)
+            columnar = {col: [record[col] for record in self.records] for col in self.records[0]}
+            columnar_response = self.client.post('/api/predict/batch', json=columnar)
+        finally:
+            app_module.MAX_BATCH_ROWS = self.original[1]
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('3 rows', response.get_json()['error'])
+        self.assertEqual(columnar_response.status_code, 413)
+        print("Oversized batch test passed")
+
+    def test_invalid_payload(self):
+        response = self.client.post('/api/predict/batch', json='not a batch')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['code'], 'invalid_input')
+        print("Invalid payload test passed")
+
+    def test_malformed_json(self):
+        for path in ['/api/predict', '/api/predict/batch']:
+            response = self.client.post(path, data='{"carat": 0.5,', content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['code'], 'invalid_input')
+        print("Malformed JSON test passed")
+
+def run_batch_api_tests():
+    print("Starting Batch API Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBatchApi)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All batch API tests passed!")
+    else:
+        print("Some batch API tests failed.")
+
+if __name__ == "__main__":
+    run_batch_api_tests()
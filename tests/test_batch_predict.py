@@ -0,0 +1,105 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+from src.utils import save_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline, FEATURE_COLUMNS
+from src.pipeline.batch_predict_pipeline import BatchPredictPipeline
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'diamonds_batch.csv')
+
+class TestBatchPredictPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        df = PredictPipeline.sample_frame(200)
+        preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+        self.model = LinearRegression().fit(preprocessor.transform(df), df['carat'] * 1000)
+        self.preprocessor = preprocessor
+
+        paths = []
+        for name, obj in [('model.pkl', self.model), ('preprocessor.pkl', preprocessor)]:
+            paths.append(os.path.join(self.tmp_dir.name, name))
+            save_object(paths[-1], obj)
+        store = ArtifactStore(os.path.join(self.tmp_dir.name, 'versions'))
+        store.publish(*paths)
+        self.predict_pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+        self.fixture = pd.read_csv(FIXTURE_PATH)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def check_output(self, output):
+        self.assertEqual(list(output.columns), ['row', 'id', 'predicted_price', 'error'])
+        self.assertEqual(output['row'].tolist(), list(range(7)))
+        self.assertEqual(output['id'].tolist(), self.fixture['id'].tolist())
+
+        # Failing rows pass through with an error and no price
+        failed = output['error'].notna()
+        self.assertEqual(output.loc[failed, 'id'].tolist(), ['D005', 'D006'])
+        self.assertIn('cut', output.loc[4, 'error'])
+        self.assertIn('carat', output.loc[5, 'error'])
+        self.assertTrue(output.loc[failed, 'predicted_price'].isna().all())
+
+        valid = self.fixture[~failed.to_numpy()]
+        expected = self.model.predict(self.preprocessor.transform(valid[FEATURE_COLUMNS]))
+        np.testing.assert_allclose(output.loc[~failed, 'predicted_price'], expected, rtol=1e-9)
+
+    def test_csv_to_csv(self):
+        output_path = os.path.join(self.tmp_dir.name, 'scored.csv')
+        pipeline = BatchPredictPipeline(chunk_size=3, predict_pipeline=self.predict_pipeline)
+        summary = pipeline.initiate_batch_prediction(FIXTURE_PATH, output_path)
+
+        self.assertEqual((summary['rows'], summary['predicted'], summary['failed']), (7, 5, 2))
+        self.check_output(pd.read_csv(output_path))
+        print("CSV to CSV test passed")
+
+    def test_parquet_schema_across_chunks(self):
+        # The first chunk has no errors (an all-null error column) and the last has a single
+        # row; every chunk is cast to the schema of the first
+        input_path = os.path.join(self.tmp_dir.name, 'diamonds.parquet')
+        output_path = os.path.join(self.tmp_dir.name, 'scored.parquet')
+        self.fixture.to_parquet(input_path, index=False)
+
+        pipeline = BatchPredictPipeline(chunk_size=3, predict_pipeline=self.predict_pipeline)
+        summary = pipeline.initiate_batch_prediction(input_path, output_path)
+        self.assertEqual(summary['failed'], 2)
+
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(output_path)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.check_output(parquet_file.read().to_pandas())
+        print("Parquet schema across chunks test passed")
+
+    def test_without_id_column(self):
+        chunk = self.fixture.drop(columns=['id']).iloc[:3]
+        output, failed = BatchPredictPipeline(predict_pipeline=self.predict_pipeline).score_chunk(chunk, row_offset=10)
+        self.assertEqual(list(output.columns), ['row', 'predicted_price', 'error'])
+        self.assertEqual(output['row'].tolist(), [10, 11, 12])
+        self.assertEqual(failed, 0)
+        print("Chunk without id column test passed")
+
+def run_batch_predict_tests():
+    print("Starting Batch Prediction Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBatchPredictPipeline)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All batch prediction tests passed!")
+    else:
+        print("Some batch prediction tests failed.")
+
+if __name__ == "__main__":
+    run_batch_predict_tests()
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from run_benchmarks import measure, summarize, compare_results, peak_rss_mb
+
+class TestBenchmarks(unittest.TestCase):
+
+    def result(self, stage, batch_size, p50_ms):
+        return summarize(stage, batch_size, [p50_ms] * 5, 100.0)
+
+    def test_measure_and_summarize(self):
+        calls = []
+        timings = measure(lambda: calls.append(1), min_time=0.0, min_runs=5)
+        # One untimed warm-up call
+        self.assertEqual(len(calls), len(timings) + 1)
+        self.assertGreaterEqual(len(timings), 5)
+
+        result = summarize('predict', 1000, [1.0, 2.0, 3.0, 4.0, 100.0], peak_rss_mb())
+        self.assertEqual(result['p50_ms'], 3.0)
+        self.assertGreater(result['p99_ms'], result['p95_ms'])
+        self.assertAlmostEqual(result['rows_per_sec'], 1000 / 0.003)
+        self.assertGreater(result['peak_rss_mb'], 0)
+        self.assertIsNone(summarize('artifact_load', None, [5.0], 100.0)['rows_per_sec'])
+        print("Measure and summarize test passed")
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': [
+            self.result('predict', 1000, 10.0),
+            self.result('transform', 1000, 10.0),
+            self.result('transform', 1, 0.01),
+            self.result('flask', 1, 2.0)
+        ]}
+        current = {'results': [
+            self.result('predict', 1000, 12.0),
+            self.result('transform', 1000, 10.5),
+            # 50% slower but below the absolute noise floor
+            self.result('transform', 1, 0.015),
+            self.result('pipeline', 1, 1.0)
+        ]}
+        rows = compare_results(current, baseline, threshold=0.10)
+
+        self.assertEqual([(row['stage'], row['batch_size']) for row in rows],
+                         [('predict', 1000), ('transform', 1000), ('transform', 1)])
+        self.assertEqual([row['regression'] for row in rows], [True, False, False])
+        self.assertAlmostEqual(rows[0]['change'], 0.2)
+        print("Regression comparison test passed")
+
+def run_benchmark_tests():
+    print("Starting Benchmark Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBenchmarks)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All benchmark tests passed!")
+    else:
+        print("Some benchmark tests failed.")
+
+if __name__ == "__main__":
+    run_benchmark_tests()
@@ -0,0 +1,127 @@
+import unittest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.schema import FeatureSchema, FEATURE_COLUMNS, CATEGORIES
+from src.pipeline import binary_format
+
+def arrow_stream(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.df = PredictPipeline.sample_frame(64)
+        self.columns = {col: self.df[col].to_numpy() for col in FEATURE_COLUMNS}
+        self.schema = FeatureSchema()
+
+    def test_raw_roundtrip_is_zero_copy(self):
+        body = binary_format.write_raw(self.columns)
+        self.assertEqual(len(body), 64 * binary_format.RAW_ROW_BYTES)
+
+        columns = binary_format.read_raw(body)
+        buffer = np.frombuffer(body, dtype=np.uint8)
+        for values in columns.values():
+            self.assertTrue(np.shares_memory(values, buffer))
+        np.testing.assert_array_equal(columns['carat'], self.df['carat'].to_numpy(dtype=np.float32))
+        self.assertEqual(list(np.asarray(CATEGORIES['cut'])[columns['cut']]), self.df['cut'].tolist())
+
+        with self.assertRaises(ValueError):
+            binary_format.read_raw(body[:-1])
+        print("Raw roundtrip test passed")
+
+    def test_encoded_validation_matches_frame_validation(self):
+        bad = self.df.copy()
+        bad.loc[3, 'carat'] = 50.0
+        bad.loc[5, 'cut'] = None
+        bad.loc[7, 'color'] = 'Z'
+        bad.loc[9, 'depth'] = np.nan
+
+        columns = binary_format.read_raw(binary_format.write_raw({col: bad[col].to_numpy() for col in FEATURE_COLUMNS}))
+        valid, errors = self.schema.validate_encoded(columns)
+        valid_df, expected = self.schema.validate(bad)
+
+        self.assertEqual(len(valid['carat']), len(valid_df))
+        self.assertEqual([(e['index'], e['error']) for e in errors], [(e['index'], e['error']) for e in expected])
+
+        # Untouched input when every row passes; float32 bounds are not rejected by rounding
+        columns = binary_format.read_raw(binary_format.write_raw(dict(self.columns, carat=np.full(64, 0.01))))
+        valid, errors = self.schema.validate_encoded(columns)
+        self.assertEqual(errors, [])
+        self.assertIs(valid, columns)
+        print("Encoded validation test passed")
+
+    def test_transform_encoded_matches_transform(self):
+        preprocessor = DataTransformation().get_data_transformation_object()
+        preprocessor.fit(PredictPipeline.sample_frame(500))
+        compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+
+        columns = binary_format.read_raw(binary_format.write_raw(self.columns))
+        expected = compiled.transform(binary_format.to_data_frame(columns))
+        np.testing.assert_array_equal(compiled.transform_encoded(columns, CATEGORIES), expected)
+
+        with self.assertRaises(ValueError):
+            compiled.transform_encoded(dict(columns, cut=np.full(64, -1, dtype=np.int8)), CATEGORIES)
+        print("Encoded transform test passed")
+
+    def test_arrow_column_encodings(self):
+        table = pa.table({
+            'carat': pa.array(self.df['carat'], pa.float32()),
+            'depth': pa.array(self.df['depth']),
+            'table': pa.array(self.df['table'].astype(int)),
+            'x': pa.array(self.df['x']),
+            'y': pa.array(self.df['y']),
+            'z': pa.array([None] + self.df['z'].tolist()[1:], pa.float64()),
+            'cut': pa.array(self.df['cut']).dictionary_encode(),
+            'color': pa.array(self.df['color']),
+            'clarity': pa.array(binary_format.encode_categories('clarity', self.df['clarity']), pa.int8())
+        })
+        columns = binary_format.read_arrow(arrow_stream(table))
+
+        self.assertEqual(columns['carat'].dtype, np.float32)
+        self.assertTrue(np.isnan(columns['z'][0]))
+        for col in CATEGORIES:
+            self.assertEqual(list(np.asarray(CATEGORIES[col])[columns[col]]), self.df[col].tolist())
+
+        _, errors = self.schema.validate_encoded(columns)
+        self.assertEqual([e['index'] for e in errors], [0])
+
+        with self.assertRaises(ValueError):
+            binary_format.read_arrow(arrow_stream(table.drop(['cut'])))
+        print("Arrow column encoding test passed")
+
+    def test_prediction_writers(self):
+        errors = [{'index': 1, 'error': 'missing cut'}]
+        raw = np.frombuffer(binary_format.write_raw_predictions([10.0, 30.0], 3, errors), dtype='<f4')
+        np.testing.assert_array_equal(raw, np.array([10.0, np.nan, 30.0], dtype=np.float32))
+
+        table = pa.ipc.open_stream(binary_format.write_arrow_predictions([10.0, 30.0], 3, errors)).read_all()
+        self.assertEqual(table.column('predicted_price').to_pylist(), [10.0, None, 30.0])
+        self.assertEqual(table.column('error').to_pylist(), [None, 'missing cut', None])
+        print("Prediction writer test passed")
+
+def run_binary_format_tests():
+    print("Starting Binary Format Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestBinaryFormat)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All binary format tests passed!")
+    else:
+        print("Some binary format tests failed.")
+
+if __name__ == "__main__":
+    run_binary_format_tests()
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.Components.data_transformation import DataTransformation, CATEGORIES, NUMERICAL_COLS
+from src.pipeline.compiled_preprocessor import CompiledPreprocessor, check_equivalence, compile_preprocessor
+
+def make_diamonds(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {col: rng.normal(5.0, 2.0, n_rows) for col in NUMERICAL_COLS}
+    for col, categories in CATEGORIES.items():
+        data[col] = rng.choice(categories, n_rows)
+    df = pd.DataFrame(data)
+
+    # Missing values exercise the imputers
+    df.loc[::11, 'carat'] = np.nan
+    df.loc[::13, 'depth'] = np.nan
+    return df
+
+class TestCompiledPreprocessor(unittest.TestCase):
+
+    def setUp(self):
+        self.train_df = make_diamonds(2000)
+        self.test_df = make_diamonds(500, seed=1)
+        self.preprocessor = DataTransformation().get_data_transformation_object()
+        self.preprocessor.fit(self.train_df)
+        self.compiled = CompiledPreprocessor.from_column_transformer(self.preprocessor)
+
+    def test_dataframe_equivalence(self):
+        self.assertTrue(check_equivalence(self.preprocessor, self.compiled, self.test_df))
+        print("DataFrame equivalence test passed")
+
+    def test_record_equivalence(self):
+        records = self.test_df.head(50).to_dict('records')
+        for record in records:
+            expected = self.preprocessor.transform(pd.DataFrame([record]))
+            self.assertTrue(np.array_equal(expected, self.compiled.transform(record)))
+
+        expected = self.preprocessor.transform(pd.DataFrame(records))
+        self.assertTrue(np.array_equal(expected, self.compiled.transform(records)))
+        print("Record equivalence test passed")
+
+    def test_probe_frame_equivalence(self):
+        self.assertTrue(check_equivalence(self.preprocessor, self.compiled, self.compiled.probe_frame()))
+        self.assertIsInstance(compile_preprocessor(self.preprocessor), CompiledPreprocessor)
+        print("Probe frame equivalence test passed")
+
+    def test_unknown_category(self):
+        record = self.test_df.iloc[0].to_dict()
+        record['cut'] = 'Excellent'
+        with self.assertRaises(ValueError):
+            self.compiled.transform(record)
+        with self.assertRaises(ValueError):
+            self.compiled.transform([record])
+        print("Unknown category test passed")
+
+    def test_fitted_artifact_equivalence(self):
+        # Also check the trained preprocessor when one is available
+        path = os.path.join('artifacts', 'preprocessor.pkl')
+        if not os.path.exists(path):
+            self.skipTest("No trained preprocessor in artifacts/")
+
+        from src.utils import load_object
+        preprocessor = load_object(path)
+        compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+        self.assertTrue(check_equivalence(preprocessor, compiled, self.test_df))
+        print("Fitted artifact equivalence test passed")
+
+def run_compiled_preprocessor_tests():
+    print("Starting Compiled Preprocessor Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCompiledPreprocessor)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All compiled preprocessor tests passed!")
+    else:
+        print("Some compiled preprocessor tests failed.")
+
+if __name__ == "__main__":
+    run_compiled_preprocessor_tests()
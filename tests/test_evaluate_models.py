@@ -0,0 +1,120 @@
+import unittest
+import tempfile
+import subprocess
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor
+
+from src.utils import evaluate_models, model_cache_key, hash_arrays
+from src.pipeline.predict_pipeline import PredictPipeline
+
+class TestEvaluateModels(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'model_cache')
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(300, 4))
+        y = X @ np.array([3.0, -2.0, 1.0, 0.5]) + rng.normal(0, 0.1, 300)
+        self.data = (X[:240], y[:240], X[240:], y[240:])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def candidates(self):
+        # Deliberately not in alphabetical order
+        return {
+            'Ridge': Ridge(),
+            'Decision Tree': DecisionTreeRegressor(random_state=0),
+            'Random Forest': RandomForestRegressor(n_estimators=10, random_state=0),
+            'Linear Regression': LinearRegression()
+        }
+
+    def test_parallel_matches_serial(self):
+        serial_models, parallel_models = self.candidates(), self.candidates()
+        serial = evaluate_models(*self.data, serial_models, n_workers=1)
+        parallel = evaluate_models(*self.data, parallel_models, n_workers=3)
+
+        self.assertEqual(list(parallel), list(self.candidates()))
+        self.assertEqual(list(serial), list(parallel))
+        for model_name in serial:
+            self.assertAlmostEqual(serial[model_name], parallel[model_name], places=12)
+            # Fitted estimators from the workers replace the caller's
+            self.assertTrue(hasattr(parallel_models[model_name], 'n_features_in_'))
+        print("Parallel evaluation test passed")
+
+    def test_cache_hits(self):
+        timings = {}
+        first = evaluate_models(*self.data, self.candidates(), n_workers=2, cache_dir=self.cache_dir, timings=timings)
+        self.assertFalse(any(timing['cached'] for timing in timings.values()))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+
+        # A different n_jobs does not miss the cache; the order of the report is kept
+        models = self.candidates()
+        models['Random Forest'].set_params(n_jobs=4)
+        models['Extra Ridge'] = Ridge(alpha=10.0)
+        timings = {}
+        second = evaluate_models(*self.data, models, n_workers=1, cache_dir=self.cache_dir, timings=timings)
+        self.assertEqual(list(second), list(models))
+        self.assertEqual([name for name, timing in timings.items() if not timing['cached']], ['Extra Ridge'])
+        for model_name in first:
+            self.assertEqual(first[model_name], second[model_name])
+        print("Model cache hit test passed")
+
+    def test_cache_key_and_pruning(self):
+        self.assertEqual(model_cache_key(RandomForestRegressor(n_jobs=1), 'data'),
+                         model_cache_key(RandomForestRegressor(n_jobs=8), 'data'))
+        self.assertNotEqual(model_cache_key(Ridge(alpha=1.0), 'data'), model_cache_key(Ridge(alpha=2.0), 'data'))
+        self.assertNotEqual(model_cache_key(Ridge(), 'data'), model_cache_key(Ridge(), 'other data'))
+
+        evaluate_models(*self.data, {'Ridge': Ridge()}, cache_dir=self.cache_dir)
+        X_train, y_train, X_test, y_test = self.data
+        evaluate_models(X_train, y_train * 2, X_test, y_test * 2, {'Ridge': Ridge()}, cache_dir=self.cache_dir)
+
+        # Only entries for the latest training data are kept
+        entries = os.listdir(self.cache_dir)
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(entries[0].startswith(hash_arrays(X_train, y_train * 2, X_test, y_test * 2)[:16]))
+        print("Cache key and pruning test passed")
+
+    def test_training_script_rerun(self):
+        # Re-running train_pipeline.py on unchanged data loads every candidate instead of refitting
+        import pipeline.train_pipeline as train_pipeline
+
+        data_dir = os.path.join(self.tmp_dir.name, 'notebooks', 'data')
+        os.makedirs(data_dir)
+        df = PredictPipeline.sample_frame(400)
+        df['price'] = 4000 * df['carat'] + 20 * df['table'] + np.random.default_rng(0).normal(0, 50, len(df))
+        df.insert(0, 'id', np.arange(len(df)))
+        df.to_csv(os.path.join(data_dir, 'diamonds.csv'), index=False)
+
+        sources = []
+        for _ in range(2):
+            result = subprocess.run([sys.executable, train_pipeline.__file__], cwd=self.tmp_dir.name, check=True,
+                                    capture_output=True, text=True, env=dict(os.environ, MODEL_SEARCH='0'))
+            sources.append([line.rsplit(' ', 1)[-1] for line in result.stdout.splitlines() if ': fit ' in line])
+
+        self.assertEqual(sources[0], ['(trained)'] * 7)
+        self.assertEqual(sources[1], ['(cached)'] * 7)
+        print("Training script rerun test passed")
+
+def run_evaluate_models_tests():
+    print("Starting Model Evaluation Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestEvaluateModels)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All model evaluation tests passed!")
+    else:
+        print("Some model evaluation tests failed.")
+
+if __name__ == "__main__":
+    run_evaluate_models_tests()
@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+from src.utils import save_object, load_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline
+from exception import CustomException, ValidationError, ArtifactError, InferenceError, wrap_error
+
+class BrokenModel:
+    def predict(self, X):
+        raise RuntimeError('model exploded')
+
+class TestException(unittest.TestCase):
+
+    def test_lazy_message_and_chaining(self):
+        try:
+            try:
+                1 / 0
+            except Exception as e:
+                raise InferenceError(e, sys)
+        except InferenceError as error:
+            inner = error
+
+        # Nothing is formatted until the message is needed
+        self.assertIsNone(inner._error_message)
+        self.assertIsInstance(inner.__cause__, ZeroDivisionError)
+        self.assertIn('line number', str(inner))
+        self.assertEqual(inner.reason, 'division by zero')
+
+        # Wrapping layers pass project errors through instead of nesting them
+        self.assertIs(wrap_error(inner, ArtifactError), inner)
+        self.assertIsInstance(wrap_error(ValueError('bad')), ValidationError)
+        self.assertIsInstance(wrap_error(ValueError('bad')), ValueError)
+        self.assertEqual(type(wrap_error(KeyError('x'))), CustomException)
+        self.assertEqual(str(ArtifactError('missing model')), 'missing model')
+        print("Lazy message and chaining test passed")
+
+    def test_pipeline_error_types(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            df = PredictPipeline.sample_frame(50)
+            preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+            model = LinearRegression().fit(preprocessor.transform(df), df['carat'] * 1000)
+            paths = {}
+            for name, obj in [('model.pkl', model), ('broken.pkl', BrokenModel()), ('preprocessor.pkl', preprocessor)]:
+                paths[name] = os.path.join(tmp_dir, name)
+                save_object(paths[name], obj)
+
+            store = ArtifactStore(os.path.join(tmp_dir, 'versions'))
+            store.publish(paths['model.pkl'], paths['preprocessor.pkl'])
+            pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+
+            with self.assertRaises(ValidationError) as context:
+                pipeline.predict(df.drop(columns=['carat']))
+            self.assertEqual((context.exception.code, context.exception.http_status), ('invalid_input', 400))
+
+            pipeline._active = ('broken', paths['broken.pkl'], paths['preprocessor.pkl'])
+            with self.assertRaises(InferenceError) as context:
+                pipeline.predict(df)
+            self.assertEqual(context.exception.reason, 'model exploded')
+
+            garbage_path = os.path.join(tmp_dir, 'garbage.pkl')
+            with open(garbage_path, 'wb') as file_obj:
+                file_obj.write(b'not a pickle')
+            with self.assertRaises(ArtifactError) as context:
+                load_object(garbage_path)
+            self.assertEqual(context.exception.http_status, 503)
+            self.assertIsNotNone(context.exception.__cause__)
+
+            with self.assertRaises(ArtifactError):
+                ArtifactRegistry().get_first([os.path.join(tmp_dir, 'missing.pkl')])
+        print("Pipeline error type test passed")
+
+def run_exception_tests():
+    print("Starting Exception Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestException)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All exception tests passed!")
+    else:
+        print("Some exception tests failed.")
+
+if __name__ == "__main__":
+    run_exception_tests()
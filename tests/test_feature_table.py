@@ -0,0 +1,135 @@
+import unittest
+import tempfile
+import subprocess
+import numpy as np
+from unittest import mock
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+from sklearn.ensemble import RandomForestRegressor
+
+from src.utils import save_object, load_object
+from src.Components.data_transformation import DataTransformation, CATEGORIES
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.compiled_preprocessor import compile_preprocessor
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.binary_format import encode_categories
+from src.pipeline.feature_table import FeatureTable, FeatureTableBuilder, load_feature_table
+
+class TestFeatureTable(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = PredictPipeline.sample_frame(300).sample(frac=1, random_state=0).reset_index(drop=True)
+        self.df['depth'] = rng.normal(61.8, 1.5, len(self.df))
+        self.preprocessor = DataTransformation().get_data_transformation_object().fit(self.df)
+        self.X = self.preprocessor.transform(self.df)
+        self.y = 4000 * self.df['carat'] + rng.normal(0, 100, len(self.df))
+        self.compiled = compile_preprocessor(self.preprocessor)
+
+    def test_matches_linear_models(self):
+        for model in [LinearRegression(), Ridge(), Lasso(alpha=0.1, max_iter=10000), ElasticNet(max_iter=10000)]:
+            model.fit(self.X, self.y)
+            table = FeatureTable.build(model, self.compiled)
+            np.testing.assert_allclose(table.predict(self.df), model.predict(self.X), rtol=1e-9, atol=1e-6)
+
+        self.assertEqual(table.block.shape, (5 * 7 * 8, 3))
+        self.assertEqual(table.contribution.shape, (280,))
+
+        # Missing grades take the imputer's value, unknown grades are rejected
+        row = self.df.iloc[:1].copy()
+        row['cut'] = None
+        filled = row.copy()
+        filled['cut'] = self.preprocessor.named_transformers_['cat_pipeline'].named_steps['imputer'].statistics_[0]
+        np.testing.assert_allclose(table.predict(row), model.predict(self.preprocessor.transform(filled)), rtol=1e-9)
+        row['cut'] = 'Flawless'
+        with self.assertRaises(ValueError):
+            table.predict(row)
+        print("Linear model table test passed")
+
+    def test_encoded_columns(self):
+        model = LinearRegression().fit(self.X, self.y)
+        table = FeatureTable.build(model, self.compiled)
+        columns = {col: self.df[col].to_numpy(dtype=np.float32) for col in ['carat', 'depth', 'table', 'x', 'y', 'z']}
+        for col in CATEGORIES:
+            columns[col] = encode_categories(col, self.df[col])
+        np.testing.assert_allclose(table.predict_encoded(columns),
+                                   model.predict(self.compiled.transform_encoded(columns, CATEGORIES)), rtol=1e-9)
+        print("Encoded columns test passed")
+
+    def test_saved_table_and_pipeline(self):
+        linear = LinearRegression().fit(self.X, self.y)
+        forest = RandomForestRegressor(n_estimators=5, random_state=0).fit(self.X, self.y)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = {}
+            for name, obj in [('linear.pkl', linear), ('forest.pkl', forest), ('preprocessor.pkl', self.preprocessor)]:
+                paths[name] = os.path.join(tmp_dir, name)
+                save_object(paths[name], obj)
+
+            table_path = os.path.join(tmp_dir, 'feature_table.pkl')
+            builder = FeatureTableBuilder()
+            self.assertIsNone(builder.initiate_feature_table(paths['forest.pkl'], paths['preprocessor.pkl'], table_path))
+            self.assertEqual(builder.initiate_feature_table(paths['linear.pkl'], paths['preprocessor.pkl'], table_path), table_path)
+
+            saved = load_object(table_path)
+            self.assertEqual(load_feature_table(linear, self.compiled, table_path).fingerprint, saved.fingerprint)
+            # A table saved for another model is not used
+            other = Ridge(alpha=10).fit(self.X, self.y)
+            self.assertNotEqual(load_feature_table(other, self.compiled, table_path).fingerprint, saved.fingerprint)
+            self.assertIsNone(load_feature_table(forest, self.compiled, table_path))
+
+            store = ArtifactStore(os.path.join(tmp_dir, 'versions'))
+            for model_name, model in [('linear.pkl', linear), ('forest.pkl', forest)]:
+                store.publish(paths[model_name], paths['preprocessor.pkl'])
+                pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+                np.testing.assert_allclose(pipeline.predict(self.df), model.predict(self.X), rtol=1e-9, atol=1e-6)
+                uses_table = pipeline.feature_table(*pipeline.load_artifacts()) is not None
+                self.assertEqual(uses_table, model is linear)
+
+            # A table published with the version is loaded from its directory, not rebuilt
+            version = store.publish(paths['linear.pkl'], paths['preprocessor.pkl'], extra_files={'feature_table': table_path})
+            self.assertEqual(os.path.dirname(store.extra_path(version, 'feature_table')), store.version_dir(version))
+            pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+            with mock.patch.object(FeatureTable, 'build', side_effect=AssertionError('rebuilt')):
+                self.assertEqual(pipeline.feature_table(*pipeline.load_artifacts()).fingerprint, saved.fingerprint)
+                np.testing.assert_allclose(pipeline.predict(self.df), linear.predict(self.X), rtol=1e-9, atol=1e-6)
+        print("Saved table and pipeline test passed")
+
+    def test_training_entry_point(self):
+        # The documented entry point builds the table and publishes it with the version
+        import pipeline.train_pipeline as train_pipeline
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = os.path.join(tmp_dir, 'notebooks', 'data')
+            os.makedirs(data_dir)
+            df = self.df.assign(id=np.arange(len(self.df)), price=self.y)
+            df.to_csv(os.path.join(data_dir, 'diamonds.csv'), index=False)
+
+            subprocess.run([sys.executable, train_pipeline.__file__], cwd=tmp_dir, check=True,
+                           capture_output=True, env=dict(os.environ, MODEL_SEARCH='0'))
+
+            store = ArtifactStore(os.path.join(tmp_dir, 'artifacts', 'versions'))
+            version = store.current_version()
+            self.assertIsNotNone(store.extra_path(version, 'feature_table'))
+            pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+            self.assertIsNotNone(pipeline.feature_table(*pipeline.load_artifacts()))
+        print("Training entry point test passed")
+
+def run_feature_table_tests():
+    print("Starting Feature Table Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestFeatureTable)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All feature table tests passed!")
+    else:
+        print("Some feature table tests failed.")
+
+if __name__ == "__main__":
+    run_feature_table_tests()
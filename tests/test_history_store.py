@@ -0,0 +1,183 @@
+import unittest
+import tempfile
+import threading
+import sqlite3
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.pipeline.history_store import PredictionHistoryStore
+
+class TestPredictionHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'history.db')
+        self.store = PredictionHistoryStore(db_file_path=self.db_path, flush_interval=0.05)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def record(self, i, timestamp='2025-06-29 21:12:32'):
+        return {'timestamp': timestamp, 'input': {'carat': i}, 'predicted_price': 1000.0 + i}
+
+    def test_pending_is_bounded(self):
+        store = PredictionHistoryStore(db_file_path=self.db_path, flush_interval=60)
+        store.config.max_pending = 5
+        try:
+            for i in range(20):
+                store.append(self.record(i))
+            self.assertEqual((store.stats()['pending'], store.stats()['dropped']), (5, 15))
+            self.assertEqual([r['input']['carat'] for r in store.query()['history']], [19, 18, 17, 16, 15])
+        finally:
+            store.close()
+        print("Bounded pending records test passed")
+
+    def test_paging_newest_first(self):
+        for i in range(25):
+            self.store.append(self.record(i))
+        page = self.store.query(page=2, page_size=10)
+        self.assertEqual(page['total'], 25)
+        self.assertEqual([r['input']['carat'] for r in page['history']], list(range(14, 4, -1)))
+        self.assertEqual(len(self.store.query(page=3, page_size=10)['history']), 5)
+        print("Paging test passed")
+
+    def test_time_range(self):
+        for i in range(3):
+            self.store.append(self.record(i))
+        self.assertEqual(self.store.query(start='2000-01-01', end='2000-12-31')['total'], 0)
+        self.assertEqual(self.store.query(start='2000-01-01')['total'], 3)
+        with self.assertRaises(ValueError):
+            self.store.query(start='not a date')
+        print("Time range test passed")
+
+    def test_concurrent_appends_persist(self):
+        def worker(offset):
+            for i in range(100):
+                self.store.append(self.record(offset + i))
+
+        threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.store.close()
+
+        reopened = PredictionHistoryStore(db_file_path=self.db_path)
+        self.assertEqual(reopened.query()['total'], 400)
+        reopened.close()
+        print("Concurrent append test passed")
+
+    def test_query_does_not_flush(self):
+        store = PredictionHistoryStore(db_file_path=self.db_path, flush_interval=60)
+        try:
+            for i in range(15):
+                store.append(self.record(i))
+            page = store.query(page=1, page_size=10)
+            self.assertEqual(store.stats()['written'], 0)
+            self.assertEqual(page['total'], 15)
+            self.assertEqual([r['input']['carat'] for r in page['history']], list(range(14, 4, -1)))
+            self.assertTrue(all(r['id'] is None for r in page['history']))
+
+            # Pages continue from memory into the database without gaps
+            store.flush()
+            for i in range(15, 20):
+                store.append(self.record(i))
+            page = store.query(page=1, page_size=10)
+            self.assertEqual(page['total'], 20)
+            self.assertEqual([r['input']['carat'] for r in page['history']], list(range(19, 9, -1)))
+            self.assertEqual([r['id'] is None for r in page['history']], [True] * 5 + [False] * 5)
+            self.assertEqual([r['input']['carat'] for r in store.query(page=2, page_size=15)['history']], list(range(4, -1, -1)))
+        finally:
+            store.close()
+        print("Query without flush test passed")
+
+    def test_connections_are_reused(self):
+        self.store.append(self.record(0))
+        self.store.flush()
+        self.store.query()
+        writer, readers = self.store._writer_conn, list(self.store._readers)
+        for i in range(3):
+            self.store.append(self.record(i))
+            self.store.flush()
+            self.store.query()
+        self.assertIs(self.store._writer_conn, writer)
+        self.assertEqual(self.store._readers, readers)
+
+        # Requests read through a read-only connection
+        with self.assertRaises(sqlite3.OperationalError):
+            readers[0].execute('DELETE FROM prediction_history')
+        self.store.close()
+        self.assertIsNone(self.store._writer_conn)
+        self.assertEqual(self.store._readers, [])
+        print("Connection reuse test passed")
+
+    def test_query_does_not_wait_for_writes(self):
+        for i in range(3):
+            self.store.append(self.record(i))
+        results = []
+        with self.store._write_lock:
+            # A flush in progress holds the write lock; queries read the last commit meanwhile
+            reader = threading.Thread(target=lambda: results.append(self.store.query()['total']))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+        self.assertEqual(results, [3])
+        print("Query without write lock test passed")
+
+    def test_records_listed_once_during_flushes(self):
+        store = PredictionHistoryStore(db_file_path=self.db_path, flush_interval=60)
+
+        def writer():
+            for i in range(2000):
+                store.append(self.record(i))
+                if i % 7 == 6:
+                    store.flush()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            while thread.is_alive():
+                page = store.query(page_size=5000)
+                carats = [r['input']['carat'] for r in page['history']]
+                # Nothing missing or listed twice, whether pending, being flushed or on disk
+                self.assertEqual(sorted(carats), list(range(len(carats))))
+                self.assertEqual(page['total'], len(carats))
+        finally:
+            thread.join()
+            store.close()
+        print("Exactly-once listing test passed")
+
+    def test_failed_reader_is_closed(self):
+        class BrokenConnection:
+            closed = False
+            def execute(self, *args):
+                raise sqlite3.OperationalError('disk I/O error')
+            def close(self):
+                self.closed = True
+
+        self.store.query()
+        broken = BrokenConnection()
+        self.store._readers = [broken]
+        with self.assertRaises(sqlite3.OperationalError):
+            self.store.query()
+        self.assertTrue(broken.closed)
+        self.assertEqual(self.store._readers, [])
+        print("Failed reader test passed")
+
+def run_history_store_tests():
+    print("Starting History Store Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestPredictionHistoryStore)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All history store tests passed!")
+    else:
+        print("Some history store tests failed.")
+
+if __name__ == "__main__":
+    run_history_store_tests()
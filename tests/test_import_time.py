@@ -0,0 +1,77 @@
+import unittest
+import subprocess
+import tempfile
+import json
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative import time budgets (ms) for the serving entry points, measured with `python -X importtime`.
+# Set IMPORT_TIME_BUDGET_SCALE on slow machines instead of editing the budgets.
+IMPORT_BUDGETS_MS = {
+    'src.pipeline.predict_pipeline': 1200,
+    'app': 1500
+}
+
+# Training and metrics dependencies the serving path must not import
+FORBIDDEN_PREFIXES = ('sklearn', 'scipy', 'joblib', 'dill', 'Components.model_trainer')
+
+def run_import(module, code=''):
+    # Fresh interpreter in an empty directory: no artifacts, so only module import is measured
+    with tempfile.TemporaryDirectory() as cwd:
+        script = f"import sys; sys.path.insert(0, {ROOT!r}); import {module}; {code}"
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=cwd, capture_output=True, text=True, timeout=120
+        )
+        created = os.listdir(cwd)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return result, created
+
+def cumulative_ms(importtime_output, module):
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise ValueError(f"{module} not found in -X importtime output")
+
+class TestImportTime(unittest.TestCase):
+
+    def test_serving_path_skips_training_dependencies(self):
+        result, created = run_import('app', 'import json; print(json.dumps(sorted(sys.modules)))')
+        modules = json.loads(result.stdout.strip().splitlines()[-1])
+        forbidden = [m for m in modules if m.startswith(FORBIDDEN_PREFIXES)]
+        self.assertEqual(forbidden, [])
+        # Nothing written to disk (e.g. log files) just by importing
+        self.assertEqual(created, [])
+        print("Serving import dependency test passed")
+
+    def test_import_time_budgets(self):
+        scale = float(os.environ.get('IMPORT_TIME_BUDGET_SCALE', '1'))
+        for module, budget_ms in IMPORT_BUDGETS_MS.items():
+            # Best of three runs, after one run that writes the bytecode caches
+            run_import(module)
+            timings = [cumulative_ms(run_import(module)[0].stderr, module) for _ in range(3)]
+            best = min(timings)
+            print(f"{module}: {best:.0f} ms (budget {budget_ms * scale:.0f} ms)")
+            self.assertLessEqual(best, budget_ms * scale, f"{module} import time regressed")
+        print("Import time budget test passed")
+
+def run_import_time_tests():
+    print("Starting Import Time Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestImportTime)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All import time tests passed!")
+    else:
+        print("Some import time tests failed.")
+
+if __name__ == "__main__":
+    run_import_time_tests()
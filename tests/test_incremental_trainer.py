@@ -0,0 +1,85 @@
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import r2_score
+
+from src.utils import load_object
+from src.Components.data_transformation import CATEGORIES
+from src.Components.incremental_trainer import IncrementalTrainer
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline
+
+class TestIncrementalTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = PredictPipeline.sample_frame(600).sample(frac=1, random_state=0).reset_index(drop=True)
+        # A noiseless linear price, in dollars, that the SGD model can learn exactly
+        self.df['price'] = (4000 * self.df['carat'] + 150 * self.df['cut'].map(CATEGORIES['cut'].index)
+                            + 20 * self.df['table'] + 500)
+        self.data_path = os.path.join(self.tmp_dir.name, 'diamonds.csv')
+        self.df.to_csv(self.data_path, index=False)
+
+        self.store = ArtifactStore(os.path.join(self.tmp_dir.name, 'versions'))
+        self.trainer = IncrementalTrainer(regressor=SGDRegressor(alpha=1e-6, random_state=0), store=self.store)
+        config = self.trainer.incremental_trainer_config
+        config.chunk_size = 100
+        config.n_epochs = 20
+        config.trained_model_file_path = os.path.join(self.tmp_dir.name, 'model.pkl')
+        config.preprocessor_obj_file_path = os.path.join(self.tmp_dir.name, 'preprocessor.pkl')
+        config.feature_table_file_path = os.path.join(self.tmp_dir.name, 'feature_table.pkl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_folded_coefficients(self):
+        r2 = self.trainer.initiate_incremental_training(self.data_path)
+        self.assertGreater(r2, 0.99)
+
+        # Predictions come back in dollars from coef_ / intercept_ alone
+        config = self.trainer.incremental_trainer_config
+        model = load_object(config.trained_model_file_path)
+        preprocessor = load_object(config.preprocessor_obj_file_path)
+        X = preprocessor.transform(self.df)
+        np.testing.assert_allclose(X @ model.coef_ + model.intercept_[0], model.predict(X), rtol=1e-12)
+        # An unfolded model would predict the standardized target instead
+        self.assertGreater(r2_score(self.df['price'], model.predict(X)), 0.99)
+        print("Folded coefficients test passed")
+
+    def test_published_version(self):
+        r2 = self.trainer.initiate_incremental_training(self.data_path)
+        self.assertEqual(self.store.current_version(), self.trainer.version)
+
+        self.assertIsNotNone(self.store.extra_path(self.trainer.version, 'feature_table'))
+        metrics = self.store.manifest(self.trainer.version)['metrics']
+        self.assertEqual((metrics['model_name'], metrics['training']), ('SGDRegressor', 'incremental'))
+        self.assertAlmostEqual(metrics['r2_score'], r2)
+
+        config = self.trainer.incremental_trainer_config
+        model = load_object(config.trained_model_file_path)
+        preprocessor = load_object(config.preprocessor_obj_file_path)
+        pipeline = PredictPipeline(registry=ArtifactRegistry(), store=self.store)
+        np.testing.assert_allclose(pipeline.predict(self.df), model.predict(preprocessor.transform(self.df)), rtol=1e-9)
+        print("Published version test passed")
+
+def run_incremental_trainer_tests():
+    print("Starting Incremental Trainer Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestIncrementalTrainer)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All incremental trainer tests passed!")
+    else:
+        print("Some incremental trainer tests failed.")
+
+if __name__ == "__main__":
+    run_incremental_trainer_tests()
@@ -0,0 +1,115 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from instrumentation import Histogram, MetricsRegistry, SamplingProfiler, span, metrics, STAGE_METRIC, MIN_PROFILE_INTERVAL
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_histogram_buckets(self):
+        histogram = Histogram(buckets=(0.001, 0.01))
+        for value in [0.0005, 0.001, 0.005, 0.5]:
+            histogram.observe(value)
+        cumulative, total, count = histogram.snapshot()
+        # Upper bounds are inclusive, as in Prometheus
+        self.assertEqual(cumulative, [2, 3, 4])
+        self.assertAlmostEqual(total, 0.5065)
+        self.assertEqual(count, 4)
+        print("Histogram bucket test passed")
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry(buckets=(0.01,))
+        registry.observe('requests_seconds', 0.002, endpoint='/api/predict', status='200')
+        registry.observe('requests_seconds', 0.02, endpoint='/api/predict', status='200')
+        lines = registry.render().splitlines()
+
+        self.assertIn('# TYPE requests_seconds histogram', lines)
+        self.assertIn('requests_seconds_bucket{endpoint="/api/predict",status="200",le="0.01"} 1', lines)
+        self.assertIn('requests_seconds_bucket{endpoint="/api/predict",status="200",le="+Inf"} 2', lines)
+        self.assertIn('requests_seconds_count{endpoint="/api/predict",status="200"} 2', lines)
+        print("Prometheus text test passed")
+
+    def test_span_records_on_error(self):
+        before = metrics.histogram(STAGE_METRIC, stage='test_stage').snapshot()[2]
+        with span('test_stage'):
+            time.sleep(0.001)
+        with self.assertRaises(ValueError):
+            with span('test_stage'):
+                raise ValueError('failed inside the span')
+
+        summary = metrics.summary()['test_stage']
+        self.assertEqual(summary['count'], before + 2)
+        self.assertGreater(summary['mean_ms'], 0)
+        print("Span recording test passed")
+
+    def test_sampling_profiler(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,))
+        worker.start()
+        try:
+            profiler = SamplingProfiler(interval=0.001)
+            self.assertTrue(profiler.start())
+            self.assertFalse(profiler.start())
+            time.sleep(0.2)
+            report = profiler.stop()
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.n_samples, 0)
+        self.assertIn('busy_loop', report)
+        print("Sampling profiler test passed")
+
+    def test_profiler_interval_is_clamped(self):
+        profiler = SamplingProfiler()
+        self.assertTrue(profiler.start(interval=0.000001))
+        profiler.stop()
+        self.assertEqual(profiler.interval, MIN_PROFILE_INTERVAL)
+        print("Profiler interval clamp test passed")
+
+    def test_profile_endpoints_are_opt_in(self):
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+        import app as app_module
+
+        client = app_module.app.test_client()
+        original = app_module.PROFILER_ENABLED
+        try:
+            app_module.PROFILER_ENABLED = False
+            for method, path in [('post', '/api/profile/start'), ('post', '/api/profile/stop'), ('get', '/api/profile')]:
+                self.assertEqual(getattr(client, method)(path).status_code, 404)
+            self.assertFalse(app_module.profiler.running)
+
+            app_module.PROFILER_ENABLED = True
+            self.assertEqual(client.post('/api/profile/start?interval_ms=nan').status_code, 400)
+            response = client.post('/api/profile/start?interval_ms=0.001')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['interval_ms'], 1.0)
+            self.assertEqual(client.post('/api/profile/stop').status_code, 200)
+        finally:
+            app_module.PROFILER_ENABLED = original
+            app_module.profiler.stop()
+        print("Profile endpoint opt-in test passed")
+
+def run_instrumentation_tests():
+    print("Starting Instrumentation Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestInstrumentation)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All instrumentation tests passed!")
+    else:
+        print("Some instrumentation tests failed.")
+
+if __name__ == "__main__":
+    run_instrumentation_tests()
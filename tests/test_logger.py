@@ -0,0 +1,125 @@
+import unittest
+import threading
+import tempfile
+import logging
+import queue
+import json
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from logger import LoggingConfig, NonBlockingQueueHandler, setup_logging, stop_logging, lazy
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmp_dir.name, 'logs')
+        # Only the queue handler stays on the root logger (test runners attach their own)
+        root = logging.getLogger()
+        self.saved = (list(root.handlers), root.level)
+        root.handlers.clear()
+
+    def tearDown(self):
+        stop_logging()
+        root = logging.getLogger()
+        root.handlers[:], level = self.saved
+        root.setLevel(level)
+        self.tmp_dir.cleanup()
+
+    def read_log(self, file_name='diamond_price.log'):
+        with open(os.path.join(self.log_dir, file_name)) as f:
+            return f.read().splitlines()
+
+    def test_records_written_off_thread(self):
+        handler = setup_logging(LoggingConfig(log_dir=self.log_dir))
+        # The file is only created by the first record
+        self.assertFalse(os.path.exists(self.log_dir))
+
+        self.assertIs(logging.getLogger().handlers[-1], handler)
+
+        written_by = []
+        original_emit = logging.FileHandler.emit
+        def emit(self_, record):
+            written_by.append(threading.current_thread().name)
+            original_emit(self_, record)
+        logging.FileHandler.emit = emit
+        try:
+            logging.info("Prediction served in %d ms", 3)
+            stop_logging()
+        finally:
+            logging.FileHandler.emit = original_emit
+
+        self.assertNotIn(threading.current_thread().name, written_by)
+        lines = self.read_log()
+        self.assertEqual(len(lines), 1)
+        self.assertIn("INFO - Prediction served in 3 ms", lines[0])
+        print("Off-thread logging test passed")
+
+    def test_json_lines(self):
+        setup_logging(LoggingConfig(log_dir=self.log_dir, log_format='json'))
+        logging.warning("Model %s reloaded", 'v2', extra={'request_id': 'abc'})
+        try:
+            raise ValueError('bad input')
+        except ValueError:
+            logging.exception("Prediction failed")
+        stop_logging()
+
+        first, second = [json.loads(line) for line in self.read_log()]
+        self.assertEqual(first['level'], 'WARNING')
+        self.assertEqual(first['message'], 'Model v2 reloaded')
+        self.assertEqual(first['request_id'], 'abc')
+        self.assertIn('ValueError: bad input', second['exception'])
+        print("JSON line format test passed")
+
+    def test_lazy_arguments(self):
+        setup_logging(LoggingConfig(log_dir=self.log_dir, level='INFO'))
+        calls = []
+        def render():
+            calls.append(threading.current_thread().name)
+            return 'expensive payload'
+
+        logging.debug("Head:\n%s", lazy(render))
+        self.assertEqual(calls, [])
+
+        logging.getLogger().setLevel(logging.DEBUG)
+        logging.debug("Head:\n%s", lazy(render))
+        stop_logging()
+        self.assertEqual(len(calls), 1)
+        self.assertNotEqual(calls[0], threading.current_thread().name)
+        self.assertIn('expensive payload', '\n'.join(self.read_log()))
+        print("Lazy formatting test passed")
+
+    def test_size_rotation(self):
+        setup_logging(LoggingConfig(log_dir=self.log_dir, max_bytes=2000, backup_count=2))
+        for i in range(100):
+            logging.info("Record %d %s", i, 'x' * 50)
+        stop_logging()
+        self.assertEqual(sorted(os.listdir(self.log_dir)),
+                         ['diamond_price.log', 'diamond_price.log.1', 'diamond_price.log.2'])
+        print("Size rotation test passed")
+
+    def test_full_queue_drops(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+        record = logging.LogRecord('test', logging.INFO, __file__, 0, 'message', None, None)
+        for _ in range(5):
+            handler.handle(record)
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+        print("Full queue test passed")
+
+def run_logger_tests():
+    print("Starting Logger Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestLogger)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All logger tests passed!")
+    else:
+        print("Some logger tests failed.")
+
+if __name__ == "__main__":
+    run_logger_tests()
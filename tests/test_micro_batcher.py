@@ -0,0 +1,105 @@
+import unittest
+import asyncio
+import threading
+import json
+from unittest import mock
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.pipeline.micro_batcher import MicroBatcher
+from src.pipeline.prediction_cache import PredictionCache
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.record = {
+            'carat': 1.5, 'cut': 'Premium', 'color': 'G', 'clarity': 'VS1',
+            'depth': 61.5, 'table': 57.0, 'x': 7.3, 'y': 7.35, 'z': 4.5
+        }
+        self.batch_sizes = []
+
+    def predict_fn(self, df):
+        self.batch_sizes.append(len(df))
+        return (df['carat'] * 1000).to_numpy()
+
+    def run_requests(self, batcher, records):
+        async def main():
+            try:
+                return await asyncio.gather(*[batcher.submit(r) for r in records], return_exceptions=True)
+            finally:
+                await batcher.stop()
+        return asyncio.run(main())
+
+    def test_concurrent_requests_are_coalesced(self):
+        batcher = MicroBatcher(self.predict_fn, max_batch_size=16, max_wait_ms=50)
+        records = [dict(self.record, carat=(i + 1) / 10) for i in range(40)]
+        results = self.run_requests(batcher, records)
+
+        self.assertEqual(results, [(i + 1) * 100.0 for i in range(40)])
+        self.assertEqual(self.batch_sizes, [16, 16, 8])
+        self.assertEqual(batcher.stats()['rows'], 40)
+        print("Coalescing test passed")
+
+    def test_invalid_row_fails_alone(self):
+        batcher = MicroBatcher(self.predict_fn, max_batch_size=8, max_wait_ms=50)
+        records = [self.record, dict(self.record, cut='Excellent'), dict(self.record, carat=2.0)]
+        results = self.run_requests(batcher, records)
+
+        self.assertEqual(results[0], 1500.0)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 2000.0)
+        self.assertEqual(self.batch_sizes, [2])
+        print("Invalid row isolation test passed")
+
+    def test_model_error_reaches_every_caller(self):
+        def failing_fn(df):
+            raise RuntimeError("model unavailable")
+
+        batcher = MicroBatcher(failing_fn, max_batch_size=8, max_wait_ms=50)
+        results = self.run_requests(batcher, [self.record, self.record])
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        print("Model error propagation test passed")
+
+    def test_asgi_version_lookup_off_the_loop(self):
+        import asgi_app
+
+        lookup_threads = []
+        class UnversionedPipeline:
+            active_version = None
+            def artifact_version(self):
+                # Stats (and may unpickle) the artifacts on disk
+                lookup_threads.append(threading.current_thread())
+                return 'unversioned'
+
+        batcher = MicroBatcher(self.predict_fn, max_batch_size=8, max_wait_ms=5)
+        async def main():
+            try:
+                return await asgi_app.api_predict(json.dumps(self.record).encode())
+            finally:
+                await batcher.stop()
+
+        with mock.patch.multiple(asgi_app, predict_pipeline=UnversionedPipeline(), micro_batcher=batcher,
+                                 prediction_cache=PredictionCache(), prediction_history=[]):
+            payload, status = asyncio.run(main())
+        self.assertEqual((status, payload['predicted_price']), (200, 1500.0))
+        self.assertEqual(len(lookup_threads), 1)
+        self.assertIsNot(lookup_threads[0], threading.main_thread())
+        print("ASGI version lookup test passed")
+
+def run_micro_batcher_tests():
+    print("Starting Micro-Batcher Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestMicroBatcher)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All micro-batcher tests passed!")
+    else:
+        print("Some micro-batcher tests failed.")
+
+if __name__ == "__main__":
+    run_micro_batcher_tests()
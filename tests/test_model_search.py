@@ -0,0 +1,135 @@
+import unittest
+import tempfile
+import time
+import json
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.linear_model import Ridge
+
+from src.Components.model_trainer import ModelTrainer, SuccessiveHalvingSearch
+
+class SleepyRegressor(RegressorMixin, BaseEstimator):
+    # Stands in for a candidate that trains far longer than the search budget
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def fit(self, X, y):
+        time.sleep(self.delay)
+        self.mean_ = float(np.mean(y))
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+class DyingRegressor(RegressorMixin, BaseEstimator):
+    # Kills its worker process, as the OOM killer would
+    def fit(self, X, y):
+        os._exit(1)
+
+class TestModelSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(900, 5))
+        self.y = self.X @ np.array([4.0, -3.0, 2.0, 0.0, 1.0]) + rng.normal(0, 2.0, 900)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_rung_promotion(self):
+        space = {'Ridge': {'alpha': [0.01, 0.1, 1.0, 10.0, 30.0, 100.0, 300.0, 1000.0, 3000.0]}}
+        search = SuccessiveHalvingSearch({'Ridge': Ridge()}, space, n_candidates=9, eta=3,
+                                         min_resource=1 / 9, time_budget=60.0, n_workers=2)
+        best = search.run(self.X, self.y)
+
+        rungs = [[trial for trial in search.history if trial['rung'] == rung] for rung in range(3)]
+        self.assertEqual([len(trials) for trials in rungs], [9, 3, 1])
+        self.assertEqual([trials[0]['n_rows'] for trials in rungs], [80, 240, 720])
+        for lower, upper in zip(rungs, rungs[1:]):
+            # Only the best 1/eta of a rung is trained on more rows
+            ranked = sorted(lower, key=lambda trial: trial['score'], reverse=True)
+            self.assertEqual({trial['trial_id'] for trial in ranked[:len(upper)]},
+                             {trial['trial_id'] for trial in upper})
+        self.assertEqual(best, ('Ridge', rungs[2][0]['params']))
+        print("Rung promotion test passed")
+
+    def test_final_rung_uses_all_rows(self):
+        # Default schedule: 0.1 and 0.3 of the rows, then all of them rather than 0.9
+        space = {'Ridge': {'alpha': [0.01, 0.1, 1.0, 10.0, 30.0, 100.0, 300.0, 1000.0, 3000.0]}}
+        search = SuccessiveHalvingSearch({'Ridge': Ridge()}, space, n_candidates=9, n_workers=2)
+        search.run(self.X, self.y)
+        self.assertEqual(sorted({trial['n_rows'] for trial in search.history}), [72, 216, 720])
+
+        # A single survivor skips straight to the full data
+        search = SuccessiveHalvingSearch({'Ridge': Ridge()}, space, n_candidates=3, n_workers=2)
+        search.run(self.X, self.y)
+        self.assertEqual([trial['n_rows'] for trial in search.history if trial['rung'] == 1], [720])
+        print("Final rung test passed")
+
+    def test_dead_worker_fails_trials(self):
+        search = SuccessiveHalvingSearch({'Dying': DyingRegressor()}, {'Dying': {}}, n_candidates=1, n_workers=1)
+        self.assertIsNone(search.run(self.X, self.y))
+        self.assertEqual([trial['status'] for trial in search.history], ['failed'])
+        print("Dead worker test passed")
+
+    def test_deadline_stops_running_trials(self):
+        search = SuccessiveHalvingSearch({'Sleepy': SleepyRegressor()}, {'Sleepy': {'delay': [30.0, 40.0, 50.0]}},
+                                         n_candidates=3, time_budget=0.5, n_workers=2)
+        start = time.time()
+        self.assertIsNone(search.run(self.X, self.y))
+
+        self.assertLess(time.time() - start, 10.0)
+        self.assertEqual([trial['status'] for trial in search.history], ['stopped'] * 3)
+        print("Search deadline test passed")
+
+    def test_keeps_default_unless_beaten(self):
+        trainer = ModelTrainer()
+        config = trainer.model_trainer_config
+        config.n_workers = 2
+        config.search_candidates_per_model = 3
+        config.search_time_budget = 60.0
+        config.model_cache_dir = os.path.join(self.tmp_dir.name, 'model_cache')
+        config.search_history_file_path = os.path.join(self.tmp_dir.name, 'search_history.json')
+        X_train, y_train, X_test, y_test = self.X[:700], self.y[:700], self.X[700:], self.y[700:]
+        default = Ridge()
+
+        name, score, model = trainer.search_hyperparameters(
+            {'Ridge': Ridge()}, X_train, y_train, X_test, y_test, 'Ridge', 2.0, default)
+        self.assertEqual((name, score), ('Ridge', 2.0))
+        self.assertIs(model, default)
+        self.assertTrue(os.path.exists(config.search_history_file_path))
+
+        # The second search is served from the model cache
+        name, score, model = trainer.search_hyperparameters(
+            {'Ridge': Ridge()}, X_train, y_train, X_test, y_test, 'Ridge', -np.inf, default)
+        self.assertEqual(name, 'Ridge (tuned)')
+        self.assertAlmostEqual(score, model.score(X_test, y_test), places=12)
+        with open(config.search_history_file_path) as file_obj:
+            history = json.load(file_obj)
+        self.assertTrue(all(trial['cached'] for trial in history if trial['status'] == 'completed'))
+        print("Keep default unless beaten test passed")
+
+    def test_search_is_opt_in(self):
+        self.assertFalse(ModelTrainer().model_trainer_config.search_enabled)
+        print("Search opt-in test passed")
+
+def run_model_search_tests():
+    print("Starting Model Search Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestModelSearch)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All model search tests passed!")
+    else:
+        print("Some model search tests failed.")
+
+if __name__ == "__main__":
+    run_model_search_tests()
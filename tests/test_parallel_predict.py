@@ -0,0 +1,96 @@
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+from src.utils import save_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.parallel_predict_pipeline import ParallelPredictPipeline
+from exception import ValidationError
+
+class TestParallelPredictPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = PredictPipeline.sample_frame(400)
+        preprocessor = DataTransformation().get_data_transformation_object().fit(self.df)
+        self.model = LinearRegression().fit(preprocessor.transform(self.df), self.df['carat'] * 1000)
+        self.expected = self.model.predict(preprocessor.transform(self.df))
+
+        self.paths = []
+        for name, obj in [('model.pkl', self.model), ('preprocessor.pkl', preprocessor)]:
+            self.paths.append(os.path.join(self.tmp_dir.name, name))
+            save_object(self.paths[-1], obj)
+        self.store = ArtifactStore(os.path.join(self.tmp_dir.name, 'versions'))
+        self.store.publish(*self.paths)
+
+        self.pipeline = ParallelPredictPipeline(n_workers=2, predict_pipeline=PredictPipeline(registry=ArtifactRegistry(), store=self.store))
+        self.pipeline.parallel_predict_config.min_shard_rows = 100
+        self.pipeline.parallel_predict_config.mmap_dir = os.path.join(self.tmp_dir.name, 'mmap')
+
+    def tearDown(self):
+        self.pipeline.close()
+        self.tmp_dir.cleanup()
+
+    def test_shards_match_single_process(self):
+        self.assertNotEqual(self.pipeline.parallel_predict_config.start_method, 'fork')
+        with self.pipeline:
+            np.testing.assert_allclose(self.pipeline.predict(self.df), self.expected, rtol=1e-9)
+
+            # Shards come back in input order and every row is counted once
+            np.testing.assert_allclose(self.pipeline.predict(self.df.iloc[::-1]), self.expected[::-1], rtol=1e-9)
+            self.assertEqual(sum(stats['rows'] for stats in self.pipeline.worker_report().values()), 800)
+        print("Sharded prediction test passed")
+
+    def test_mmap_copies_removed(self):
+        mmap_dir = self.pipeline.parallel_predict_config.mmap_dir
+        with self.pipeline:
+            self.pipeline.predict(self.df)
+            pool_dirs = os.listdir(mmap_dir)
+            self.assertEqual(len(pool_dirs), 1)
+            self.assertEqual(sorted(os.listdir(os.path.join(mmap_dir, pool_dirs[0]))), ['model.joblib', 'preprocessor.joblib'])
+
+            # A new version restarts the pool and the previous copies go with it
+            version = self.store.publish(*self.paths)
+            self.pipeline.predict_pipeline.activate(version)
+            self.pipeline.predict(self.df)
+            self.assertEqual(len(os.listdir(mmap_dir)), 1)
+            self.assertNotEqual(os.listdir(mmap_dir), pool_dirs)
+        self.assertEqual(os.listdir(mmap_dir), [])
+        print("Memory-mapped copy cleanup test passed")
+
+    def test_errors_are_typed(self):
+        # Small batches stay in-process, large ones fail inside a worker
+        with self.assertRaises(ValidationError):
+            self.pipeline.predict(self.df.iloc[:10].drop(columns=['carat']))
+        with self.assertRaises(ValidationError):
+            self.pipeline.predict(self.df.drop(columns=['carat']))
+
+        self.pipeline.close()
+        self.pipeline.parallel_predict_config.start_method = 'fork'
+        with self.assertRaises(ValidationError):
+            self.pipeline.predict(self.df)
+        print("Typed error test passed")
+
+def run_parallel_predict_tests():
+    print("Starting Parallel Prediction Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestParallelPredictPipeline)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All parallel prediction tests passed!")
+    else:
+        print("Some parallel prediction tests failed.")
+
+if __name__ == "__main__":
+    run_parallel_predict_tests()
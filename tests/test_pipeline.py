@@ -51,6 +51,14 @@ class TestPredictionPipeline(unittest.TestCase):
             print(f"Prediction test failed: {str(e)}")
             return False
 
+    def test_warm_up_sample_frame(self):
+        df = PredictPipeline.sample_frame(64)
+        self.assertEqual(list(df.columns), ['carat', 'cut', 'color', 'clarity', 'depth', 'table', 'x', 'y', 'z'])
+        self.assertEqual(len(df), 64)
+        self.assertEqual(df['clarity'].nunique(), 8)
+        self.assertFalse(df.isna().any().any())
+        print("Warm-up sample frame test passed")
+
 def run_pipeline_tests():
     print("Starting Pipeline Tests...")
     
@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.pipeline.prediction_cache import PredictionCache, LocalLRUBackend
+
+class TestPredictionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.features = {
+            'carat': 1.5, 'cut': 'Premium', 'color': 'G', 'clarity': 'VS1',
+            'depth': 61.5, 'table': 57.0, 'x': 7.3, 'y': 7.35, 'z': 4.5
+        }
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return 1000.0 + self.calls
+
+    def test_hit_after_miss(self):
+        cache = PredictionCache()
+        self.assertEqual(cache.get_or_compute(self.features, 'v1', self.compute), (1001.0, False))
+        self.assertEqual(cache.get_or_compute(self.features, 'v1', self.compute), (1001.0, True))
+        self.assertEqual(self.calls, 1)
+        print("Cache hit test passed")
+
+    def test_canonical_key(self):
+        cache = PredictionCache()
+        variant = dict(self.features, cut=' Premium ', table=57)
+        self.assertEqual(cache.make_key(self.features, 'v1'), cache.make_key(variant, 'v1'))
+        self.assertNotEqual(cache.make_key(self.features, 'v1'), cache.make_key(self.features, 'v2'))
+
+        quantized = PredictionCache(quantize_decimals=2)
+        nearby = dict(self.features, carat=1.5004)
+        self.assertEqual(quantized.make_key(self.features, 'v1'), quantized.make_key(nearby, 'v1'))
+        print("Canonical key test passed")
+
+    def test_model_change_invalidates(self):
+        cache = PredictionCache()
+        cache.get_or_compute(self.features, 'v1', self.compute)
+        value, cached = cache.get_or_compute(self.features, 'v2', self.compute)
+        self.assertFalse(cached)
+        self.assertEqual(value, 1002.0)
+        self.assertEqual(cache.stats()['invalidations'], 1)
+        print("Model change invalidation test passed")
+
+    def test_lru_and_ttl_eviction(self):
+        backend = LocalLRUBackend(max_entries=2, ttl_seconds=3600.0)
+        backend.set('a', 1.0)
+        backend.set('b', 2.0)
+        backend.get('a')
+        backend.set('c', 3.0)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), 1.0)
+        self.assertEqual(backend.stats()['evictions'], 1)
+
+        expired = LocalLRUBackend(max_entries=2, ttl_seconds=-1.0)
+        expired.set('a', 1.0)
+        self.assertIsNone(expired.get('a'))
+        self.assertEqual(expired.stats()['expirations'], 1)
+        print("LRU and TTL eviction test passed")
+
+    def test_app_keys_on_active_version(self):
+        import app as app_module
+        from pipeline.predict_pipeline import CustomData
+
+        class ActivePipeline:
+            active_version = 'v1'
+            def artifact_version(self):
+                raise AssertionError('artifacts checked on a cache hit')
+            def predict(self, df):
+                return (df['carat'] * 1000).to_numpy()
+
+        with mock.patch.multiple(app_module, predict_pipeline=ActivePipeline(), prediction_cache=PredictionCache()):
+            data = CustomData(**self.features)
+            self.assertEqual(app_module.predict_single(data), (1500.0, False))
+            self.assertEqual(app_module.predict_single(data), (1500.0, True))
+        print("App active version key test passed")
+
+def run_prediction_cache_tests():
+    print("Starting Prediction Cache Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestPredictionCache)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All prediction cache tests passed!")
+    else:
+        print("Some prediction cache tests failed.")
+
+if __name__ == "__main__":
+    run_prediction_cache_tests()
@@ -0,0 +1,164 @@
+import unittest
+import tempfile
+import asyncio
+import time
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.linear_model import LinearRegression
+
+import app as app_module
+import asgi_app
+from src.utils import save_object
+from src.Components.data_transformation import DataTransformation
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore, ArtifactWatcher
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.readiness import ReadinessMonitor
+from exception import ArtifactError
+
+class NaNModel:
+    def predict(self, X):
+        return np.full(len(X), np.nan)
+
+class FlakyPipeline:
+    # Fails its first `failures` warm-ups
+    def __init__(self, failures):
+        self.failures = failures
+        self.active_version = None
+
+    def warm_up(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ArtifactError('model not deployed yet')
+        return {'model_version': 'v1'}
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        df = PredictPipeline.sample_frame(200)
+        preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+        model = LinearRegression().fit(preprocessor.transform(df), df['carat'] * 1000)
+
+        self.paths = {}
+        for name, obj in [('model.pkl', model), ('nan.pkl', NaNModel()), ('preprocessor.pkl', preprocessor)]:
+            self.paths[name] = os.path.join(self.tmp_dir.name, name)
+            save_object(self.paths[name], obj)
+        self.store = ArtifactStore(os.path.join(self.tmp_dir.name, 'versions'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def wait_until_ready(self, monitor, timeout=5.0):
+        deadline = time.time() + timeout
+        while not monitor.ready and time.time() < deadline:
+            time.sleep(0.01)
+        return monitor.ready
+
+    def test_pipeline_warm_up(self):
+        self.store.publish(self.paths['model.pkl'], self.paths['preprocessor.pkl'])
+        pipeline = PredictPipeline(registry=ArtifactRegistry(), store=self.store)
+        report = pipeline.warm_up()
+        self.assertEqual(report['model_version'], self.store.current_version())
+        self.assertEqual(sorted(report['warmup_latency_ms']), ['1', '256'])
+
+        # A model that loads but predicts garbage is not ready
+        self.store.publish(self.paths['nan.pkl'], self.paths['preprocessor.pkl'])
+        with self.assertRaises(ArtifactError):
+            PredictPipeline(registry=ArtifactRegistry(), store=self.store).warm_up()
+        print("Pipeline warm-up test passed")
+
+    def test_ready_after_watcher_swap(self):
+        self.store.publish(self.paths['nan.pkl'], self.paths['preprocessor.pkl'])
+        pipeline = PredictPipeline(registry=ArtifactRegistry(), store=self.store)
+        monitor = ReadinessMonitor(pipeline, retry_interval=60, poll_interval=0.02).start()
+        try:
+            self.assertFalse(monitor.ready)
+            self.assertIn('invalid predictions', monitor.report()['error'])
+
+            # No need to wait for retry_interval once the watcher has swapped in a good version
+            self.store.publish(self.paths['model.pkl'], self.paths['preprocessor.pkl'])
+            self.assertTrue(ArtifactWatcher(pipeline, store=self.store).check())
+            self.assertTrue(self.wait_until_ready(monitor))
+            self.assertEqual(monitor.report()['model_version'], self.store.current_version())
+            self.assertEqual(monitor.attempts, 2)
+        finally:
+            monitor.stop()
+        print("Ready after watcher swap test passed")
+
+    def test_flask_readiness_transitions(self):
+        original = app_module.readiness
+        app_module.readiness = ReadinessMonitor(FlakyPipeline(failures=2), retry_interval=0.05, poll_interval=0.01)
+        try:
+            client = app_module.app.test_client()
+            app_module.readiness.warm_up()
+            response = client.get('/api/health/ready')
+            self.assertEqual(response.status_code, 503)
+            self.assertIn('not deployed', response.get_json()['error'])
+            self.assertEqual(client.get('/api/health').status_code, 503)
+
+            # Requests only read the state; the retries happen on the background thread
+            app_module.readiness.start()
+            self.assertTrue(self.wait_until_ready(app_module.readiness))
+            self.assertEqual(app_module.readiness.attempts, 3)
+            self.assertEqual(client.get('/api/health').status_code, 200)
+        finally:
+            app_module.readiness.stop()
+            app_module.readiness = original
+        print("Flask readiness transition test passed")
+
+    def test_asgi_lifespan_retries(self):
+        original = asgi_app.readiness
+        asgi_app.readiness = ReadinessMonitor(FlakyPipeline(failures=1), retry_interval=0.05, poll_interval=0.01)
+
+        async def run():
+            messages = asyncio.Queue()
+            sent = []
+
+            async def send(message):
+                sent.append(message['type'])
+
+            lifespan = asyncio.create_task(asgi_app.lifespan(messages.get, send))
+            await messages.put({'type': 'lifespan.startup'})
+            while not sent:
+                await asyncio.sleep(0.01)
+            _, before = await asgi_app.health_ready(b'')
+
+            # The failed startup warm-up is retried without blocking the event loop
+            for _ in range(500):
+                if asgi_app.readiness.ready:
+                    break
+                await asyncio.sleep(0.01)
+            _, after = await asgi_app.health_ready(b'')
+
+            await messages.put({'type': 'lifespan.shutdown'})
+            await lifespan
+            return before, after, sent
+
+        try:
+            before, after, sent = asyncio.run(run())
+        finally:
+            asgi_app.readiness = original
+        self.assertEqual((before, after), (503, 200))
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        print("ASGI lifespan retry test passed")
+
+def run_readiness_tests():
+    print("Starting Readiness Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestReadiness)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All readiness tests passed!")
+    else:
+        print("Some readiness tests failed.")
+
+if __name__ == "__main__":
+    run_readiness_tests()
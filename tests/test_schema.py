@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.pipeline.schema import FeatureSchema, describe_errors
+
+class TestFeatureSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = FeatureSchema()
+        self.record = {
+            'carat': 1.5, 'cut': 'Premium', 'color': 'G', 'clarity': 'VS1',
+            'depth': 61.5, 'table': 57.0, 'x': 7.3, 'y': 7.35, 'z': 4.5
+        }
+
+    def codes(self, errors):
+        return [(error['field'], error['code']) for error in errors]
+
+    def test_valid_record(self):
+        clean, errors = self.schema.validate_record(dict(self.record, carat='1.5'))
+        self.assertEqual(errors, [])
+        self.assertEqual(clean['carat'], 1.5)
+        print("Valid record test passed")
+
+    def test_record_errors(self):
+        record = dict(self.record, cut='Excellent', depth='deep', table=500, x=float('nan'))
+        del record['z']
+        _, errors = self.schema.validate_record(record)
+        self.assertEqual(self.codes(errors), [
+            ('cut', 'unknown_category'), ('depth', 'not_numeric'), ('table', 'out_of_range'),
+            ('x', 'missing'), ('z', 'missing')
+        ])
+        self.assertEqual(describe_errors(errors), 'Missing required fields: x, z')
+
+        # JSON booleans are rejected, not scored as 1.0 / 0.0
+        _, errors = self.schema.validate_record(dict(self.record, carat=True, depth=False))
+        self.assertEqual(self.codes(errors), [('carat', 'not_numeric'), ('depth', 'not_numeric')])
+        print("Record error test passed")
+
+    def test_frame_matches_record_rules(self):
+        records = [
+            self.record,
+            dict(self.record, cut='Excellent', depth='deep'),
+            dict(self.record, table=500, x=None),
+            dict(self.record, carat=np.inf),
+            dict(self.record, color=7),
+            dict(self.record, carat=True)
+        ]
+        valid_df, errors = self.schema.validate(pd.DataFrame(records))
+
+        self.assertEqual(valid_df.index.tolist(), [0])
+        self.assertEqual(valid_df['carat'].dtype, np.float64)
+        self.assertEqual([error['index'] for error in errors], [1, 2, 3, 4, 5])
+        for error in errors:
+            _, record_errors = self.schema.validate_record(records[error['index']])
+            self.assertEqual(self.codes(error['details']), self.codes(record_errors))
+        self.assertEqual(errors[0]['error'], 'unknown cut; depth must be numeric')
+        print("Vectorized validation test passed")
+
+def run_schema_tests():
+    print("Starting Schema Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestFeatureSchema)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All schema tests passed!")
+    else:
+        print("Some schema tests failed.")
+
+if __name__ == "__main__":
+    run_schema_tests()
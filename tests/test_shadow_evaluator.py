@@ -0,0 +1,83 @@
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.pipeline.shadow_evaluator import ShadowEvaluator, shadow_report
+
+class OffsetModel:
+    def __init__(self, offset):
+        self.offset = offset
+
+    def predict(self, features):
+        return np.asarray(features, dtype=np.float64) + self.offset
+
+class FailingModel:
+    def predict(self, features):
+        raise RuntimeError("candidate unavailable")
+
+class TestShadowEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp_dir.name, 'shadow', 'shadow_log.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_deltas_and_log(self):
+        shadow = ShadowEvaluator(OffsetModel(5.0), 'candidate', fraction=1.0, log_file_path=self.log_path)
+        for i in range(10):
+            features = [float(i), float(i) + 1]
+            self.assertTrue(shadow.submit(features, features, 1.0, 'primary'))
+        shadow.close()
+
+        stats = shadow.stats()
+        self.assertEqual(stats['sampled'], 10)
+        self.assertEqual(stats['rows'], 20)
+        self.assertAlmostEqual(stats['mean_abs_delta'], 5.0)
+
+        report = shadow_report(self.log_path)
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]['candidate_version'], 'candidate')
+        self.assertEqual(report[0]['rows'], 20)
+        self.assertAlmostEqual(report[0]['p95_abs_delta'], 5.0)
+        print("Shadow delta and log test passed")
+
+    def test_sampling_fraction(self):
+        shadow = ShadowEvaluator(OffsetModel(0.0), 'candidate', fraction=0.2,
+                                 log_file_path=self.log_path, random_state=0)
+        submitted = sum(shadow.submit([1.0], [1.0], 1.0) for _ in range(2000))
+        shadow.close()
+        self.assertTrue(300 < submitted < 500)
+
+        disabled = ShadowEvaluator(OffsetModel(0.0), 'candidate', fraction=0.0, log_file_path=self.log_path)
+        self.assertFalse(disabled.submit([1.0], [1.0], 1.0))
+        disabled.close()
+        print("Sampling fraction test passed")
+
+    def test_candidate_failure_is_contained(self):
+        shadow = ShadowEvaluator(FailingModel(), 'candidate', fraction=1.0, log_file_path=self.log_path)
+        self.assertTrue(shadow.submit([1.0], [1.0], 1.0))
+        shadow.close()
+        self.assertEqual(shadow.stats()['failed'], 1)
+        self.assertEqual(shadow.stats()['pending'], 0)
+        print("Candidate failure test passed")
+
+def run_shadow_evaluator_tests():
+    print("Starting Shadow Evaluator Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestShadowEvaluator)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All shadow evaluator tests passed!")
+    else:
+        print("Some shadow evaluator tests failed.")
+
+if __name__ == "__main__":
+    run_shadow_evaluator_tests()
@@ -0,0 +1,65 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.utils import save_table, load_table
+from src.pipeline.predict_pipeline import PredictPipeline
+
+class TestTableIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = PredictPipeline.sample_frame(100)
+        self.df['price'] = np.arange(100) * 10
+        self.df.loc[3, 'cut'] = np.nan
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parquet_categorical_round_trip(self):
+        path = os.path.join(self.tmp_dir.name, 'data', 'train.parquet')
+        save_table(self.df, path)
+        loaded = load_table(path)
+
+        self.assertEqual(list(loaded.columns), list(self.df.columns))
+        for col in ['cut', 'color', 'clarity']:
+            # Strings come back dictionary-decoded as categoricals with the same values
+            self.assertIsInstance(loaded[col].dtype, pd.CategoricalDtype)
+            pd.testing.assert_series_equal(loaded[col].astype(object), self.df[col], check_names=False)
+        self.assertTrue(pd.isna(loaded.loc[3, 'cut']))
+        pd.testing.assert_frame_equal(loaded[['carat', 'depth', 'price']], self.df[['carat', 'depth', 'price']])
+
+        import pyarrow.parquet as pq
+        self.assertEqual(pq.ParquetFile(path).metadata.row_group(0).column(0).compression, 'ZSTD')
+        print("Parquet categorical round-trip test passed")
+
+    def test_column_projection(self):
+        for file_name in ['train.parquet', 'train.csv']:
+            path = os.path.join(self.tmp_dir.name, file_name)
+            save_table(self.df, path)
+            loaded = load_table(path, columns=['carat', 'cut', 'price'])
+
+            self.assertEqual(sorted(loaded.columns), ['carat', 'cut', 'price'])
+            self.assertEqual(len(loaded), 100)
+            np.testing.assert_allclose(loaded['carat'], self.df['carat'])
+        print("Column projection test passed")
+
+def run_table_io_tests():
+    print("Starting Table IO Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTableIO)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All table IO tests passed!")
+    else:
+        print("Some table IO tests failed.")
+
+if __name__ == "__main__":
+    run_table_io_tests()
@@ -0,0 +1,154 @@
+import unittest
+import tempfile
+import numpy as np
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+
+from src.utils import save_object, load_object
+from src.pipeline.tree_engine import FlatTreeEnsemble, RoutedTreeModel, compile_tree_model
+from src.pipeline.model_export import export_report, write_export, ModelExporter
+from src.pipeline.artifact_registry import ArtifactRegistry
+from src.pipeline.artifact_store import ArtifactStore
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.Components.data_transformation import DataTransformation
+
+class TestTreeEngine(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X_train = rng.normal(size=(1500, 9))
+        self.y_train = 3000 * self.X_train[:, 0] ** 2 + 500 * self.X_train[:, 6] + rng.normal(0, 50, 1500)
+        self.X_test = rng.normal(size=(400, 9))
+
+    def assert_matches(self, model):
+        model.fit(self.X_train, self.y_train)
+        engine = FlatTreeEnsemble.from_estimator(model)
+        np.testing.assert_allclose(engine.predict(self.X_test), model.predict(self.X_test), rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(engine.predict(self.X_test[:1]), model.predict(self.X_test[:1]), rtol=1e-9, atol=1e-6)
+        return engine
+
+    def test_decision_tree(self):
+        self.assert_matches(DecisionTreeRegressor(random_state=0))
+        print("Decision Tree engine test passed")
+
+    def test_random_forest(self):
+        engine = self.assert_matches(RandomForestRegressor(n_estimators=20, random_state=0))
+        self.assertEqual(engine.n_trees, 20)
+        print("Random Forest engine test passed")
+
+    def test_gradient_boosting(self):
+        self.assert_matches(GradientBoostingRegressor(n_estimators=50, random_state=0))
+        print("Gradient Boosting engine test passed")
+
+    def test_chunked_prediction(self):
+        engine = self.assert_matches(RandomForestRegressor(n_estimators=10, random_state=0))
+        expected = engine.predict(self.X_test)
+        engine.max_cells = 37
+        np.testing.assert_array_equal(engine.predict(self.X_test), expected)
+        print("Chunked prediction test passed")
+
+    def test_loaded_through_load_object(self):
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(self.X_train, self.y_train)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'model.pkl')
+            save_object(path, model)
+            loaded = load_object(path)
+
+        routed = compile_tree_model(loaded)
+        self.assertIsInstance(routed, RoutedTreeModel)
+        np.testing.assert_allclose(routed.predict(self.X_test[:5]), model.predict(self.X_test[:5]), rtol=1e-9, atol=1e-6)
+        print("load_object round trip test passed")
+
+    def test_compact_export(self):
+        model = GradientBoostingRegressor(n_estimators=50, random_state=0).fit(self.X_train, self.y_train)
+        engine = FlatTreeEnsemble.from_estimator(model)
+
+        # float32 thresholds are rounded down, so every row still takes the same path
+        compact = engine.compact()
+        self.assertEqual(compact.threshold.dtype, np.float32)
+        self.assertLess(compact.nbytes, engine.nbytes)
+        np.testing.assert_allclose(compact.predict(self.X_test), model.predict(self.X_test), rtol=1e-5)
+
+        # Fewer trees are the first boosting stages
+        staged = list(model.staged_predict(self.X_test))
+        np.testing.assert_allclose(engine.compact(20).predict(self.X_test), staged[19], rtol=1e-5)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_dir = os.path.join(tmp_dir, 'model_compact')
+            report = export_report(model, engine, self.X_test, model.predict(self.X_test), [20, 500])
+            self.assertEqual([c['n_trees'] for c in report['candidates']], [20, 50])
+
+            write_export(compact, export_dir, {'version': 'test'})
+            loaded = load_object(export_dir)
+            self.assertIsInstance(loaded.threshold.base, np.memmap)
+            np.testing.assert_array_equal(loaded.predict(self.X_test), compact.predict(self.X_test))
+            self.assertIsNone(compile_tree_model(loaded))
+            del loaded
+        print("Compact export test passed")
+
+    def test_stale_and_published_export(self):
+        df = PredictPipeline.sample_frame(300)
+        df['price'] = 4000 * df['carat'] + 10 * df['table']
+        preprocessor = DataTransformation().get_data_transformation_object().fit(df)
+        X = preprocessor.transform(df)
+        model_a = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, df['price'])
+        model_b = RandomForestRegressor(n_estimators=10, random_state=1).fit(X, df['price'] * 2)
+
+        # MODEL_PATHS are relative to the working directory
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                save_object(os.path.join('artifacts', 'model.pkl'), model_a)
+                save_object(os.path.join('artifacts', 'preprocessor.pkl'), preprocessor)
+                df.to_parquet(os.path.join('artifacts', 'test.parquet'), index=False)
+                ModelExporter().initiate_model_export()
+                store = ArtifactStore(os.path.join('artifacts', 'versions'))
+
+                pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+                self.assertEqual(pipeline.artifact_paths()[0], 'artifacts/model_compact')
+
+                # After a retrain the old export is no longer served
+                save_object(os.path.join('artifacts', 'model.pkl'), model_b)
+                with self.assertLogs(level='WARNING'):
+                    self.assertEqual(pipeline.artifact_paths()[0], 'artifacts/model.pkl')
+                np.testing.assert_allclose(pipeline.predict(df), model_b.predict(X), rtol=1e-6)
+
+                # A published export is served from the version directory
+                report = ModelExporter().initiate_model_export(publish=True)
+                version = report['published_version']
+                self.assertEqual(store.manifest(version)['metrics']['export']['n_trees'], 10)
+                pipeline = PredictPipeline(registry=ArtifactRegistry(), store=store)
+                self.assertEqual(pipeline.artifact_paths()[0], store.extra_path(version, 'model_compact'))
+                np.testing.assert_allclose(pipeline.predict(df), model_b.predict(X), rtol=1e-6)
+            finally:
+                os.chdir(cwd)
+        print("Stale and published export test passed")
+
+    def test_unsupported_model(self):
+        model = LinearRegression().fit(self.X_train, self.y_train)
+        self.assertIsNone(compile_tree_model(model))
+        with self.assertRaises(ValueError):
+            FlatTreeEnsemble.from_estimator(model)
+        print("Unsupported model test passed")
+
+def run_tree_engine_tests():
+    print("Starting Tree Engine Tests...")
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestTreeEngine)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    if result.wasSuccessful():
+        print("All tree engine tests passed!")
+    else:
+        print("Some tree engine tests failed.")
+
+if __name__ == "__main__":
+    run_tree_engine_tests()